@@ -35,21 +35,27 @@ class DijkstraNetwork(SearchNetwork):
             return [start], 0
             
         visited = set()
+        # Predecessor of each node, recorded when the node is settled
+        parents = {}
         counter = count()  # tie-breaker for insertion order
-        # Format: (cost, counter, node, path, step_added)
-        heap = [(0, next(counter), start, [start], 0)]
+        # Format: (cost, counter, node, parent, step_added)
+        heap = [(0, next(counter), start, None, 0)]
         step_counter = 1
         
+        def entry_path(node, parent):
+            # Only used for debug output; the search itself never copies paths
+            return (self.reconstruct_path(parents, parent) if parent is not None else []) + [node]
+        
         if debug:
             print(f"Initial heap: {[(c, n) for c, _, n, _, _ in heap]}")
         
         while heap:
-            cost, _, current, path, added_at = heapq.heappop(heap)
+            cost, _, current, parent, added_at = heapq.heappop(heap)
             
             if debug:
                 print(f"\nStep {step_counter}:")
                 step_counter += 1
-                print(f"Popped: (cost={cost}, node={current}, path={path}) [added at step {added_at}]")
+                print(f"Popped: (cost={cost}, node={current}, path={entry_path(current, parent)}) [added at step {added_at}]")
             
             # Skip if we've already visited this node
             if current in visited:
@@ -58,12 +64,13 @@ class DijkstraNetwork(SearchNetwork):
                 continue
             
             visited.add(current)
+            parents[current] = parent
             
             # If we've reached the goal, return the path and cost
             if current == goal:
                 if debug:
                     print(f"GOAL reached: {current} with cost {cost}")
-                return path, cost
+                return self.reconstruct_path(parents, current), cost
             
             # Get neighbors with their edge weights
             neighbors = []
@@ -81,12 +88,11 @@ class DijkstraNetwork(SearchNetwork):
             for neighbor, edge_weight in neighbors:
                 if neighbor not in visited:
                     new_cost = cost + edge_weight
-                    new_path = path + [neighbor]
                     
                     if debug:
-                        print(f"    → Added to heap: (cost={new_cost}, node={neighbor}, path={new_path}) [added at step {step_counter}]")
+                        print(f"    → Added to heap: (cost={new_cost}, node={neighbor}, path={entry_path(neighbor, current)}) [added at step {step_counter}]")
                         
-                    heapq.heappush(heap, (new_cost, next(counter), neighbor, new_path, step_counter))
+                    heapq.heappush(heap, (new_cost, next(counter), neighbor, current, step_counter))
             
             if debug:
                 print(f"  Heap now: {[(c, n) for c, _, n, _, _ in heap]}")
@@ -94,10 +100,76 @@ class DijkstraNetwork(SearchNetwork):
         # No path found
         return [], float('inf')
     
+    def dijkstra_multi(self, start, goals, settle_all=False, debug=False):
+        """
+        Run a single Dijkstra search from start towards several goals at once.
+        
+        Parameters:
+            start: Starting node
+            goals: Iterable of target nodes
+            settle_all: If False, stop as soon as the first goal is settled.
+                        If True, keep searching until every reachable goal is settled.
+            debug: Whether to print debugging information
+            
+        Returns:
+            dict: Mapping goal -> (path, cost) for every goal settled by the search.
+                  Goals that were not reached are left out.
+        """
+        remaining = set(goals)
+        results = {}
+        
+        if not remaining:
+            return results
+        
+        visited = set()
+        parents = {}
+        counter = count()  # tie-breaker for insertion order
+        # Format: (cost, counter, node, parent)
+        heap = [(0, next(counter), start, None)]
+        
+        while heap and remaining:
+            cost, _, current, parent = heapq.heappop(heap)
+            
+            if current in visited:
+                continue
+            
+            visited.add(current)
+            parents[current] = parent
+            
+            # A goal is final as soon as it is settled
+            if current in remaining:
+                remaining.discard(current)
+                results[current] = (self.reconstruct_path(parents, current), cost)
+                
+                if debug:
+                    print(f"GOAL settled: {current} with cost {cost}")
+                
+                if not settle_all:
+                    break
+            
+            # Get neighbors with their edge weights
+            neighbors = []
+            for neighbor in self.neighbors(current):
+                edge_data = self.get_edge_data(current, neighbor)
+                edge_weight = edge_data.get('weight', 1)
+                neighbors.append((neighbor, edge_weight))
+            
+            # Sort neighbors in ascending order
+            neighbors.sort(key=lambda x: str(x[0]))
+            
+            for neighbor, edge_weight in neighbors:
+                if neighbor not in visited:
+                    heapq.heappush(heap, (cost + edge_weight, next(counter), neighbor, current))
+        
+        return results
+    
     def find_shortest_path_to_destinations(self, origin, destinations, debug=False):
         """
         Find the shortest path from origin to any of the destinations.
         
+        A single Dijkstra search is run for all destinations together; the first
+        destination to be settled is the closest one.
+        
         Parameters:
             origin: Starting node
             destinations: List of possible target nodes
@@ -106,20 +178,16 @@ class DijkstraNetwork(SearchNetwork):
         Returns:
             tuple: (path, destination, cost) of the shortest path
         """
-        shortest_path = None
-        shortest_dest = None
-        shortest_cost = float('inf')
-        
-        for dest in destinations:
-            path, cost = self.find_path(origin, dest, debug)
-            if path and cost < shortest_cost:
-                shortest_cost = cost
-                shortest_path = path
-                shortest_dest = dest
-                
-                if debug:
-                    print(f"\nNew shortest path found to {dest}: {path}")
-                    print(f"Cost: {cost}")
+        results = self.dijkstra_multi(origin, destinations, debug=debug)
+        
+        if not results:
+            return None, None, float('inf')
+        
+        shortest_dest, (shortest_path, shortest_cost) = next(iter(results.items()))
+        
+        if debug:
+            print(f"\nShortest path found to {shortest_dest}: {shortest_path}")
+            print(f"Cost: {shortest_cost}")
         
         return shortest_path, shortest_dest, shortest_cost
     
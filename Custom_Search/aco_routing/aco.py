@@ -1,11 +1,12 @@
 import random
-from typing import List, Tuple
+from typing import Callable, Iterator, List, Tuple, Union
 import os
 import sys
 import matplotlib.pyplot as plt
 import time
 import multiprocessing
 from concurrent.futures import ThreadPoolExecutor, as_completed
+import numpy as np
 
 # Import paths setup
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -16,7 +17,12 @@ from aco_routing.ant import Ant
 from aco_routing.graph_api import GraphApi
 from aco_routing.network import Network
 from aco_routing.aco_visualizer import ACOVisualizer  # Import the new visualizer
-from aco_routing.floyd_warshall import FloydWarshall  # Import the Floyd-Warshall algorithm
+from aco_routing.all_pairs import ALL_PAIRS_METHODS, create_all_pairs_solver  # Import the all-pairs shortest path engine
+from aco_routing.virtual_edges import LazyVirtualEdges
+from aco_routing.apsp_cache import AllPairsCache
+from aco_routing.ant_pool import AntProcessPool
+from aco_routing.colony import VectorizedColony
+from aco_routing.local_search import create_local_searches, improve_path
 
 class ACO:
     def __init__(
@@ -32,10 +38,22 @@ class ACO:
         log_step: int = None,
         visualize: bool = False,
         visualization_step: int = 1,
-        use_floyd_warshall: bool = False,  # New parameter for Floyd-Warshall preprocessing
+        use_floyd_warshall: Union[bool, str] = False,  # New parameter for Floyd-Warshall preprocessing
         use_local_search: bool = True,     # Enable local search optimization
         local_search_frequency: int = 5,   # Apply local search every N iterations
-        num_threads: int = None            # Number of threads for parallel processing
+        num_threads: int = None,           # Number of threads for parallel processing
+        lazy_virtual_edges: bool = True,   # Serve all-pairs shortest paths as on-demand virtual edges
+        all_pairs_cache_dir: str = None,   # Directory of the persistent all-pairs cache (None disables it)
+        ant_executor: str = "thread",      # Run the forward ants in a "thread" or "process" pool, or "vectorized"
+        num_processes: int = None,         # Number of worker processes for the process pool
+        candidate_list_size: int = None,   # TSP ants try the k cheapest edges of a node first (None: all)
+        local_search = "2opt",             # Local search(es) to run: "2opt", "oropt", "3opt" or a list of them
+        local_search_target: str = "best", # Improve the "best" path, the "iteration" best ant's path or "both"
+        stagnation_limit: int = None,      # Stop after this many iterations without a better path (None: never)
+        min_pheromone_entropy: float = None, # Stop once the pheromone entropy (0-1) falls to this value
+        time_budget: float = None,         # Stop after this many seconds of search (None: no limit)
+        reinitialize_on_stagnation: bool = False, # Reset the pheromones instead of stopping on stagnation
+        seed: int = None                   # Seed of a reproducible run (None: use the global random module)
     ):
         """Initialize the ACO (Ant Colony Optimization) algorithm.
         
@@ -51,10 +69,44 @@ class ACO:
             log_step: Number of iterations between logs
             visualize: Whether to visualize the algorithm progress
             visualization_step: Frequency of visualization updates
-            use_floyd_warshall: Whether to preprocess the graph using Floyd-Warshall algorithm
+            use_floyd_warshall: Whether to preprocess the graph with all-pairs shortest paths.
+                True or "auto" picks a method from the graph density, "dense" forces the plain
+                Floyd-Warshall, "blocked" the tiled, multi-threaded one and "dijkstra" n x Dijkstra
             use_local_search: Whether to apply local search optimization
             local_search_frequency: Apply local search every N iterations
             num_threads: Number of threads to use for parallel processing
+            lazy_virtual_edges: Serve the all-pairs shortest paths as on-demand virtual edges
+                instead of adding one edge per reachable pair to the graph
+            all_pairs_cache_dir: Directory where all-pairs results are stored and memory-mapped
+                back on later runs over the same graph (None disables the cache)
+            ant_executor: "thread" runs the ants in a thread pool, "process" in worker
+                processes that read a shared memory snapshot of the pheromones and
+                "vectorized" advances all ants of an iteration together with NumPy
+            num_processes: Number of worker processes for the process pool (default: CPU count)
+            candidate_list_size: In TSP mode, ants choose among the candidate_list_size
+                cheapest outgoing edges of a node and fall back to the full neighborhood
+                only when all of those lead to visited nodes (None or 0 disables the lists)
+            local_search: Name of a local search ("2opt", "oropt" or "3opt"), a LocalSearch
+                object or a list of them; a list is run in order, round after round, until
+                no search improves the path any further
+            local_search_target: "best" improves the global best path, "iteration" the path
+                of the iteration-best ant before it deposits pheromone and "both" does both,
+                every local_search_frequency iterations
+            stagnation_limit: Stop when the best path has not improved for this many iterations
+            min_pheromone_entropy: Stop when the mean normalized entropy of the pheromone
+                trails (see GraphApi.pheromone_entropy) is at or below this value; it starts
+                at 1 and falls towards 0 as the colony converges
+            time_budget: Wall-clock limit of the search in seconds; ants still walking when it
+                runs out are stopped and the iteration goes on with the ants that finished.
+                With a limit, the late MMAS phase (see _deploy_backward_search_ants) starts at
+                75% of the time or of num_iterations, whichever comes first
+            reinitialize_on_stagnation: When the stagnation limit or the pheromone entropy
+                triggers, reset every pheromone to the current maximum and keep searching
+                instead of stopping; num_iterations and time_budget still end the search
+            seed: Makes the run reproducible: the initial pheromones and spawn points come
+                from a generator seeded with it, and every ant of every iteration gets its
+                own random stream, spawned with numpy's SeedSequence, so thread scheduling
+                and the process pool's batching cannot change the walks
         """
         # Store all parameters
         self.graph = graph
@@ -68,19 +120,57 @@ class ACO:
         self.log_step = log_step
         self.visualize = visualize
         self.visualization_step = visualization_step
-        if mode == 0:
+        # 0 and 1 compare equal to False and True, so flags are normalized before the check
+        if not isinstance(use_floyd_warshall, str) and use_floyd_warshall in (True, False):
+            use_floyd_warshall = bool(use_floyd_warshall)
+        if use_floyd_warshall not in (True, False) + ALL_PAIRS_METHODS:
+            raise ValueError(f"Unknown all-pairs method: {use_floyd_warshall}")
+        if mode == 0 and not use_floyd_warshall:
             self.use_floyd_warshall = True # Auto trigger for any destination mode
         else:
             self.use_floyd_warshall = use_floyd_warshall
         self.use_local_search = use_local_search
         self.local_search_frequency = local_search_frequency
+        if local_search_target not in ("best", "iteration", "both"):
+            raise ValueError(f"Unknown local search target: {local_search_target}")
+        self.local_search_target = local_search_target
+        self.stagnation_limit = stagnation_limit
+        self.min_pheromone_entropy = min_pheromone_entropy
+        self.time_budget = time_budget
+        self.reinitialize_on_stagnation = reinitialize_on_stagnation
         self.num_threads = num_threads if num_threads else min(multiprocessing.cpu_count(), 32)
+        self.lazy_virtual_edges = lazy_virtual_edges
+        self.virtual_edges = None
+        self.all_pairs_cache_dir = all_pairs_cache_dir
+        if ant_executor not in ("thread", "process", "vectorized"):
+            raise ValueError(f"Unknown ant executor: {ant_executor}")
+        self.ant_executor = ant_executor
+        self.num_processes = num_processes
+        self.candidate_list_size = candidate_list_size
+        self.ant_pool = None
+        
+        # Random streams: the global random module, or a SeedSequence spawning one stream per ant
+        self.seed = seed
+        self._seed_sequence = None
+        self._ant_seeds = None
+        self.rng = random
+        if seed is not None:
+            self._seed_sequence = np.random.SeedSequence(seed)
+            self.rng = random.Random(self._spawn_seeds(1)[0])
         
         # Initialize other fields
         self.search_ants = []
         self.best_path = []
         self.best_path_cost = float("inf")
         
+        # Why and after how many iterations the last search stopped
+        self.iterations_completed = 0
+        self.stop_reason = None
+        self.num_reinitializations = 0
+        
+        # Called as iteration_hook(aco, iteration) after every iteration (see islands.py)
+        self.iteration_hook = None
+        
         # Initialize gradient descent parameters
         self.gt = 0.0 # Gradient
         self.acc = 0.0 # Accumulated gradient
@@ -91,7 +181,7 @@ class ACO:
             self._preprocess_with_floyd_warshall()
         
         # Initialize the Graph API
-        self.graph_api = GraphApi(self.graph, self.evaporation_rate)
+        self.graph_api = GraphApi(self.graph, self.evaporation_rate, virtual_edges=self.virtual_edges)
         
         # Initialize visualization if needed
         self.visualizer = None
@@ -102,90 +192,176 @@ class ACO:
         max_temp = 1.0
         min_temp = max_temp * self.min_scaling_factor
         k = 0.5 # control distribution
-        for u, v in self.graph.get_edges():
-            r = random.uniform(min_temp, max_temp) # Random pheromone value between 0.1 and 1.0
-            self.graph_api.set_edge_pheromones(u, v, max_temp - k * r * (max_temp-min_temp)) # Stochastic pheromone value
-            self.graph_api.set_edge_delta_pheromones(u, v, 0.0)
+        m = self.graph.number_of_edges()
+        r = np.array([self.rng.uniform(min_temp, max_temp) for _ in range(m)]) # Random pheromone values between 0.1 and 1.0
+        self.graph_api.pheromones[:m] = max_temp - k * r * (max_temp-min_temp) # Stochastic pheromone values
+        self.graph_api.delta_pheromones[:m] = 0.0
+        
+        # Lazy virtual edges start from the mean of the same distribution
+        self.graph_api.default_pheromone = max_temp - k * ((min_temp + max_temp) / 2) * (max_temp - min_temp)
+        
+        # Initial trails, restored by reset_pheromones between independent searches
+        self._initial_pheromones = self.graph_api.pheromones[:m].copy()
+        self._initial_default_pheromone = self.graph_api.default_pheromone
+        
+        # The cost part of the edge desirability does not change during the run
+        self.graph_api.precompute_heuristic(self.beta)
+        
+        # Local searches (their neighbor lists are built on first use)
+        self.local_searches = create_local_searches(self.graph_api, local_search)
+        
+        # Nearest neighbor candidate lists for the TSP ants
+        if self.mode == 2 and self.candidate_list_size:
+            self.graph_api.build_candidate_lists(self.candidate_list_size)
             
+    def _spawn_seeds(self, n: int) -> List[int]:
+        """Return n new independent seeds from the run's SeedSequence."""
+        return [int(child.generate_state(1, dtype=np.uint64)[0]) for child in self._seed_sequence.spawn(n)]
+    
+    def reset_pheromones(self) -> None:
+        """Restore the pheromone trails and the Adadelta state of a freshly built ACO.
+        
+        find_shortest_path keeps the trails of the previous search; call this first to
+        make a search on the same graph independent of the ones before it.
+        """
+        self.graph_api.reset_pheromones(self._initial_default_pheromone)
+        self.graph_api.pheromones[:len(self._initial_pheromones)] = self._initial_pheromones
+        self.gt = 0.0
+        self.acc = 0.0
+        self.d_acc = 0.0
+    
+    def inject_path(self, path: List[str], path_cost: float) -> bool:
+        """Take a path found outside this colony (e.g. by another island) into the search.
+        
+        A path that beats the current best becomes the best path and deposits
+        pheromone like a fit ant would; the deposit is applied by the next update.
+        
+        Args:
+            path: Path in the same graph
+            path_cost: Cost of the path
+            
+        Returns:
+            True if the path became the new best path
+        """
+        if not path or path_cost <= 0 or path_cost >= self.best_path_cost:
+            return False
+        
+        self.best_path, self.best_path_cost = list(path), path_cost
+        self.graph_api.deposit_pheromones_on_edges(self.graph_api.path_edge_ids(self.best_path),
+                                                   self.graph_api.pheromone_deposit_weight / path_cost)
+        return True
+    
     def _preprocess_with_floyd_warshall(self):
-        """Preprocess the graph using the Floyd-Warshall algorithm."""
+        """Preprocess the graph with all-pairs shortest paths (Floyd-Warshall or n x Dijkstra)."""
         # if self.log_step is not None:
         #     print("Preprocessing graph with Floyd-Warshall algorithm...")
         
-        # Create a FloydWarshall instance
-        fw = FloydWarshall(self.graph)
+        # Create the solver; True means let the engine choose from the graph density
+        method = self.use_floyd_warshall if isinstance(self.use_floyd_warshall, str) else "auto"
+        fw = create_all_pairs_solver(self.graph, method, num_workers=self.num_threads)
         
-        # Run the algorithm
-        fw.run()
+        # Run the algorithm, or map in the result of an earlier run on the same graph
+        if self.all_pairs_cache_dir:
+            AllPairsCache(self.all_pairs_cache_dir).run(fw)
+        else:
+            fw.run()
         
-        # Update the graph with shortest paths
-        fw.update_graph_with_shortest_paths()
+        # Update the graph with shortest paths, or serve them lazily
+        if self.lazy_virtual_edges:
+            self.virtual_edges = LazyVirtualEdges(fw)
+        else:
+            fw.update_graph_with_shortest_paths()
         
         # if self.log_step is not None:
         #     print(f"Floyd-Warshall preprocessing complete. Graph now has {self.graph.number_of_edges()} edges.")
             
-    def process_ant(self, ant):
+    def process_ant(self, ant, deadline=None):
         """Process a single ant for thread-based parallel execution.
         
         Args:
             ant: The ant to process
+            deadline: time.perf_counter() value at which the ant stops walking (None: no limit)
             
         Returns:
             Tuple of (ant, best_cost, best_path)
         """
-        best_cost = float("inf")
-        best_path = None
+        # Process ant until it reaches destination, max steps or the deadline
+        if not ant.run(self.ant_max_steps, deadline):
+            return (ant, float("inf"), None)
         
-        # Process ant until it reaches destination or max steps
-        for _ in range(self.ant_max_steps):
-            if ant.reached_destination():
-                ant.is_fit = True
-                
-                if ant.path_cost == 0:
-                    return (ant, 0, ant.path.copy())
-                
-                best_cost = ant.path_cost
-                best_path = ant.path.copy()
-                break
-                
-            ant.take_step()
+        if ant.path_cost == 0:
+            return (ant, 0, ant.path.copy())
         
-        return (ant, best_cost, best_path)
+        return (ant, ant.path_cost, ant.path.copy())
 
-    def _deploy_forward_search_ants(self) -> float:
-        """Process ants using thread-based parallelization for better performance"""
-        iteration_best_path_cost = float("inf")
+    def _completed_ants(self, futures):
+        """Yield the results of the ant futures as they complete, skipping failed ants.
+        
+        A seeded run takes them in submission order, so ties resolve the same way every time.
+        """
+        for future in (futures if self.seed is not None else as_completed(futures)):
+            try:
+                yield future.result()
+            except Exception as e:
+                print(f"Error processing ant: {e}")
+
+    def _deploy_forward_search_ants(self, deadline: float = None) -> float:
+        """Process ants in parallel, in a thread pool, in the worker processes or as one vectorized colony.
+        
+        Ants still walking at the deadline are stopped and count as not having reached
+        their destination(s), so only the ants that finished take part in the iteration.
+        """
+        if self.ant_pool is not None:
+            results = self.ant_pool.run([ant.source for ant in self.search_ants], self.search_ants[0].destination,
+                                        seeds=self._ant_seeds, deadline=deadline)
+            # The backward ants deposit along the paths walked by the workers (or the colony)
+            self.search_ants = [ant for ant, _, _ in results]
+            return self._collect_forward_results(results)
         
         # Use ThreadPoolExecutor for efficient thread-based parallelization
         with ThreadPoolExecutor(max_workers=self.num_threads) as executor:
-            # Map requires a function that takes a single parameter, so we need to use a lambda or partial
-            futures = [executor.submit(self.process_ant, ant) for ant in self.search_ants]
-            
-            for future in as_completed(futures):
-                try:
-                    ant, path_cost, path = future.result()
-                    if path is not None and path_cost < float("inf"):
-                        if path_cost == 0:
-                            self.best_path_cost = 0
-                            self.best_path = path
-                            return 0
-                        
-                        if path_cost <= self.best_path_cost:
-                            self.best_path = path
-                            self.best_path_cost = path_cost
-                            
-                        if path_cost <= iteration_best_path_cost:
-                            iteration_best_path_cost = path_cost
-                except Exception as e:
-                    print(f"Error processing ant: {e}")
+            futures = [executor.submit(self.process_ant, ant, deadline) for ant in self.search_ants]
+            return self._collect_forward_results(self._completed_ants(futures))
+
+    def _collect_forward_results(self, results) -> float:
+        """Update the best path from (ant, path_cost, path) results and return the iteration best cost"""
+        iteration_best_path_cost = float("inf")
+        
+        for ant, path_cost, path in results:
+            if path is not None and path_cost < float("inf"):
+                if path_cost == 0:
+                    self.best_path_cost = 0
+                    self.best_path = path
+                    return 0
+                
+                if path_cost <= self.best_path_cost:
+                    self.best_path = path
+                    self.best_path_cost = path_cost
+                    
+                if path_cost <= iteration_best_path_cost:
+                    iteration_best_path_cost = path_cost
         
         return iteration_best_path_cost
             
-    def _deploy_backward_search_ants(self, iteration, iteration_best_path_cost) -> (float, float):
+    def _deploy_backward_search_ants(self, progress, iteration_best_path_cost) -> (float, float):
+        """Deposit the pheromones of the iteration-best ants and return the MMAS trail limits.
+        
+        Args:
+            progress: Fraction (0-1) of the search done; from 0.75 on, the best path
+                gets an elitist deposit every iteration
+            iteration_best_path_cost: Cost of the best path found in this iteration
+            
+        Returns:
+            The (max, min) pheromone trail limits, or (None, None) while there is no best
+            path (of non-zero cost) to bound the trails with
+        """
+        if not 0 < self.best_path_cost < float("inf"):
+            return None, None
+        
         for ant in self.search_ants:
             if ant.is_fit and ant.path_cost <= iteration_best_path_cost:
                 # Max Min Ant System (MMAS) pheromone update
-                if float(iteration) / float(self.num_iterations) < 0.75:
+                if progress < 0.75:
                     ant.deposit_pheromones_on_path(elitist_param = 0)
                     if ant.path_cost == self.best_path_cost:
                         ant.deposit_pheromones_on_path(elitist_param = 0.2)
@@ -197,16 +373,57 @@ class ACO:
         min_pheromone = self.min_scaling_factor * max_pheromone
         return max_pheromone, min_pheromone
                 
-    def _deploy_search_ants(self, source: str, destination: str, num_ants: int) -> None:
+    def _termination_reason(self, iterations_without_improvement: int, deadline: float) -> Union[str, None]:
+        """Return why the search should stop after this iteration, or None to go on.
+        
+        Args:
+            iterations_without_improvement: Iterations since the best path last improved
+            deadline: time.perf_counter() value at which the search must end (None: no limit)
+            
+        Returns:
+            "time_budget", "no_improvement", "converged" or None
+        """
+        if deadline is not None and time.perf_counter() >= deadline:
+            return "time_budget"
+        if self.stagnation_limit is not None and iterations_without_improvement >= self.stagnation_limit:
+            return "no_improvement"
+        if (self.min_pheromone_entropy is not None
+                and self.graph_api.pheromone_entropy(self.alpha) <= self.min_pheromone_entropy):
+            return "converged"
+        return None
+    
+    def _reinitialize_pheromones(self, max_pheromone: float) -> None:
+        """Restart the pheromone trails at max_pheromone, keeping the best path found so far.
+        
+        The Adadelta accumulators are kept: from zero, the next update would wipe out
+        every trail that gets no deposit and the colony would converge again at once.
+        """
+        self.graph_api.reset_pheromones(max_pheromone)
+        self.num_reinitializations += 1
+    
+    def _deploy_search_ants(self, source: str, destination: str, num_ants: int, deadline: float = None):
+        """Run the iterations of a search, yielding the iteration number whenever the best path improves."""
+        self.stop_reason = "max_iterations"
+        self.iterations_completed = 0
+        self.num_reinitializations = 0
+        iterations_without_improvement = 0
+        last_best_path_cost = self.best_path_cost
+        start_time = time.perf_counter()
+        
         for iteration in range(self.num_iterations):
             # Clear previous ants
             self.search_ants.clear()
             
-            # Create new ants
-            for _ in range(num_ants):
+            # pheromone^alpha of every edge, for all ants of this iteration
+            self.graph_api.update_pheromone_weights(self.alpha)
+            
+            # Create new ants, each with its own random stream in a seeded run
+            self._ant_seeds = self._spawn_seeds(num_ants) if self.seed is not None else None
+            for i in range(num_ants):
+                rng = random.Random(self._ant_seeds[i]) if self._ant_seeds is not None else None
                 if self.mode == 2:  # TSP mode
                     # For TSP, randomly select a spawn point
-                    spawn_point = random.choice(list(self.graph.nodes()))
+                    spawn_point = self.rng.choice(list(self.graph.nodes()))
                     all_nodes = list(self.graph.nodes())
                     ant = Ant(
                         self.graph_api,
@@ -214,7 +431,8 @@ class ACO:
                         all_nodes,    # All nodes are destinations
                         alpha=self.alpha,
                         beta=self.beta,
-                        mode=self.mode
+                        mode=self.mode,
+                        rng=rng
                     )
                     self.search_ants.append(ant)
                 else:
@@ -225,25 +443,45 @@ class ACO:
                         destination,
                         alpha=self.alpha,
                         beta=self.beta,
-                        mode=self.mode
+                        mode=self.mode,
+                        rng=rng
                     )
                     self.search_ants.append(ant)
 
             # Deploy ants and get progress
-            iteration_best_path_cost = self._deploy_forward_search_ants()
+            iteration_best_path_cost = self._deploy_forward_search_ants(deadline)
             
             # Handle case where destination is origin
             if (iteration_best_path_cost == 0):
+                self.iterations_completed = iteration + 1
+                self.stop_reason = "zero_cost"
+                yield iteration + 1
                 break
             
-            max_pheromon, min_pheromon = self._deploy_backward_search_ants(iteration, iteration_best_path_cost)        
+            # Improve the iteration-best ant before it deposits pheromone (not past the deadline)
+            local_search_due = self.use_local_search and (iteration + 1) % self.local_search_frequency == 0
+            if deadline is not None and time.perf_counter() >= deadline:
+                local_search_due = False
+            if local_search_due and self.local_search_target in ("iteration", "both"):
+                iteration_best_path_cost = self._improve_iteration_best(iteration_best_path_cost)
+            
+            # Until some ant finishes (routine with a deadline cutting ants off) there is nothing
+            # to deposit and no path cost to bound the trails with, so they are left as they are
+            max_pheromon = min_pheromon = None
+            if self.best_path_cost < float("inf"):
+                # How far the search is, in iterations or, with a deadline, in time if that ends it first
+                progress = iteration / self.num_iterations
+                if deadline is not None and deadline > start_time:
+                    progress = max(progress, (time.perf_counter() - start_time) / (deadline - start_time))
+                max_pheromon, min_pheromon = self._deploy_backward_search_ants(progress, iteration_best_path_cost)
             
             # Update pheromones after each iteration
-            self.acc, self.d_acc = self.graph_api.update_pheromones(max_pheromon, min_pheromon, self.acc, self.d_acc)
+            if max_pheromon is not None:
+                self.acc, self.d_acc = self.graph_api.update_pheromones(max_pheromon, min_pheromon, self.acc, self.d_acc)
             
             # Apply local search optimization if enabled
-            if self.use_local_search and (iteration + 1) % self.local_search_frequency == 0:
-                self.best_path, self.best_path_cost = self._apply_2opt_local_search(self.best_path)
+            if local_search_due and self.local_search_target in ("best", "both"):
+                self.best_path, self.best_path_cost = self._apply_local_search(self.best_path)
             
             # Logging 
             if self.log_step is not None and ((iteration + 1) % self.log_step == 0):
@@ -252,25 +490,67 @@ class ACO:
             # Visualization update
             if self.visualize and (iteration % self.visualization_step == 0):
                 self.visualizer.update_state(iteration + 1, self.best_path, self.best_path_cost)    
+            
+            if self.iteration_hook is not None:
+                self.iteration_hook(self, iteration + 1)
+            
+            # Stopping criteria
+            self.iterations_completed = iteration + 1
+            if self.best_path_cost < last_best_path_cost:
+                last_best_path_cost = self.best_path_cost
+                iterations_without_improvement = 0
+                try:
+                    yield iteration + 1
+                except GeneratorExit:
+                    # The consumer of iter_improvements stopped listening
+                    self.stop_reason = "stopped"
+                    raise
+            else:
+                iterations_without_improvement += 1
+            if self.iterations_completed == self.num_iterations:
+                break
+            
+            reason = self._termination_reason(iterations_without_improvement, deadline)
+            if reason in ("no_improvement", "converged") and self.reinitialize_on_stagnation:
+                # Without a path yet the trails are still the initial ones: just keep searching
+                if max_pheromon is not None:
+                    self._reinitialize_pheromones(max_pheromon)
+                iterations_without_improvement = 0
+                if self.log_step is not None:
+                    print(f"Iteration {iteration + 1}: pheromones reinitialized ({reason})")
+            elif reason is not None:
+                self.stop_reason = reason
+                break
+        
+        if self.log_step is not None:
+            print(f"Stopped after {self.iterations_completed} iterations: {self.stop_reason}")
 
-    def find_shortest_path(
+    def iter_improvements(
         self,
         source: str,
         destination: str,
         num_ants: int,
-    ) -> Tuple[List[str], float]:
-        """Finds the shortest path according to the current mode
+        time_limit: float = None,
+    ) -> Iterator[Tuple[int, List[str], float]]:
+        """Run a search and yield every improvement of the best path as it is found.
+        
+        Closing the generator (close(), or a with contextlib.closing(...) block around
+        the loop) ends the search early, with stop_reason "stopped", and releases the
+        ant executor.
         
         Args:
             source: Source node
             destination: Destination node or list of nodes
             num_ants: Number of ants to deploy
-            save_animation: Whether to save the visualization as an animation
-            animation_filename: Filename for the animation
+            time_limit: Wall-clock limit of this search in seconds (default: time_budget)
             
-        Returns:
-            Tuple containing the best path and its cost
+        Yields:
+            Tuples of (iteration, best_path, best_path_cost), with strictly falling costs
         """
+        if time_limit is None:
+            time_limit = self.time_budget
+        deadline = time.perf_counter() + time_limit if time_limit is not None else None
+        
         # Verify the graph has the required nodes
         if source not in self.graph.nodes():
             raise ValueError(f"Source node {source} cannot access in graph")
@@ -287,12 +567,49 @@ class ACO:
         self.best_path = []
         self.best_path_cost = float("inf")
         
+        # Start the worker processes (or lay out the colony arrays) once per search
+        if self.ant_executor == "process":
+            self.ant_pool = AntProcessPool(self.graph_api, self.alpha, self.beta, self.mode,
+                                           self.ant_max_steps, num_workers=self.num_processes)
+        elif self.ant_executor == "vectorized":
+            self.ant_pool = VectorizedColony(self.graph_api, self.alpha, self.beta, self.mode, self.ant_max_steps)
+        
         # Do the actual search
-        self._deploy_search_ants(
-            source,
-            destination,
-            num_ants,
-        )
+        try:
+            for iteration in self._deploy_search_ants(source, destination, num_ants, deadline):
+                yield iteration, list(self.best_path), self.best_path_cost
+        finally:
+            if self.ant_pool is not None:
+                self.ant_pool.close()
+                self.ant_pool = None
+    
+    def find_shortest_path(
+        self,
+        source: str,
+        destination: str,
+        num_ants: int,
+        time_limit: float = None,
+        callback: Callable[[int, List[str], float], None] = None,
+    ) -> Tuple[List[str], float]:
+        """Finds the shortest path according to the current mode
+        
+        Args:
+            source: Source node
+            destination: Destination node or list of nodes
+            num_ants: Number of ants to deploy
+            time_limit: Wall-clock limit in seconds; when it expires the best path found
+                so far is returned (default: time_budget)
+            callback: Called as callback(iteration, best_path, best_path_cost) every time
+                the best path improves
+            
+        Returns:
+            Tuple containing the best path and its cost; iterations_completed and
+            stop_reason ("max_iterations", "zero_cost", "time_budget", "no_improvement"
+            or "converged") tell how the search ended
+        """
+        for iteration, path, path_cost in self.iter_improvements(source, destination, num_ants, time_limit):
+            if callback is not None:
+                callback(iteration, path, path_cost)
         
         # For TSP mode, validate the path includes all nodes
         if self.mode == 2 and self.best_path:
@@ -312,11 +629,58 @@ class ACO:
             
         return self.best_path, self.best_path_cost
     
-    def _apply_2opt_local_search(self, path):
-        """Applies 2-opt local search to improve a path.
+    def expand_path(self, path: List[str]) -> List[str]:
+        """Replace the virtual edges of a path by the real nodes they stand for.
+        
+        Args:
+            path: Path returned by find_shortest_path
+            
+        Returns:
+            The same route as a list of nodes joined only by real edges
+        """
+        if self.virtual_edges is not None:
+            return self.virtual_edges.expand_path(path)
+        
+        if len(path) < 2:
+            return list(path)
+        
+        # Eagerly materialised virtual edges carry their path as an attribute
+        expanded = [path[0]]
+        for u, v in zip(path, path[1:]):
+            edge_path = self.graph.get_edge_data(u, v).get("path") or [u, v]
+            expanded.extend(edge_path[1:])
+        return expanded
+    
+    def _improve_iteration_best(self, iteration_best_path_cost: float) -> float:
+        """Apply the local searches to the path of the iteration-best ant.
         
-        The 2-opt algorithm swaps two edges in the path to create a new path
-        and keeps the changes if they improve the solution.
+        The ant keeps the improved path, so the backward phase deposits on it, and
+        the global best is updated if the improved path beats it.
+        
+        Args:
+            iteration_best_path_cost: Cost of the best path found in this iteration
+            
+        Returns:
+            The iteration best cost after the improvement
+        """
+        fit_ants = [ant for ant in self.search_ants if ant.is_fit and ant.path_cost == iteration_best_path_cost]
+        if not fit_ants:
+            return iteration_best_path_cost
+        
+        ant = fit_ants[0]
+        path, path_cost = self._apply_local_search(ant.path)
+        if path_cost >= ant.path_cost:
+            return iteration_best_path_cost
+        
+        # Every ant on the old iteration best path now carries the improved one
+        for other in fit_ants:
+            other.path, other.path_cost = list(path), path_cost
+        if path_cost <= self.best_path_cost:
+            self.best_path, self.best_path_cost = list(path), path_cost
+        return path_cost
+    
+    def _apply_local_search(self, path):
+        """Applies the configured local searches to improve a path.
         
         Args:
             path: The current path to optimize
@@ -324,37 +688,12 @@ class ACO:
         Returns:
             Tuple of (improved_path, improved_cost)
         """
-        if len(path) < 4:  # Not enough nodes for meaningful swaps
+        if not path:  # No path found yet
+            return path, float("inf")
+        if len(path) < 4 or not self.local_searches:  # Not enough nodes for meaningful moves
             return path, self._calculate_path_cost(path)
         
-        improved = True
-        best_path = path.copy()
-        best_cost = self._calculate_path_cost(best_path)
-        
-        # Continue until no improvement can be made
-        while improved:
-            improved = False
-            for i in range(1, len(best_path) - 2):
-                for j in range(i + 1, len(best_path) - 1):
-                    # Skip if nodes are adjacent
-                    if j == i + 1:
-                        continue
-                    
-                    # Create new path with 2-opt swap: reverse the segment between i and j
-                    new_path = best_path[:i] + best_path[i:j+1][::-1] + best_path[j+1:]
-                    new_cost = self._calculate_path_cost(new_path)
-                    
-                    # Update if we found a better path
-                    if new_cost < best_cost:
-                        best_path = new_path
-                        best_cost = new_cost
-                        improved = True
-                        break  # Start the nested loops again with the new path
-                
-                if improved:
-                    break  # break out of outer loop if improved
-        
-        return best_path, best_cost
+        return improve_path(self.local_searches, path)
     
     def _calculate_path_cost(self, path):
         """Calculate the total cost of a path.
@@ -67,7 +67,7 @@ class ACOVisualizer:
         # Get max pheromone value for normalization
         max_pheromone = 0.0001  # Small non-zero value to avoid division by zero
         for u, v in self.graph_api.graph.get_edges():
-            pheromone = self.graph_api.graph.edges.get((u, v), {}).get("pheromones", 0)
+            pheromone = self.graph_api.get_edge_pheromones(u, v)
             max_pheromone = max(max_pheromone, pheromone)
         
         # Draw non-path nodes
@@ -91,7 +91,7 @@ class ACOVisualizer:
             x2, y2 = self.graph_api.graph.pos[v]
             
             # Get edge pheromone level
-            pheromone = self.graph_api.graph.edges.get((u, v), {}).get("pheromones", 0)
+            pheromone = self.graph_api.get_edge_pheromones(u, v)
             normalized_pheromone = pheromone / max_pheromone
             
             # Create color: green (low) to red (high)
@@ -129,7 +129,7 @@ class ACOVisualizer:
             # if (u, v) in path_edges:
             #     midx, midy = (x1 + x2) / 2, (y1 + y2) / 2
             #     cost = self.graph_api.graph.edges.get((u, v), {}).get("cost", 0)
-            #     pheromone_value = self.graph_api.graph.edges.get((u, v), {}).get("pheromones", 0)
+            #     pheromone_value = self.graph_api.get_edge_pheromones(u, v)
             #     label = f"cost: {cost}\nphero: {round(pheromone_value, 3)}"
             #     self.ax.text(midx, midy, label, fontsize=8, fontweight='bold',
             #             bbox=dict(facecolor='mistyrose', alpha=0.8, edgecolor='gray'),
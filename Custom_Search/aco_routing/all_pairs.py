@@ -0,0 +1,171 @@
+from typing import List, Tuple
+import heapq
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+from aco_routing.network import Network
+from aco_routing.csr_graph import CSRGraph
+from aco_routing.floyd_warshall import FloydWarshall, BlockedFloydWarshall
+
+# Rough per-operation costs used to choose an all-pairs method, measured on this code:
+# the vectorized Floyd-Warshall spends ~5 ns per matrix cell per pivot, one Python
+# Dijkstra run ~40 ns per (E + V) * log2(V) unit.
+FLOYD_WARSHALL_SECONDS_PER_CELL = 5e-9
+DIJKSTRA_SECONDS_PER_OPERATION = 4e-8
+
+# Below this estimated serial Dijkstra time a process pool costs more than it saves
+PROCESS_POOL_MIN_SECONDS = 0.5
+
+# From this many nodes on the blocked Floyd-Warshall beats the plain one
+BLOCKED_FLOYD_WARSHALL_MIN_NODES = 1500
+
+ALL_PAIRS_METHODS = ("auto", "dense", "blocked", "dijkstra")
+
+
+def _single_source_dijkstra(source: int, indptr: List[int], indices: List[int], weights: List[float]) -> Tuple[List[float], List[int]]:
+    """Dijkstra from one source over CSR lists.
+
+    Returns:
+        Tuple of (distance to every node, index of the first hop on the path to every node).
+        Unreachable nodes and the source itself have a first hop of -1.
+    """
+    n = len(indptr) - 1
+    dist = [math.inf] * n
+    first_hop = [-1] * n
+    settled = bytearray(n)
+    dist[source] = 0.0
+    heap = [(0.0, source)]
+
+    while heap:
+        d, u = heapq.heappop(heap)
+        if settled[u]:
+            continue
+        settled[u] = 1
+        hop = first_hop[u]
+
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            new_dist = d + weights[k]
+            if new_dist < dist[v]:
+                dist[v] = new_dist
+                first_hop[v] = v if u == source else hop
+                heapq.heappush(heap, (new_dist, v))
+
+    return dist, first_hop
+
+
+# Graph arrays of a pool worker, shipped once through the pool initializer
+_worker_graph = None
+
+
+def _init_worker(indptr: List[int], indices: List[int], weights: List[float]) -> None:
+    global _worker_graph
+    _worker_graph = (indptr, indices, weights)
+
+
+def _dijkstra_rows(sources: List[int]) -> Tuple[List[int], np.ndarray, np.ndarray]:
+    """Pool task: distance and successor rows for a batch of sources."""
+    indptr, indices, weights = _worker_graph
+    dist_rows = np.empty((len(sources), len(indptr) - 1))
+    next_rows = np.empty((len(sources), len(indptr) - 1), dtype=np.int32)
+    for row, source in enumerate(sources):
+        dist_rows[row], next_rows[row] = _single_source_dijkstra(source, indptr, indices, weights)
+    return sources, dist_rows, next_rows
+
+
+class RepeatedDijkstra(FloydWarshall):
+    """
+    All-pairs shortest paths by running Dijkstra once from every node.
+
+    For sparse graphs (E close to V) n x Dijkstra costs O(V * E log V) instead of the
+    O(V^3) of Floyd-Warshall. Edge costs in this project are never negative, so the
+    Johnson reweighting step is not needed. The runs are independent and are spread
+    over a process pool. It fills the same dist_matrix / next_matrix as FloydWarshall,
+    so get_shortest_path and update_graph_with_shortest_paths work unchanged.
+    """
+
+    def __init__(self, graph: Network, num_workers: int = None):
+        """Initialize with a Network graph.
+
+        Args:
+            graph: Network graph object
+            num_workers: Number of worker processes (1 runs everything in this process)
+        """
+        super().__init__(graph)
+        self.num_workers = num_workers if num_workers else multiprocessing.cpu_count()
+        self.csr = CSRGraph(self.nodes, ((u, v, data.get("cost", float('inf')))
+                                         for (u, v), data in self.graph.edges.items()))
+
+    def run(self):
+        """Run Dijkstra from every node and fill the distance and successor matrices."""
+        indptr, indices, weights = self.csr.adjacency_lists()
+        estimated_seconds = estimate_dijkstra_seconds(self.n, len(indices))
+
+        if self.num_workers <= 1 or self.n < 2 or estimated_seconds < PROCESS_POOL_MIN_SECONDS:
+            for source in range(self.n):
+                self.dist_matrix[source], self.next_matrix[source] = _single_source_dijkstra(
+                    source, indptr, indices, weights)
+            return
+
+        # A few batches per worker keeps the load balanced without much pickling
+        batch_size = max(1, self.n // (self.num_workers * 4))
+        batches = [list(range(start, min(start + batch_size, self.n)))
+                   for start in range(0, self.n, batch_size)]
+
+        with ProcessPoolExecutor(max_workers=self.num_workers, initializer=_init_worker,
+                                 initargs=(indptr, indices, weights)) as executor:
+            for sources, dist_rows, next_rows in executor.map(_dijkstra_rows, batches):
+                self.dist_matrix[sources] = dist_rows
+                self.next_matrix[sources] = next_rows
+
+
+def estimate_floyd_warshall_seconds(node_count: int) -> float:
+    """Estimated run time of the vectorized Floyd-Warshall."""
+    return FLOYD_WARSHALL_SECONDS_PER_CELL * node_count ** 3
+
+
+def estimate_dijkstra_seconds(node_count: int, edge_count: int, num_workers: int = 1) -> float:
+    """Estimated run time of n x Dijkstra spread over num_workers processes."""
+    if node_count < 2:
+        return 0.0
+    per_source = DIJKSTRA_SECONDS_PER_OPERATION * (edge_count + node_count) * math.log2(node_count)
+    return node_count * per_source / max(1, num_workers)
+
+
+def choose_all_pairs_method(graph: Network, num_workers: int = None) -> str:
+    """Pick "dijkstra", "blocked" or "dense" from the size and density of the graph."""
+    num_workers = num_workers if num_workers else multiprocessing.cpu_count()
+    node_count = graph.number_of_nodes()
+    edge_count = graph.number_of_edges()
+
+    if estimate_dijkstra_seconds(node_count, edge_count, num_workers) < estimate_floyd_warshall_seconds(node_count):
+        return "dijkstra"
+    if node_count >= BLOCKED_FLOYD_WARSHALL_MIN_NODES:
+        return "blocked"
+    return "dense"
+
+
+def create_all_pairs_solver(graph: Network, method: str = "auto", num_workers: int = None) -> FloydWarshall:
+    """Create an all-pairs shortest path solver for graph.
+
+    Args:
+        graph: Network graph object
+        method: "dense" (FloydWarshall), "blocked" (BlockedFloydWarshall),
+                "dijkstra" (RepeatedDijkstra) or "auto" to choose from the graph density
+        num_workers: Threads (blocked) or processes (dijkstra) to use
+
+    Returns:
+        A solver with run(), get_shortest_path() and update_graph_with_shortest_paths()
+    """
+    if method not in ALL_PAIRS_METHODS:
+        raise ValueError(f"Unknown all-pairs method: {method}")
+    if method == "auto":
+        method = choose_all_pairs_method(graph, num_workers)
+
+    if method == "dijkstra":
+        return RepeatedDijkstra(graph, num_workers=num_workers)
+    if method == "blocked":
+        return BlockedFloydWarshall(graph, num_threads=num_workers)
+    return FloydWarshall(graph)
@@ -1,6 +1,8 @@
 from typing import Dict, List, Set, Union
 import os
+import random
 import sys
+import time
 
 # Import paths setup
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -19,6 +21,7 @@ class Ant:
         alpha: float = 0.7,
         beta: float = 0.3,
         mode: int = 0,
+        rng: random.Random = None,
     ):
         """Initialize an ant for ACO algorithm.
         
@@ -29,8 +32,10 @@ class Ant:
             alpha: Pheromone bias (importance of pheromone trails)
             beta: Edge cost bias (importance of shorter paths)
             mode: Operation mode (0: any destination, 1: all destinations)
+            rng: Random number generator of this ant (default: the global random module)
         """
         self.graph_api = graph_api
+        self.rng = rng if rng is not None else random
         self.source = source
         self.destination = destination if destination is not None else []
         self.alpha = alpha
@@ -51,6 +56,29 @@ class Ant:
         if self.current_node in self.destination:
             self.visited_destinations.add(self.current_node)
 
+    @classmethod
+    def from_path(cls, graph_api: GraphApi, path: List[str], path_cost: float, is_fit: bool,
+                  destination: Union[str, List[str], Set[str]] = None, alpha: float = 0.7,
+                  beta: float = 0.3, mode: int = 0) -> "Ant":
+        """Rebuild an ant from a walk done elsewhere (a worker process or the vectorized colony).
+        
+        Args:
+            graph_api: The graph API the ant deposits its pheromones on
+            path: Nodes visited by the ant, starting at its spawn node
+            path_cost: Total cost of the path
+            is_fit: Whether the walk counts as a solution
+            
+        Returns:
+            An ant that can take part in the backward (deposit) phase
+        """
+        ant = cls(graph_api, path[0], destination, alpha=alpha, beta=beta, mode=mode)
+        ant.path = path
+        ant.path_cost = path_cost
+        ant.is_fit = is_fit
+        ant.current_node = path[-1]
+        ant.visited_nodes = set(path[:-1])
+        return ant
+
     def reached_destination(self) -> bool:
         """Returns if the ant has reached all specified destinations
         
@@ -61,11 +89,8 @@ class Ant:
             self.visited_destinations.add(self.current_node)
         
         if self.mode == 2:  # TSP mode
-            # Get all nodes in the graph
-            all_nodes = set(self.graph_api.get_all_nodes())
-            
             # Check if we've visited all nodes and returned to source
-            has_visited_all = len(self.visited_nodes) >= len(all_nodes)
+            has_visited_all = len(self.visited_nodes) >= self.graph_api.number_of_nodes()
             
             # For a valid TSP tour, we need to have visited all nodes and returned to our starting point
             return has_visited_all and self.current_node == self.source
@@ -83,34 +108,20 @@ class Ant:
         return [node for node in self.graph_api.get_neighbors(self.current_node)
                 if node not in visited_set]
 
-    def _compute_all_edges_desirability(
+    def _compute_edges_desirability(
         self,
         unvisited_neighbors: List[str],
-    ) -> float:
-        """Computes the denominator of the transition probability equation for the ant
+    ) -> List[float]:
+        """Computes the desirability of the outgoing edges to the unvisited neighbors
 
         Args:
             unvisited_neighbors (List[str]): All unvisited neighbors of the current node
 
         Returns:
-            float: The summation of all the outgoing edges (to unvisited nodes) from the current node
+            List[float]: pheromone^alpha * (1/cost)^beta of every edge, in neighbor order
         """
-        total = 0.0
-        for neighbor in unvisited_neighbors:
-            edge_pheromones = self.graph_api.get_edge_pheromones(
-                self.current_node, neighbor
-            )
-            edge_cost = self.graph_api.get_edge_cost(self.current_node, neighbor)
-            edge_distance = self.graph_api.get_edge_distance(self.current_node, neighbor)
-            # Avoid division by zero
-            if edge_cost == 0:
-                edge_cost = 0.001  # Small value instead of zero
-                
-            total += utils.compute_edge_desirability(
-                edge_pheromones, edge_cost, edge_distance, self.alpha, self.beta, self.mode
-            )
-
-        return total
+        return [self.graph_api.get_edge_desirability(self.current_node, neighbor)
+                for neighbor in unvisited_neighbors]
 
     def _calculate_edge_probabilities(
         self, unvisited_neighbors: List[str]
@@ -126,9 +137,8 @@ class Ant:
         """
         probabilities: Dict[str, float] = {}
         transition_values: Dict[str, float] = {}
-        all_edges_desirability = self._compute_all_edges_desirability(
-            unvisited_neighbors
-        )
+        edges_desirability = self._compute_edges_desirability(unvisited_neighbors)
+        all_edges_desirability = sum(edges_desirability)
         
         # Guard against division by zero
         if all_edges_desirability == 0:
@@ -138,20 +148,7 @@ class Ant:
             # Return consistent tuple format (probabilities, transition_values)
             return equal_probs, equal_probs
 
-        for neighbor in unvisited_neighbors:
-            edge_pheromones = self.graph_api.get_edge_pheromones(
-                self.current_node, neighbor
-            )
-            edge_cost = self.graph_api.get_edge_cost(self.current_node, neighbor)
-            edge_distance = self.graph_api.get_edge_distance(self.current_node, neighbor)
-            
-            # Avoid division by zero
-            if edge_cost == 0:
-                edge_cost = 0.001  # Small value instead of zero
-
-            current_edge_desirability = utils.compute_edge_desirability(
-                edge_pheromones, edge_cost, edge_distance, self.alpha, self.beta, self.mode
-            )
+        for neighbor, current_edge_desirability in zip(unvisited_neighbors, edges_desirability):
             transition_values[neighbor] = current_edge_desirability
             probabilities[neighbor] = current_edge_desirability / all_edges_desirability
 
@@ -160,18 +157,19 @@ class Ant:
     def _choose_next_node(self) -> Union[str, None]:
         """Choose the next node to be visited by the ant"""
         if self.mode == 2:  # TSP mode
-            all_nodes = set(self.graph_api.get_all_nodes())
-            unvisited = all_nodes - self.visited_nodes
-            
             # If we've visited all nodes, try to return to source
-            if len(unvisited) == 0:
+            if len(self.visited_nodes) >= self.graph_api.number_of_nodes():
                 if self.source in self.graph_api.get_neighbors(self.current_node):
                     return self.source
                 return None
-                
-            # Prioritize unvisited nodes, especially if few remain
-            unvisited_neighbors = [n for n in self.graph_api.get_neighbors(self.current_node) 
-                                if n in unvisited]
+            
+            # Nearest neighbors first, the full neighborhood only once they are all visited
+            unvisited_neighbors = []
+            if self.graph_api.candidate_lists is not None:
+                unvisited_neighbors = [n for n in self.graph_api.candidate_lists.get(self.current_node, [])
+                                       if n not in self.visited_nodes]
+            if not unvisited_neighbors:
+                unvisited_neighbors = self._get_unvisited_neighbors()
         else:
             # Original implementation for other modes
             unvisited_neighbors = self._get_unvisited_neighbors()
@@ -182,7 +180,7 @@ class Ant:
 
         # For regular ants, use probabilistic selection
         probabilities, transition_values = self._calculate_edge_probabilities(unvisited_neighbors)
-        return utils.pseudo_random_proportional_selection(transition_values, probabilities)
+        return utils.pseudo_random_proportional_selection(transition_values, probabilities, self.rng)
 
     def take_step(self) -> None:
         """Compute and update the ant position"""
@@ -200,8 +198,7 @@ class Ant:
         if not next_node:
             if self.mode == 2:
                 # For TSP: check if we've visited all nodes and returned to source
-                all_nodes = set(self.graph_api.get_all_nodes())
-                if len(self.visited_nodes) == len(all_nodes) and self.current_node == self.source:
+                if len(self.visited_nodes) == self.graph_api.number_of_nodes() and self.current_node == self.source:
                     # Complete successful tour
                     self.is_fit = True
                 else:
@@ -220,11 +217,29 @@ class Ant:
         if self.mode == 2 and self.reached_destination():
             self.is_fit = True
 
+    def run(self, max_steps: int, deadline: float = None) -> bool:
+        """Walk until the ant reaches its destination(s), runs out of steps or out of time.
+        
+        Args:
+            max_steps: Maximum number of steps the ant is allowed to take
+            deadline: time.perf_counter() value at which the ant stops walking (None: no limit)
+            
+        Returns:
+            True if the destination(s) were reached within max_steps and before the deadline
+        """
+        for _ in range(max_steps):
+            if self.reached_destination():
+                self.is_fit = True
+                return True
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+            self.take_step()
+        return False
+
     def deposit_pheromones_on_path(self, elitist_param) -> None:
-        for i in range(len(self.path) - 1):
-            u, v = self.path[i], self.path[i + 1]
-            if elitist_param == 0:
-                deposit_pheromone_value = self.graph_api.pheromone_deposit_weight / self.path_cost
-            else:
-                deposit_pheromone_value = elitist_param / self.path_cost
-            self.graph_api.deposit_pheromones(u, v, deposit_pheromone_value)
\ No newline at end of file
+        if elitist_param == 0:
+            deposit_pheromone_value = self.graph_api.pheromone_deposit_weight / self.path_cost
+        else:
+            deposit_pheromone_value = elitist_param / self.path_cost
+        # The same amount goes on every edge of the path, in one vectorized add
+        self.graph_api.deposit_pheromones_on_edges(self.graph_api.path_edge_ids(self.path), deposit_pheromone_value)
\ No newline at end of file
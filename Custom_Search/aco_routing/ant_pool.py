@@ -0,0 +1,249 @@
+from typing import List, Tuple, Union
+from types import SimpleNamespace
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import multiprocessing
+import random
+import time
+import numpy as np
+
+from aco_routing.ant import Ant
+from aco_routing.graph_api import GraphApi
+from aco_routing.virtual_edges import LazyVirtualEdges
+
+# Number of batches handed to each worker per iteration (more batches balance the
+# load better, fewer batches pickle less)
+BATCHES_PER_WORKER = 2
+
+# GraphApi arrays copied into the shared snapshot every iteration, one row each
+SNAPSHOT_ARRAYS = ("pheromones", "costs", "pheromone_weights", "heuristic")
+
+
+def _create_shared_array(array: np.ndarray) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    """Copy array into a new shared memory block and return the block and a view on it."""
+    shm = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+    view = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+    view[...] = array
+    return shm, view
+
+
+def _attach_shared_array(name: str, shape: Tuple[int, ...], dtype) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    """Attach to a shared memory block created by the parent process."""
+    shm = shared_memory.SharedMemory(name=name)
+    view = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    view.flags.writeable = False
+    return shm, view
+
+
+class _SnapshotGraphApi(GraphApi):
+    """
+    Read-only GraphApi of a worker process.
+
+    The per-edge arrays are views on the parent's shared memory snapshot, so the
+    ants read the values of the current iteration without any copying; the default
+    pheromone of virtual edges without an id comes with every task. Deposits are
+    done by the parent once the paths come back.
+    """
+
+    def __init__(self, graph, evaporation_rate, virtual_edges, default_pheromone, edge_list, alpha, beta,
+                 candidate_lists=None):
+        self._shm = None
+        super().__init__(graph, evaporation_rate, virtual_edges)
+        self.default_pheromone = default_pheromone
+        self.default_pheromone_weight = default_pheromone ** alpha
+        self.heuristic_exponent = beta
+        self.candidate_lists = candidate_lists
+        
+        # The edge ids of the parent when the pool started
+        self._edge_list = list(edge_list)
+        self._edge_ids = {edge: edge_id for edge_id, edge in enumerate(self._edge_list)}
+        self._base_edges = len(self._edge_list)
+
+    def _init_edge_arrays(self) -> None:
+        """No arrays of its own: attach points them at the parent's snapshot."""
+        for name in SNAPSHOT_ARRAYS:
+            setattr(self, name, None)
+
+    def attach(self, shm_name: str, capacity: int) -> None:
+        """Point the per-edge arrays at a (possibly new) snapshot block."""
+        if self._shm is not None and self._shm.name == shm_name:
+            return
+        if self._shm is not None:
+            # The views must go before the block they point into can be closed
+            for name in SNAPSHOT_ARRAYS:
+                setattr(self, name, None)
+            self._shm.close()
+        self._shm, snapshot = _attach_shared_array(shm_name, (len(SNAPSHOT_ARRAYS), capacity), np.float64)
+        for row, name in enumerate(SNAPSHOT_ARRAYS):
+            setattr(self, name, snapshot[row])
+
+    def sync_edges(self, new_edges: List[Tuple[str, str]]) -> None:
+        """Learn the ids the parent gave to virtual edges since the pool started."""
+        for edge in new_edges[len(self._edge_list) - self._base_edges:]:
+            self._edge_ids[edge] = len(self._edge_list)
+            self._edge_list.append(edge)
+
+
+# Graph snapshot of a pool worker, built once by the pool initializer
+_worker_api = None
+_worker_shms = []
+_worker_ant_args = None
+
+
+def _init_worker(graph, evaporation_rate, default_pheromone, edge_list, candidate_lists, solver_state, ant_args) -> None:
+    global _worker_api, _worker_ant_args
+    virtual_edges = None
+    if solver_state is not None:
+        nodes, dist_name, n = solver_state
+        shm, dist_matrix = _attach_shared_array(dist_name, (n, n), np.float64)
+        _worker_shms.append(shm)
+        solver = SimpleNamespace(graph=graph, nodes=nodes, dist_matrix=dist_matrix,
+                                 node_to_idx={node: i for i, node in enumerate(nodes)})
+        virtual_edges = LazyVirtualEdges(solver)
+    alpha, beta = ant_args[:2]
+    _worker_api = _SnapshotGraphApi(graph, evaporation_rate, virtual_edges, default_pheromone, edge_list,
+                                    alpha, beta, candidate_lists)
+    _worker_ant_args = ant_args
+
+
+def _run_ant_batch(task) -> List[Tuple[List[str], float, bool, bool]]:
+    """Pool task: run a batch of ants on the current snapshot and return their paths."""
+    (seed, ant_seeds, shm_name, capacity, new_edges, default_pheromones, spawn_points, destination,
+     wall_deadline) = task
+    _worker_api.attach(shm_name, capacity)
+    _worker_api.sync_edges(new_edges)
+    _worker_api.default_pheromone, _worker_api.default_pheromone_weight = default_pheromones
+    random.seed(seed)
+
+    # The deadline crosses processes as a time.time() value; the ants check perf_counter
+    deadline = None
+    if wall_deadline is not None:
+        deadline = time.perf_counter() + (wall_deadline - time.time())
+
+    alpha, beta, mode, ant_max_steps = _worker_ant_args
+    results = []
+    for i, spawn_point in enumerate(spawn_points):
+        # An ant with its own seed draws the same walk whatever batch or worker runs it
+        rng = random.Random(ant_seeds[i]) if ant_seeds is not None else None
+        ant = Ant(_worker_api, spawn_point, destination, alpha=alpha, beta=beta, mode=mode, rng=rng)
+        reached = ant.run(ant_max_steps, deadline)
+        results.append((ant.path, ant.path_cost, ant.is_fit, reached))
+    return results
+
+
+class AntProcessPool:
+    """
+    Runs the forward search ants of an iteration in worker processes.
+
+    Ant.take_step is pure Python, so a thread pool is held back by the GIL. The
+    workers get the graph once, through the pool initializer, and every iteration
+    they read pheromones and costs from a shared memory snapshot written by the
+    parent. The distance matrix behind lazy virtual edges is shared the same way.
+    Workers only send back the path, cost and fitness of each ant; the parent
+    rebuilds the ants and does all pheromone deposits itself.
+    """
+
+    def __init__(self, graph_api: GraphApi, alpha: float, beta: float, mode: int,
+                 ant_max_steps: int, num_workers: int = None):
+        """Start the worker processes.
+
+        Args:
+            graph_api: GraphApi of the parent, already initialised with pheromones
+            alpha: Pheromone bias
+            beta: Edge cost bias
+            mode: Search mode (0: any destination, 1: all destinations, 2: TSP mode)
+            ant_max_steps: Maximum number of steps an ant is allowed to take
+            num_workers: Number of worker processes (default: CPU count)
+        """
+        self.graph_api = graph_api
+        self.alpha = alpha
+        self.beta = beta
+        self.mode = mode
+        self.num_workers = num_workers if num_workers else multiprocessing.cpu_count()
+        self._base_edges = graph_api.num_edges
+        self._snapshot_shm = None
+        self._snapshot = None
+        self._shms = []
+
+        solver_state = None
+        if graph_api.virtual_edges is not None:
+            solver = graph_api.virtual_edges.solver
+            dist_shm, _ = _create_shared_array(np.ascontiguousarray(solver.dist_matrix, dtype=np.float64))
+            self._shms.append(dist_shm)
+            solver_state = (solver.nodes, dist_shm.name, solver.n)
+
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.num_workers, initializer=_init_worker,
+            initargs=(graph_api.graph, graph_api.evaporation_rate, graph_api.default_pheromone,
+                      graph_api.get_edges(), graph_api.candidate_lists, solver_state,
+                      (alpha, beta, mode, ant_max_steps)))
+
+    def _write_snapshot(self) -> None:
+        """Copy the current per-edge arrays into the shared snapshot block."""
+        m = self.graph_api.num_edges
+        if self._snapshot is None or self._snapshot.shape[1] < m:
+            if self._snapshot_shm is not None:
+                self._snapshot = None
+                self._snapshot_shm.close()
+                self._snapshot_shm.unlink()
+            capacity = len(self.graph_api.costs)
+            self._snapshot_shm, self._snapshot = _create_shared_array(np.zeros((len(SNAPSHOT_ARRAYS), capacity)))
+        for row, name in enumerate(SNAPSHOT_ARRAYS):
+            self._snapshot[row, :m] = getattr(self.graph_api, name)[:m]
+
+    def run(self, spawn_points: List[str], destination: Union[str, List[str]],
+            seeds: List[int] = None, deadline: float = None) -> List[Tuple[Ant, float, List[str]]]:
+        """Run one ant per spawn point and return the results in spawn order.
+
+        Args:
+            spawn_points: Start node of every ant
+            destination: Destination node(s) shared by all ants
+            seeds: Seed of every ant's own random stream (default: one stream per batch)
+            deadline: time.perf_counter() value at which the ants stop walking (None: no limit)
+
+        Returns:
+            One (ant, path_cost, path) tuple per ant, as ACO.process_ant returns them:
+            (ant, inf, None) for an ant that did not reach its destination(s)
+        """
+        self._write_snapshot()
+        new_edges = self.graph_api.get_edges()[self._base_edges:]
+        default_pheromones = (self.graph_api.default_pheromone, self.graph_api.default_pheromone_weight)
+        wall_deadline = time.time() + (deadline - time.perf_counter()) if deadline is not None else None
+
+        batch_size = max(1, -(-len(spawn_points) // (self.num_workers * BATCHES_PER_WORKER)))
+        tasks = []
+        for start in range(0, len(spawn_points), batch_size):
+            ant_seeds = seeds[start:start + batch_size] if seeds is not None else None
+            batch_seed = random.getrandbits(64) if seeds is None else 0
+            tasks.append((batch_seed, ant_seeds, self._snapshot_shm.name, self._snapshot.shape[1],
+                          new_edges, default_pheromones, spawn_points[start:start + batch_size], destination,
+                          wall_deadline))
+
+        # Rebuild the ants in the parent, where their pheromones are deposited
+        results = []
+        for batch in self._executor.map(_run_ant_batch, tasks):
+            for path, path_cost, is_fit, reached in batch:
+                ant = Ant.from_path(self.graph_api, path, path_cost, is_fit, destination,
+                                    alpha=self.alpha, beta=self.beta, mode=self.mode)
+                if reached:
+                    results.append((ant, path_cost, path.copy()))
+                else:
+                    results.append((ant, float("inf"), None))
+        return results
+
+    def close(self) -> None:
+        """Stop the workers and free the shared memory."""
+        self._executor.shutdown()
+        if self._snapshot_shm is not None:
+            self._shms.append(self._snapshot_shm)
+            self._snapshot_shm = self._snapshot = None
+        for shm in self._shms:
+            shm.close()
+            shm.unlink()
+        self._shms = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,108 @@
+import hashlib
+import os
+import tempfile
+from typing import Optional, Tuple
+import numpy as np
+
+from aco_routing.network import Network
+from aco_routing.floyd_warshall import FloydWarshall
+
+# Default location of the on-disk all-pairs cache
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "cos30019", "all_pairs")
+
+
+def graph_fingerprint(graph: Network) -> str:
+    """Return a content hash of the nodes and edge costs of a graph.
+
+    The node order is part of the hash because it fixes the row/column order of the
+    cached matrices. Edges are hashed in sorted order, so the order they were added
+    in does not matter.
+
+    Args:
+        graph: Network object, before any virtual edges are added
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    for node in graph.nodes():
+        digest.update(repr(node).encode())
+        digest.update(b"\0")
+    digest.update(b"\1")
+    for (u, v), data in sorted(graph.edges.items()):
+        digest.update(repr((u, v, float(data.get("cost", float('inf'))))).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class AllPairsCache:
+    """
+    Persistent cache of all-pairs shortest path results, keyed by graph content.
+
+    The distance matrix and the int32 successor matrix are stored as .npy files and
+    mapped back in read-only with np.load(mmap_mode='r'), so a repeat run on the
+    same graph skips the computation and only pages in the rows it touches.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cached matrices (created on first store)
+        """
+        self.cache_dir = cache_dir
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        return (os.path.join(self.cache_dir, f"{key}_dist.npy"),
+                os.path.join(self.cache_dir, f"{key}_next.npy"))
+
+    def load(self, graph: Network) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Return memory-mapped (dist_matrix, next_matrix) for graph, or None on a miss."""
+        dist_path, next_path = self._paths(graph_fingerprint(graph))
+        if not (os.path.exists(dist_path) and os.path.exists(next_path)):
+            return None
+
+        try:
+            dist_matrix = np.load(dist_path, mmap_mode='r')
+            next_matrix = np.load(next_path, mmap_mode='r')
+        except (OSError, ValueError):
+            # Truncated or foreign file: treat as a miss, it is rewritten on store
+            return None
+
+        n = graph.number_of_nodes()
+        if dist_matrix.shape != (n, n) or next_matrix.shape != (n, n):
+            return None
+        return dist_matrix, next_matrix
+
+    def store(self, graph: Network, dist_matrix: np.ndarray, next_matrix: np.ndarray) -> None:
+        """Write the matrices for graph; each file is replaced atomically."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # The distance file is written last, so a reader that sees it also sees the successors
+        for path, matrix in zip(reversed(self._paths(graph_fingerprint(graph))), (next_matrix, dist_matrix)):
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".npy.tmp")
+            try:
+                with os.fdopen(fd, "wb") as tmp_file:
+                    np.save(tmp_file, matrix)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+    def run(self, solver: FloydWarshall) -> bool:
+        """Fill solver's matrices from the cache, or run it and store the result.
+
+        Args:
+            solver: All-pairs solver that has not been run yet
+
+        Returns:
+            True if the result came from the cache
+        """
+        cached = self.load(solver.graph)
+        if cached is not None:
+            solver.dist_matrix, solver.next_matrix = cached
+            return True
+
+        solver.run()
+        self.store(solver.graph, solver.dist_matrix, solver.next_matrix)
+        return False
@@ -0,0 +1,166 @@
+from typing import Dict, List, Mapping, Tuple
+import heapq
+import math
+
+
+class BidirectionalSearch:
+    """
+    Point-to-point shortest path queries that search from both ends at once.
+
+    The forward adjacency and the reverse adjacency (every edge turned around) are
+    built once from Network.edges, so each query only runs the two searches. A
+    forward search from the start and a backward search from the goal take turns
+    on the smaller queue key; every edge relaxation that reaches a node labeled by
+    the other side is a candidate s-t path, and the search stops once the two
+    smallest queue keys add up to the best candidate, at which point no
+    unexplored path can be shorter.
+
+    A* runs the same search on reduced edge costs with the average potential
+    p(v) = (h_forward(v) - h_backward(v)) / 2, where h_forward estimates the
+    distance from v to the goal and h_backward the distance from the start to v.
+    Both estimates must be consistent (the ALT landmark bounds are, the straight
+    line distance is only when no edge costs less than its length); the average
+    keeps the reduced costs of both directions non-negative, so the stopping
+    rule stays exact.
+    """
+
+    def __init__(self, network, weight_key: str = "weight", default_weight: float = 1):
+        """Build the forward and reverse adjacency.
+
+        Args:
+            network: Network object
+            weight_key: Edge attribute holding the weight ("weight" for the search
+                        networks, "cost" for the ACO graphs)
+            default_weight: Weight used when an edge has no such attribute
+        """
+        self.forward: Dict[str, List[Tuple[str, float]]] = {node: [] for node in network.nodes()}
+        self.backward: Dict[str, List[Tuple[str, float]]] = {node: [] for node in network.nodes()}
+        for (u, v), data in network.edges.items():
+            weight = float(data.get(weight_key, default_weight))
+            self.forward.setdefault(u, []).append((v, weight))
+            self.forward.setdefault(v, [])
+            self.backward.setdefault(v, []).append((u, weight))
+            self.backward.setdefault(u, [])
+
+        # Nodes settled by the last query, both directions together
+        self.num_settled = 0
+
+    def dijkstra(self, start: str, goal: str, bidirectional: bool = True) -> Tuple[List[str], float]:
+        """Shortest path by (bidirectional) Dijkstra.
+
+        Args:
+            start: Start node ID
+            goal: Goal node ID
+            bidirectional: Search from both ends; False runs plain Dijkstra from start
+
+        Returns:
+            tuple: (path, cost), or ([], inf) if the goal cannot be reached
+        """
+        return self._search(start, goal, None, None, bidirectional)
+
+    def a_star(
+        self,
+        start: str,
+        goal: str,
+        forward_heuristic: Mapping[str, float],
+        backward_heuristic: Mapping[str, float] = None,
+        bidirectional: bool = True,
+    ) -> Tuple[List[str], float]:
+        """Shortest path by (bidirectional) A*.
+
+        Args:
+            start: Start node ID
+            goal: Goal node ID
+            forward_heuristic: Consistent lower bound on the distance from each node to goal
+                (inf for nodes that cannot reach it)
+            backward_heuristic: Consistent lower bound on the distance from start to each
+                node (default: 0, which halves the guidance of forward_heuristic)
+            bidirectional: Search from both ends; False runs plain A* from start
+
+        Returns:
+            tuple: (path, cost), or ([], inf) if the goal cannot be reached
+        """
+        return self._search(start, goal, forward_heuristic, backward_heuristic, bidirectional)
+
+    def _search(self, start, goal, forward_heuristic, backward_heuristic, bidirectional):
+        self.num_settled = 0
+        if start not in self.forward or goal not in self.forward:
+            return [], float('inf')
+        if start == goal:
+            return [start], 0
+
+        forward_h = forward_heuristic.__getitem__ if forward_heuristic is not None else None
+        backward_h = backward_heuristic.__getitem__ if backward_heuristic is not None else None
+        if not bidirectional:
+            backward_h = None
+            # A unidirectional search uses the forward heuristic as is
+            potential = forward_h if forward_h is not None else (lambda node: 0.0)
+        elif forward_h is None and backward_h is None:
+            potential = lambda node: 0.0
+        else:
+            forward_h = forward_h or (lambda node: 0.0)
+            backward_h = backward_h or (lambda node: 0.0)
+            potential = lambda node: (forward_h(node) - backward_h(node)) / 2
+
+        # Per direction (0: forward from start, 1: backward from goal): the edges to follow,
+        # the distances, the predecessors, the settled nodes and the queue.
+        # Queue format: (distance +/- potential, counter, node); the counter keeps insertion order on ties
+        adjacency = (self.forward, self.backward)
+        # Nodes that a lower bound of inf proves to be off every start-goal path are not queued
+        prune = (forward_h, backward_h)
+        sign = (1, -1)
+        dist = ({start: 0.0}, {goal: 0.0})
+        parents = ({start: None}, {goal: None})
+        settled = (set(), set())
+        counter = 0
+        heaps = ([(potential(start), counter, start)], [(-potential(goal), counter, goal)])
+
+        best = math.inf
+        meeting = None
+        while heaps[0] and heaps[1]:
+            # Any path not found yet costs at least the two smallest keys together
+            if heaps[0][0][0] + heaps[1][0][0] >= best:
+                break
+
+            side = 0 if not bidirectional or heaps[0][0][0] <= heaps[1][0][0] else 1
+            _, _, u = heapq.heappop(heaps[side])
+            if u in settled[side]:
+                continue
+            settled[side].add(u)
+
+            side_dist, other_dist = dist[side], dist[1 - side]
+            base = side_dist[u]
+            for v, weight in adjacency[side][u]:
+                if v in settled[side] or (prune[side] is not None and prune[side](v) == math.inf):
+                    continue
+                new_dist = base + weight
+                if new_dist < side_dist.get(v, math.inf):
+                    side_dist[v] = new_dist
+                    parents[side][v] = u
+                    counter += 1
+                    heapq.heappush(heaps[side], (new_dist + sign[side] * potential(v), counter, v))
+
+                    if v in other_dist and new_dist + other_dist[v] < best:
+                        best = new_dist + other_dist[v]
+                        meeting = v
+
+        self.num_settled = len(settled[0]) + len(settled[1])
+        if meeting is None:
+            return [], float('inf')
+        return self._reconstruct_path(parents, meeting), best
+
+    @staticmethod
+    def _reconstruct_path(parents, meeting: str) -> List[str]:
+        """Join the forward path to the meeting node with the backward path from it."""
+        path = []
+        current = meeting
+        while current is not None:
+            path.append(current)
+            current = parents[0][current]
+        path.reverse()
+
+        current = parents[1][meeting]
+        while current is not None:
+            path.append(current)
+            current = parents[1][current]
+        return path
@@ -0,0 +1,273 @@
+from typing import List, Tuple, Union
+import random
+import time
+import numpy as np
+
+from aco_routing.ant import Ant
+from aco_routing.graph_api import GraphApi
+
+# Probability of taking the most desirable edge instead of a roulette draw
+# (the threshold of utils.pseudo_random_proportional_selection)
+EXPLOITATION_THRESHOLD = 0.5
+
+
+class VectorizedColony:
+    """
+    Advances all ants of an iteration together, one step at a time, with NumPy.
+
+    The neighbors of every node are laid out in a padded (n x max_degree) matrix,
+    in the order GraphApi.get_neighbors returns them, so that ties and roulette
+    draws resolve exactly as they do for a single Ant. Per step, the colony
+    gathers the rows of the current nodes, masks out visited neighbors with a
+    (num_ants x n) visited matrix and picks the next node of every ant with the
+    pseudo-random proportional rule:
+        - a single candidate is taken without a draw
+        - with probability 0.5 the most desirable candidate (first one on ties)
+        - otherwise a roulette draw over the cumulative normalized desirability
+    The desirability of every slot is the product of GraphApi's precomputed
+    pheromone^alpha and (1/cost)^beta arrays, formed once per iteration.
+    In TSP mode with GraphApi candidate lists, an ant chooses among the unvisited
+    candidates of its node and uses the full neighbor row only when there are none.
+    """
+
+    def __init__(self, graph_api: GraphApi, alpha: float, beta: float, mode: int, ant_max_steps: int):
+        """Lay out the neighbor matrix of the graph.
+
+        Args:
+            graph_api: GraphApi of the search, already initialised with pheromones
+            alpha: Pheromone bias
+            beta: Edge cost bias
+            mode: Search mode (0: any destination, 1: all destinations, 2: TSP mode)
+            ant_max_steps: Maximum number of steps an ant is allowed to take
+        """
+        self.graph_api = graph_api
+        self.alpha = alpha
+        self.beta = beta
+        self.mode = mode
+        self.ant_max_steps = ant_max_steps
+        self.nodes = graph_api.get_all_nodes()
+        self.node_index = {node: i for i, node in enumerate(self.nodes)}
+
+        neighbor_lists = [[self.node_index[v] for v in graph_api.get_neighbors(u)] for u in self.nodes]
+        width = max([len(row) for row in neighbor_lists] + [1])
+        n = len(self.nodes)
+
+        # Padded neighbor matrix (-1 marks an empty slot) and the cost of every slot
+        self.neighbors = np.full((n, width), -1, dtype=np.int64)
+        self.base_costs = np.full((n, width), float('inf'))
+        self._slots = {}
+        for i, row in enumerate(neighbor_lists):
+            self.neighbors[i, :len(row)] = row
+            for slot, j in enumerate(row):
+                u, v = self.nodes[i], self.nodes[j]
+                self.base_costs[i, slot] = graph_api.get_edge_cost(u, v)
+                self._slots[(u, v)] = (i, slot)
+
+        # (1/cost)^beta of every slot, for virtual edges that have no id yet
+        self.base_heuristic = (1 / np.where(self.base_costs == 0, 0.001, self.base_costs)) ** beta
+
+        # Edge id behind every slot, -1 for virtual edges that have no id yet
+        self.slot_edge_ids = np.full((n, width), -1, dtype=np.int64)
+        self._known_edges = 0
+        self._sync_edge_ids()
+
+        # TSP candidate lists as slot indices, in candidate order (-1 pads short lists)
+        self.candidate_slots = None
+        if mode == 2 and graph_api.candidate_lists is not None:
+            k = max([len(candidates) for candidates in graph_api.candidate_lists.values()] + [1])
+            self.candidate_slots = np.full((n, k), -1, dtype=np.int64)
+            for node, candidates in graph_api.candidate_lists.items():
+                self.candidate_slots[self.node_index[node], :len(candidates)] = [
+                    self._slots[(node, candidate)][1] for candidate in candidates]
+
+    def _sync_edge_ids(self) -> None:
+        """Pick up the ids GraphApi gave to virtual edges since the last iteration."""
+        edges = self.graph_api.get_edges()
+        for edge_id in range(self._known_edges, len(edges)):
+            slot = self._slots.get(edges[edge_id])
+            if slot is not None:
+                self.slot_edge_ids[slot] = edge_id
+        self._known_edges = len(edges)
+
+    def _edge_desirability(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the desirability and the cost of every slot for the current pheromones."""
+        self._sync_edge_ids()
+        has_id = self.slot_edge_ids >= 0
+        edge_ids = np.where(has_id, self.slot_edge_ids, 0)
+        api = self.graph_api
+        desirability = np.where(has_id, api.pheromone_weights[edge_ids] * api.heuristic[edge_ids],
+                                api.default_pheromone_weight * self.base_heuristic)
+        costs = np.where(has_id, api.costs[edge_ids], self.base_costs)
+        return desirability, costs
+
+    def _reached(self, ants: np.ndarray, current: np.ndarray, visited: np.ndarray,
+                 visited_count: np.ndarray, sources: np.ndarray, destinations: np.ndarray) -> np.ndarray:
+        """Vectorized Ant.reached_destination for the given ants."""
+        if self.mode == 2:
+            return (visited_count[ants] >= len(self.nodes)) & (current[ants] == sources[ants])
+
+        # Every node an ant has stood on is either visited or the current node
+        seen = visited[np.ix_(ants, destinations)] | (current[ants, None] == destinations[None, :])
+        if self.mode == 0:
+            return seen.any(axis=1)
+        return seen.all(axis=1)
+
+    def _select(self, desirability: np.ndarray, candidates: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """Pick one candidate slot per row with the pseudo-random proportional rule."""
+        counts = candidates.sum(axis=1)
+        slots = np.argmax(candidates, axis=1)  # the only candidate of single-option rows
+        multi = np.flatnonzero(counts > 1)
+        if multi.size == 0:
+            return slots
+
+        candidates = candidates[multi]
+        values = np.where(candidates, desirability[multi], 0.0)
+        totals = np.cumsum(values, axis=1)[:, -1]
+
+        # All desirabilities zero: every candidate is equally likely
+        zero = totals == 0
+        if zero.any():
+            values[zero] = candidates[zero]
+            totals[zero] = counts[multi][zero]
+
+        # Exploitation: the most desirable candidate, the first one on ties
+        exploit = rng.random(multi.size) < EXPLOITATION_THRESHOLD
+        best = np.argmax(np.where(candidates, values, -np.inf), axis=1)
+
+        # Exploration: roulette wheel over the normalized probabilities
+        probabilities = values / totals[:, None]
+        probabilities /= np.cumsum(probabilities, axis=1)[:, -1:]
+        cumulative = np.cumsum(probabilities, axis=1)
+        hits = (cumulative >= rng.random(multi.size)[:, None]) & candidates
+        roulette = np.argmax(hits, axis=1)
+
+        # Rounding left the draw past the last candidate: fall back to a random one
+        for row in np.flatnonzero(~hits.any(axis=1)):
+            roulette[row] = rng.choice(np.flatnonzero(candidates[row]))
+
+        slots[multi] = np.where(exploit, best, roulette)
+        return slots
+
+    def run(self, spawn_points: List[str], destination: Union[str, List[str]],
+            seeds: List[int] = None, deadline: float = None) -> List[Tuple[Ant, float, List[str]]]:
+        """Walk one ant per spawn point and return the results in spawn order.
+
+        Args:
+            spawn_points: Start node of every ant
+            destination: Destination node(s) shared by all ants (ignored in TSP mode)
+            seeds: Per-ant seeds of a reproducible run; the colony draws for all ants at
+                once, so they seed one shared generator (default: seeded from random)
+            deadline: time.perf_counter() value at which all ants stop walking; the ants
+                that have not reached their destination(s) by then do not count (None: no limit)
+
+        Returns:
+            One (ant, path_cost, path) tuple per ant, as ACO.process_ant returns them:
+            (ant, inf, None) for an ant that did not reach its destination(s)
+        """
+        desirability, costs = self._edge_desirability()
+        rng = np.random.default_rng(seeds if seeds is not None else random.getrandbits(64))
+
+        n = len(self.nodes)
+        num_ants = len(spawn_points)
+        if isinstance(destination, str):
+            destination = [destination]
+        destinations = np.array([self.node_index[node] for node in destination if node in self.node_index],
+                                dtype=np.int64)
+        # A destination outside the graph can never be visited
+        all_destinations_known = all(node in self.node_index for node in destination)
+
+        sources = np.array([self.node_index[node] for node in spawn_points], dtype=np.int64)
+        current = sources.copy()
+        visited = np.zeros((num_ants, n), dtype=bool)
+        visited_count = np.zeros(num_ants, dtype=np.int64)
+        paths = np.empty((num_ants, self.ant_max_steps + 1), dtype=np.int64)
+        paths[:, 0] = sources
+        path_lengths = np.ones(num_ants, dtype=np.int64)
+        path_costs = np.zeros(num_ants)
+        reached = np.zeros(num_ants, dtype=bool)
+        active = np.ones(num_ants, dtype=bool)
+
+        for _ in range(self.ant_max_steps):
+            ants = np.flatnonzero(active)
+            if ants.size == 0:
+                break
+
+            # Ants that reached their destination(s) stop walking
+            done = self._reached(ants, current, visited, visited_count, sources, destinations)
+            if self.mode == 1 and not all_destinations_known:
+                done[:] = False
+            reached[ants[done]] = True
+            active[ants[done]] = False
+            ants = ants[~done]
+            if ants.size == 0:
+                break
+
+            # Out of time: the ants still walking do not count
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+            # Mark the current nodes as visited
+            nodes = current[ants]
+            visited_count[ants] += ~visited[ants, nodes]
+            visited[ants, nodes] = True
+
+            # Candidate slots: the unvisited neighbors of every current node
+            neighbors = self.neighbors[nodes]
+            candidates = neighbors >= 0
+            candidates &= ~visited[ants[:, None], np.where(candidates, neighbors, 0)]
+            slots = np.full(ants.size, -1, dtype=np.int64)
+            choosing = candidates.any(axis=1)
+
+            if self.candidate_slots is not None:
+                # Nearest neighbors first, the full neighborhood only once they are all visited
+                near_slots = self.candidate_slots[nodes]
+                near_candidates = near_slots >= 0
+                near_slots = np.where(near_candidates, near_slots, 0)
+                near_candidates &= candidates[np.arange(ants.size)[:, None], near_slots]
+                near = near_candidates.any(axis=1)
+                if near.any():
+                    chosen = self._select(desirability[nodes[near, None], near_slots[near]],
+                                          near_candidates[near], rng)
+                    slots[near] = near_slots[near, chosen]
+                choosing &= ~near
+
+            if choosing.any():
+                slots[choosing] = self._select(desirability[nodes[choosing]], candidates[choosing], rng)
+
+            if self.mode == 2:
+                # Tour complete: return to the source if it is a neighbor
+                returning = visited_count[ants] >= n
+                at_source = neighbors == sources[ants, None]
+                returning &= at_source.any(axis=1)
+                slots[returning] = np.argmax(at_source[returning], axis=1)
+
+            # Ants without a move are stuck for good
+            stuck = slots < 0
+            active[ants[stuck]] = False
+            ants, nodes, slots = ants[~stuck], nodes[~stuck], slots[~stuck]
+
+            next_nodes = self.neighbors[nodes, slots]
+            paths[ants, path_lengths[ants]] = next_nodes
+            path_lengths[ants] += 1
+            path_costs[ants] += costs[nodes, slots]
+            current[ants] = next_nodes
+
+        # In TSP mode an ant is fit as soon as its tour closes, even on its last step
+        fit = reached.copy()
+        if self.mode == 2:
+            fit |= (visited_count >= n) & (current == sources)
+
+        results = []
+        for a in range(num_ants):
+            path = [self.nodes[i] for i in paths[a, :path_lengths[a]]]
+            path_cost = path_costs[a].item()
+            ant = Ant.from_path(self.graph_api, path, path_cost, bool(fit[a]), destination,
+                                alpha=self.alpha, beta=self.beta, mode=self.mode)
+            if reached[a]:
+                results.append((ant, path_cost, path.copy()))
+            else:
+                results.append((ant, float("inf"), None))
+        return results
+
+    def close(self) -> None:
+        """Nothing to release; kept so the colony can stand in for AntProcessPool."""
@@ -0,0 +1,274 @@
+from typing import Callable, Dict, Iterable, List, Tuple
+from collections import deque
+import heapq
+import math
+import numpy as np
+
+
+class CSRGraph:
+    """
+    Frozen, array-backed compressed sparse row (CSR) representation of a directed graph.
+
+    Nodes are mapped to int indices 0..n-1. The outgoing edges of node i are
+    indices[indptr[i]:indptr[i + 1]] with matching weights, and they are pre-sorted
+    by the string form of the neighbor ID so that BFS/DFS expand neighbors in the
+    same ascending order as the Network based searches.
+
+    The arrays are read-only once the graph is built.
+    """
+
+    def __init__(self, node_ids: Iterable[str], edges: Iterable[Tuple[str, str, float]], pos: Dict = None):
+        """Build the CSR arrays.
+
+        Args:
+            node_ids: Node identifiers, in the order that defines their int index
+            edges: Iterable of (source, target, weight) triples
+            pos: Optional mapping of node ID to (x, y) coordinates
+        """
+        self.node_ids = list(node_ids)
+        self.node_index = {node: i for i, node in enumerate(self.node_ids)}
+
+        # Edges may mention nodes that were not listed explicitly
+        edge_list = []
+        for u, v, weight in edges:
+            for node in (u, v):
+                if node not in self.node_index:
+                    self.node_index[node] = len(self.node_ids)
+                    self.node_ids.append(node)
+            edge_list.append((self.node_index[u], self.node_index[v], float(weight)))
+
+        n = len(self.node_ids)
+
+        # Group edges by source, then order each row by neighbor ID (the BFS/DFS tie-break)
+        edge_list.sort(key=lambda e: (e[0], str(self.node_ids[e[1]])))
+
+        counts = np.zeros(n + 1, dtype=np.int64)
+        for u, _, _ in edge_list:
+            counts[u + 1] += 1
+
+        self.indptr = np.cumsum(counts)
+        self.indices = np.array([v for _, v, _ in edge_list], dtype=np.int32)
+        self.weights = np.array([w for _, _, w in edge_list], dtype=np.float64)
+
+        # Coordinates, NaN where unknown
+        self.coords = np.full((n, 2), np.nan)
+        if pos:
+            for node, (x, y) in pos.items():
+                if node in self.node_index:
+                    self.coords[self.node_index[node]] = (x, y)
+
+        for array in (self.indptr, self.indices, self.weights, self.coords):
+            array.flags.writeable = False
+
+        # Plain list mirrors for the Python search loops (indexing a list is much
+        # cheaper than indexing a NumPy array one scalar at a time)
+        self._indptr = self.indptr.tolist()
+        self._indices = self.indices.tolist()
+        self._weights = self.weights.tolist()
+
+    @classmethod
+    def from_network(cls, network, weight_key: str = "weight", default_weight: float = 1) -> "CSRGraph":
+        """Build a CSR graph from a Network.
+
+        Args:
+            network: Network object
+            weight_key: Edge attribute holding the weight ("weight" for the search
+                        networks, "cost" for the ACO graphs)
+            default_weight: Weight used when an edge has no such attribute
+        """
+        edges = ((u, v, data.get(weight_key, default_weight)) for (u, v), data in network.edges.items())
+        return cls(network.nodes(), edges, pos=network.pos)
+
+    @classmethod
+    def from_data(cls, nodes, edges: Dict[Tuple[str, str], float]) -> "CSRGraph":
+        """Build a CSR graph straight from the output of parse_graph_file.
+
+        Args:
+            nodes: Mapping of node IDs to coordinates {node_id: (x, y)}, or a list of node IDs
+            edges: Mapping of edge pairs to weights {(node1, node2): weight}
+        """
+        pos = nodes if isinstance(nodes, dict) else None
+        return cls(nodes, ((u, v, w) for (u, v), w in edges.items()), pos=pos)
+
+    def number_of_nodes(self) -> int:
+        """Return the number of nodes in the graph."""
+        return len(self.node_ids)
+
+    def number_of_edges(self) -> int:
+        """Return the number of edges in the graph."""
+        return len(self._indices)
+
+    def neighbors(self, i: int) -> np.ndarray:
+        """Return the (sorted) neighbor indices of node index i."""
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def edge_weights(self, i: int) -> np.ndarray:
+        """Return the weights of the outgoing edges of node index i."""
+        return self.weights[self.indptr[i]:self.indptr[i + 1]]
+
+    def adjacency_lists(self) -> Tuple[List[int], List[int], List[float]]:
+        """Return indptr, indices and weights as plain Python lists (for pure-Python loops)."""
+        return self._indptr, self._indices, self._weights
+
+    def reverse(self) -> "CSRGraph":
+        """Return the CSR graph with every edge reversed, keeping the same node indices."""
+        edges = []
+        for u in range(self.number_of_nodes()):
+            for k in range(self._indptr[u], self._indptr[u + 1]):
+                edges.append((self.node_ids[self._indices[k]], self.node_ids[u], self._weights[k]))
+        pos = {node: tuple(self.coords[i]) for i, node in enumerate(self.node_ids)
+               if not np.isnan(self.coords[i, 0])}
+        return CSRGraph(self.node_ids, edges, pos=pos)
+
+    def _reconstruct_path(self, parents: List[int], goal: int) -> List[str]:
+        """Rebuild the node ID path to goal from an int predecessor array (-1 for the start)."""
+        path = []
+        current = goal
+        while current != -1:
+            path.append(self.node_ids[current])
+            current = parents[current]
+        path.reverse()
+        return path
+
+    def bfs_path(self, start: str, goal: str) -> Tuple[List[str], float]:
+        """Breadth-first search, expanding neighbors in ascending order.
+
+        Returns:
+            tuple: (path, weight), or ([], inf) if the goal cannot be reached
+        """
+        if start == goal:
+            return [start], 0
+        if start not in self.node_index or goal not in self.node_index:
+            return [], float('inf')
+
+        indptr, indices, weights = self._indptr, self._indices, self._weights
+        s, g = self.node_index[start], self.node_index[goal]
+        visited = bytearray(len(self.node_ids))
+        parents = [-1] * len(self.node_ids)
+        # Format: (node, parent, cost)
+        queue = deque([(s, -1, 0)])
+
+        while queue:
+            current, parent, cost = queue.popleft()
+            if visited[current]:
+                continue
+            visited[current] = 1
+            parents[current] = parent
+
+            if current == g:
+                return self._reconstruct_path(parents, g), cost
+
+            for k in range(indptr[current], indptr[current + 1]):
+                neighbor = indices[k]
+                if not visited[neighbor]:
+                    queue.append((neighbor, current, cost + weights[k]))
+
+        return [], float('inf')
+
+    def dfs_path(self, start: str, goal: str) -> Tuple[List[str], float]:
+        """Depth-first search, popping neighbors in ascending order.
+
+        Returns:
+            tuple: (path, weight), or ([], inf) if the goal cannot be reached
+        """
+        if start == goal:
+            return [start], 0
+        if start not in self.node_index or goal not in self.node_index:
+            return [], float('inf')
+
+        indptr, indices, weights = self._indptr, self._indices, self._weights
+        s, g = self.node_index[start], self.node_index[goal]
+        visited = bytearray(len(self.node_ids))
+        parents = [-1] * len(self.node_ids)
+        # Format: (node, parent, cost)
+        stack = [(s, -1, 0)]
+
+        while stack:
+            current, parent, cost = stack.pop()
+            if visited[current]:
+                continue
+            visited[current] = 1
+            parents[current] = parent
+
+            if current == g:
+                return self._reconstruct_path(parents, g), cost
+
+            # Push in reverse so the smallest neighbor is popped first
+            for k in range(indptr[current + 1] - 1, indptr[current] - 1, -1):
+                neighbor = indices[k]
+                if not visited[neighbor]:
+                    stack.append((neighbor, current, cost + weights[k]))
+
+        return [], float('inf')
+
+    def dijkstra(self, start: str, goal: str) -> Tuple[List[str], float]:
+        """Dijkstra's algorithm with lazy deletion.
+
+        Returns:
+            tuple: (path, cost), or ([], inf) if the goal cannot be reached
+        """
+        return self.a_star(start, goal, heuristic=lambda i: 0.0)
+
+    def euclidean_heuristic(self, goal: str) -> Callable[[int], float]:
+        """Return h(i), the straight-line distance from node index i to goal.
+
+        Coordinates are truncated to int, as in the A* search.
+        """
+        coords = np.trunc(self.coords)
+        gx, gy = coords[self.node_index[goal]]
+        distances = np.sqrt((coords[:, 0] - gx) ** 2 + (coords[:, 1] - gy) ** 2)
+        # Unknown coordinates give no guidance
+        distances = np.nan_to_num(distances, nan=0.0).tolist()
+        return distances.__getitem__
+
+    def a_star(self, start: str, goal: str, heuristic: Callable[[int], float] = None) -> Tuple[List[str], float]:
+        """A* search.
+
+        Args:
+            start: Start node ID
+            goal: Goal node ID
+            heuristic: h(i) for node index i; defaults to the Euclidean distance to goal
+
+        Returns:
+            tuple: (path, cost), or ([], inf) if the goal cannot be reached
+        """
+        if start == goal:
+            return [start], 0
+        if start not in self.node_index or goal not in self.node_index:
+            return [], float('inf')
+        if heuristic is None:
+            heuristic = self.euclidean_heuristic(goal)
+
+        indptr, indices, weights = self._indptr, self._indices, self._weights
+        s, g = self.node_index[start], self.node_index[goal]
+        n = len(self.node_ids)
+        g_scores = [math.inf] * n
+        parents = [-1] * n
+        closed = bytearray(n)
+        g_scores[s] = 0
+        # Format: (f, counter, node); the counter keeps insertion order on ties
+        counter = 0
+        heap = [(heuristic(s), counter, s)]
+
+        while heap:
+            _, _, current = heapq.heappop(heap)
+            if closed[current]:
+                continue
+            closed[current] = 1
+
+            if current == g:
+                return self._reconstruct_path(parents, g), g_scores[g]
+
+            base = g_scores[current]
+            for k in range(indptr[current], indptr[current + 1]):
+                neighbor = indices[k]
+                if closed[neighbor]:
+                    continue
+                tentative = base + weights[k]
+                if tentative < g_scores[neighbor]:
+                    g_scores[neighbor] = tentative
+                    parents[neighbor] = current
+                    counter += 1
+                    heapq.heappush(heap, (tentative + heuristic(neighbor), counter, neighbor))
+
+        return [], float('inf')
@@ -1,4 +1,6 @@
 from typing import Dict, List, Tuple
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from aco_routing.network import Network
 
@@ -20,30 +22,41 @@ class FloydWarshall:
         self.node_to_idx = {node: i for i, node in enumerate(self.nodes)}
         self.idx_to_node = {i: node for i, node in enumerate(self.nodes)}
         
-        # Initialize distance and next matrices
+        # Initialize distance and successor matrices. next_matrix[i, j] holds the
+        # index of the node after i on the shortest i -> j path, or -1 if there is none.
         self.dist_matrix = np.full((self.n, self.n), float('inf'))
-        self.next_matrix = np.full((self.n, self.n), None, dtype=object)
+        self.next_matrix = np.full((self.n, self.n), -1, dtype=np.int32)
         
         # Fill diagonal with zeros
-        for i in range(self.n):
-            self.dist_matrix[i, i] = 0
+        np.fill_diagonal(self.dist_matrix, 0)
         
         # Initialize with direct edges
-        for u, v in self.graph.get_edges():
-            i, j = self.node_to_idx[u], self.node_to_idx[v]
-            cost = self.graph.edges[(u, v)].get("cost", float('inf'))
-            self.dist_matrix[i, j] = cost
-            self.next_matrix[i, j] = v
+        edges = self.graph.get_edges()
+        if edges:
+            rows = np.array([self.node_to_idx[u] for u, _ in edges], dtype=np.intp)
+            cols = np.array([self.node_to_idx[v] for _, v in edges], dtype=np.intp)
+            costs = np.array([self.graph.edges[edge].get("cost", float('inf')) for edge in edges], dtype=np.float64)
+            self.dist_matrix[rows, cols] = costs
+            self.next_matrix[rows, cols] = cols
     
     def run(self):
-        """Run the Floyd-Warshall algorithm."""
-        # Main Floyd-Warshall algorithm
+        """Run the Floyd-Warshall algorithm.
+        
+        Each pivot k relaxes the whole matrix at once: dist[i, j] is compared against
+        the broadcast sum of column k and row k.
+        """
+        dist = self.dist_matrix
+        nxt = self.next_matrix
+        candidate = np.empty_like(dist)
+        improved = np.empty(dist.shape, dtype=bool)
+        
         for k in range(self.n):
-            for i in range(self.n):
-                for j in range(self.n):
-                    if self.dist_matrix[i, j] > self.dist_matrix[i, k] + self.dist_matrix[k, j]:
-                        self.dist_matrix[i, j] = self.dist_matrix[i, k] + self.dist_matrix[k, j]
-                        self.next_matrix[i, j] = self.next_matrix[i, k]
+            # Row k and column k cannot improve while pivoting on k, so reading them
+            # while the rest of the matrix is updated is safe
+            np.add(dist[:, k, None], dist[None, k, :], out=candidate)
+            np.less(candidate, dist, out=improved)
+            np.copyto(dist, candidate, where=improved)
+            np.copyto(nxt, nxt[:, k, None], where=improved)
     
     def get_shortest_path(self, source: str, target: str) -> Tuple[List[str], float]:
         """Get the shortest path between source and target.
@@ -63,17 +76,20 @@ class FloydWarshall:
         if self.dist_matrix[i, j] == float('inf'):
             return [], float('inf')
         
-        path = [source]
+        return [self.nodes[idx] for idx in self._path_indices(i, j)], self.dist_matrix[i, j]
+    
+    def _path_indices(self, i: int, j: int) -> List[int]:
+        """Follow the successor matrix from node index i to node index j."""
+        path = [i]
         current = i
         
         while current != j:
-            next_node = self.next_matrix[current, j]
-            if next_node is None:
+            current = int(self.next_matrix[current, j])
+            if current == -1:
                 break
-            path.append(next_node)
-            current = self.node_to_idx[next_node]
+            path.append(current)
         
-        return path, self.dist_matrix[i, j]
+        return path
     
     def get_all_pairs_shortest_paths(self) -> Dict[Tuple[str, str], Tuple[List[str], float]]:
         """Get all pairs shortest paths.
@@ -98,17 +114,94 @@ class FloydWarshall:
         Update the original graph with the shortest path information.
         This modifies edge costs in the original network graph.
         """
-        all_paths = self.get_all_pairs_shortest_paths()
+        # Current direct edge costs, to find the pairs whose shortest path beats them
+        direct = np.full((self.n, self.n), float('inf'))
+        has_edge = np.zeros((self.n, self.n), dtype=bool)
+        for (u, v), data in self.graph.edges.items():
+            i, j = self.node_to_idx[u], self.node_to_idx[v]
+            direct[i, j] = data.get("cost", float('inf'))
+            has_edge[i, j] = True
         
-        for (source, target), (path, cost) in all_paths.items():
+        # Pairs that need a virtual edge: reachable, not on the diagonal, and either
+        # without a direct edge or shorter than it
+        reachable = np.isfinite(self.dist_matrix)
+        np.fill_diagonal(reachable, False)
+        targets = reachable & (~has_edge | (self.dist_matrix < direct))
+        
+        for i, j in zip(*np.nonzero(targets)):
+            source, target = self.nodes[i], self.nodes[j]
+            path = [self.nodes[idx] for idx in self._path_indices(i, j)]
+            cost = self.dist_matrix[i, j]
+            
             # For each shortest path, if there isn't a direct edge between source and target,
             # add a "virtual edge" with the calculated shortest path cost
-            if not self.graph.has_edge(source, target):
+            if not has_edge[i, j]:
                 self.graph.add_edge(source, target, cost=cost, is_virtual=True, path=path)
             else:
-                # If there is an existing edge, update its cost if the calculated path is shorter
-                current_cost = self.graph.edges[(source, target)].get("cost", float('inf'))
-                if cost < current_cost:
-                    self.graph.edges[(source, target)]["cost"] = cost
-                    self.graph.edges[(source, target)]["is_virtual"] = True
-                    self.graph.edges[(source, target)]["path"] = path
\ No newline at end of file
+                # If there is an existing edge, update its cost since the calculated path is shorter
+                self.graph.edges[(source, target)]["cost"] = cost
+                self.graph.edges[(source, target)]["is_virtual"] = True
+                self.graph.edges[(source, target)]["path"] = path
+
+
+class BlockedFloydWarshall(FloydWarshall):
+    """
+    Tiled (blocked) Floyd-Warshall for graphs whose distance matrix does not fit in cache.
+    
+    The matrix is split into block_size x block_size tiles. For each diagonal block K:
+        1. the diagonal tile (K, K) is relaxed on its own pivots,
+        2. the row tiles (K, J) and column tiles (I, K) are relaxed against it,
+        3. every remaining tile (I, J) is relaxed against (I, K) and (K, J).
+    Tiles within phases 2 and 3 are independent, so they are spread over a thread
+    pool (NumPy releases the GIL inside the tile updates). The results are the same
+    as FloydWarshall.run().
+    """
+    
+    def __init__(self, graph: Network, block_size: int = 128, num_threads: int = None):
+        """Initialize with a Network graph.
+        
+        Args:
+            graph: Network graph object
+            block_size: Side length of a tile; 128 x 128 float64 tiles are 128 KB
+            num_threads: Number of threads used for the independent tiles of each phase
+        """
+        super().__init__(graph)
+        self.block_size = max(1, block_size)
+        self.num_threads = num_threads if num_threads else min(multiprocessing.cpu_count(), 32)
+    
+    def _relax_tile(self, rows: slice, cols: slice, pivots: slice):
+        """Relax tile (rows, cols) through every pivot in pivots, in order."""
+        dist = self.dist_matrix
+        nxt = self.next_matrix
+        tile = dist[rows, cols]
+        tile_next = nxt[rows, cols]
+        candidate = np.empty_like(tile)
+        improved = np.empty(tile.shape, dtype=bool)
+        
+        for k in range(pivots.start, pivots.stop):
+            # Views are re-read on every pivot so that updates made earlier in this
+            # tile (diagonal and panel phases) are seen by the later pivots
+            np.add(dist[rows, k][:, None], dist[k, cols][None, :], out=candidate)
+            np.less(candidate, tile, out=improved)
+            np.copyto(tile, candidate, where=improved)
+            np.copyto(tile_next, nxt[rows, k][:, None], where=improved)
+    
+    def run(self):
+        """Run the blocked Floyd-Warshall algorithm."""
+        blocks = [slice(start, min(start + self.block_size, self.n))
+                  for start in range(0, self.n, self.block_size)]
+        
+        with ThreadPoolExecutor(max_workers=self.num_threads) as executor:
+            for pivot in blocks:
+                # Phase 1: the diagonal tile depends only on itself
+                self._relax_tile(pivot, pivot, pivot)
+                
+                # Phase 2: row and column panels of the pivot block
+                panels = [(pivot, block) for block in blocks if block != pivot]
+                panels += [(block, pivot) for block in blocks if block != pivot]
+                list(executor.map(lambda tile: self._relax_tile(tile[0], tile[1], pivot), panels))
+                
+                # Phase 3: every other tile, using the finished panels
+                others = [(rows, cols) for rows in blocks if rows != pivot
+                          for cols in blocks if cols != pivot]
+                list(executor.map(lambda tile: self._relax_tile(tile[0], tile[1], pivot), others))
@@ -1,4 +1,4 @@
-from typing import List, Dict
+from typing import List, Dict, Tuple
 import matplotlib.pyplot as plt
 import os
 import sys
@@ -14,15 +14,25 @@ parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(parent_dir)
 
 from aco_routing.network import Network
+from aco_routing.virtual_edges import LazyVirtualEdges
 
 
 class GraphApi:
-    def __init__(self, graph: Network, evaporation_rate: float):
+    def __init__(self, graph: Network, evaporation_rate: float, virtual_edges: LazyVirtualEdges = None):
         """Initialize the GraphApi with a network and evaporation rate.
         
+        Pheromone, delta pheromone and cost live in contiguous NumPy arrays indexed by
+        edge id. Real edges get ids 0..m-1 in graph.edges order; virtual edges get the
+        next free id the first time an ant writes to them. The two factors of the edge
+        desirability are kept next to them: heuristic = (1/cost)^beta, computed once by
+        precompute_heuristic, and pheromone_weights = pheromone^alpha, refreshed once
+        per iteration by update_pheromone_weights.
+        
         Args:
             graph: Network object containing the graph structure
             evaporation_rate: Rate at which pheromones evaporate (0-1)
+            virtual_edges: Optional lazy virtual edge provider; when given, every pair it
+                can reach is treated as an edge without being stored in graph.edges
         """
         self.graph = graph
         self.evaporation_rate = evaporation_rate
@@ -30,77 +40,278 @@ class GraphApi:
         self.epsilon = 1e-7
         self.pheromone_deposit_weight = 1 # Weight for pheromone deposit
         
-        # Precompute and cache edge costs
-        self._edge_cost_cache = {}
+        # Virtual edges read as default_pheromone until they are given an id
+        self.virtual_edges = virtual_edges
+        self.default_pheromone = 0.0
+        self.default_pheromone_weight = 0.0
+        self.heuristic_exponent = None
+        
+        # Optional per-node lists of the k cheapest outgoing edges (see build_candidate_lists)
+        self.candidate_lists = None
+        
+        # Edge store: (u, v) -> edge id, and the per-edge arrays
+        self._edge_ids = {}
+        self._edge_list = []
+        self._edge_sources = None
+        self._lazy_degrees = None
         self._neighbor_cache = {}
+        self._init_edge_arrays()
+        
+        # Precompute neighbors for each node (the lazy provider keeps its own cache)
+        if self.virtual_edges is None:
+            for node in self.graph.nodes():
+                self._neighbor_cache[node] = list(self.graph.neighbors(node))
+
+    def _init_edge_arrays(self) -> None:
+        """Allocate the per-edge arrays and give the real edges their ids."""
+        capacity = max(16, self.graph.number_of_edges())
+        self.pheromones = np.zeros(capacity)
+        self.delta_pheromones = np.zeros(capacity)
+        self.costs = np.full(capacity, float('inf'))
+        self.pheromone_weights = np.zeros(capacity)
+        self.heuristic = np.zeros(capacity)
         
-        # Precompute edge costs
+        # Register the real edges (a real edge may be beaten by its shortest path)
         for u, v in self.graph.get_edges():
-            self._edge_cost_cache[(u, v)] = self.graph.edges.get((u, v), {}).get("cost", float('inf'))
+            if self.virtual_edges is not None:
+                self._add_edge(u, v, self.virtual_edges.cost(u, v))
+            else:
+                self._add_edge(u, v, self.graph.edges.get((u, v), {}).get("cost", float('inf')))
+
+    @property
+    def num_edges(self) -> int:
+        """Number of edges that currently have an id."""
+        return len(self._edge_list)
+
+    def _add_edge(self, u: str, v: str, cost: float) -> int:
+        """Give edge (u, v) the next id, growing the arrays when they are full."""
+        edge_id = len(self._edge_list)
+        if edge_id == len(self.costs):
+            grow = len(self.costs)
+            self.pheromones = np.concatenate([self.pheromones, np.zeros(grow)])
+            self.delta_pheromones = np.concatenate([self.delta_pheromones, np.zeros(grow)])
+            self.costs = np.concatenate([self.costs, np.full(grow, float('inf'))])
+            self.pheromone_weights = np.concatenate([self.pheromone_weights, np.zeros(grow)])
+            self.heuristic = np.concatenate([self.heuristic, np.zeros(grow)])
         
-        # Precompute neighbors for each node
-        for node in self.graph.nodes():
-            self._neighbor_cache[node] = list(self.graph.neighbors(node))
+        self._edge_ids[(u, v)] = edge_id
+        self._edge_list.append((u, v))
+        self.costs[edge_id] = cost
+        self.pheromones[edge_id] = self.default_pheromone
+        self.pheromone_weights[edge_id] = self.default_pheromone_weight
+        if self.heuristic_exponent is not None:
+            self.heuristic[edge_id] = self._heuristic(cost)
+        return edge_id
+
+    def _heuristic(self, cost: float) -> float:
+        """(1/cost)^beta of a single edge; a zero cost counts as 0.001, as in Ant."""
+        if cost == 0:
+            cost = 0.001
+        return (1 / cost) ** self.heuristic_exponent
+
+    def precompute_heuristic(self, beta: float) -> None:
+        """Compute (1/cost)^beta for every edge, once per run.
+        
+        Args:
+            beta: Edge cost bias
+        """
+        self.heuristic_exponent = beta
+        m = self.num_edges
+        costs = np.where(self.costs[:m] == 0, 0.001, self.costs[:m])
+        self.heuristic[:m] = (1 / costs) ** beta
+
+    def update_pheromone_weights(self, alpha: float) -> None:
+        """Compute pheromone^alpha for every edge, once per iteration.
+        
+        Args:
+            alpha: Pheromone bias
+        """
+        m = self.num_edges
+        np.power(self.pheromones[:m], alpha, out=self.pheromone_weights[:m])
+        self.default_pheromone_weight = self.default_pheromone ** alpha
+
+    def get_edge_desirability(self, u: str, v: str) -> float:
+        """Return pheromone^alpha * (1/cost)^beta of edge (u, v), from the precomputed factors."""
+        edge_id = self._edge_ids.get((u, v))
+        if edge_id is not None:
+            return self.pheromone_weights.item(edge_id) * self.heuristic.item(edge_id)
+        
+        # Virtual edges without an id carry the default pheromone
+        if self.virtual_edges is not None and self.virtual_edges.has_edge(u, v):
+            return self.default_pheromone_weight * self._heuristic(self.virtual_edges.cost(u, v))
+        return 0.0
+
+    def edge_id(self, u: str, v: str, create: bool = False) -> int:
+        """Return the id of edge (u, v), or None if it has none.
+        
+        With create=True a virtual edge that the provider can reach is given an id.
+        """
+        edge_id = self._edge_ids.get((u, v))
+        if edge_id is None and create and self.virtual_edges is not None and self.virtual_edges.has_edge(u, v):
+            edge_id = self._add_edge(u, v, self.virtual_edges.cost(u, v))
+        return edge_id
+
+    def get_edges(self) -> List[Tuple[str, str]]:
+        """Return the edges that have an id, in id order."""
+        return list(self._edge_list)
 
     def set_edge_pheromones(self, u: str, v: str, pheromone_value: float) -> None:
-        if (u, v) in self.graph.edges:
-            self.graph.edges[(u, v)]["pheromones"] = pheromone_value
+        edge_id = self.edge_id(u, v, create=True)
+        if edge_id is not None:
+            self.pheromones[edge_id] = pheromone_value
     
     def set_edge_delta_pheromones(self, u: str, v: str, delta_pheromone_value: float) -> None:
-        if (u, v) in self.graph.edges:
-            self.graph.edges[(u, v)]["delta_pheromones"] = delta_pheromone_value
+        edge_id = self.edge_id(u, v, create=True)
+        if edge_id is not None:
+            self.delta_pheromones[edge_id] = delta_pheromone_value
 
     def get_edge_pheromones(self, u: str, v: str) -> float:
-        return self.graph.edges.get((u, v), {}).get("pheromones", 0.0)
+        edge_id = self._edge_ids.get((u, v))
+        if edge_id is not None:
+            return self.pheromones.item(edge_id)
+        if self.virtual_edges is not None and self.virtual_edges.has_edge(u, v):
+            return self.default_pheromone
+        return 0.0
 
     def deposit_pheromones(self, u: str, v: str, pheromone_amount: float) -> None:
-        if (u, v) in self.graph.edges:
-            delta_pheromone = pheromone_amount
-            self.graph.edges[(u, v)]["delta_pheromones"] += delta_pheromone
-            
-    def deposit_pheromones_for_path(self, path: List[str]) -> None:
+        edge_id = self.edge_id(u, v, create=True)
+        if edge_id is not None:
+            self.delta_pheromones[edge_id] += pheromone_amount
+    
+    def deposit_pheromones_on_edges(self, edge_ids: List[int], pheromone_amount: float) -> None:
+        """Add the same amount of delta pheromone to many edges in one operation."""
+        np.add.at(self.delta_pheromones, edge_ids, pheromone_amount)
+    
+    def path_edge_ids(self, path: List[str]) -> List[int]:
+        """Return the edge ids along a path, giving ids to virtual edges that lack one."""
+        edge_ids = []
         for i in range(len(path) - 1):
-            u = path[i]
-            v = path[i + 1]
+            edge_id = self.edge_id(path[i], path[i + 1], create=True)
+            if edge_id is not None:
+                edge_ids.append(edge_id)
+        return edge_ids
             
-            # This ensures that pheromones are deposited even if the edge cost is zero
-            if self.get_edge_cost(u, v) == 0.0:
-                self.set_edge_pheromones(u, v, 0.01)
-                if hasattr(self, '_edge_cost_cache') and (u, v) in self._edge_cost_cache:
-                    self._edge_cost_cache[(u, v)] = 0.01
-                    
-            pheromone_amount = self.pheromone_deposit_weight / self.get_edge_cost(u, v)
-            self.deposit_pheromones(u, v, pheromone_amount)
+    def deposit_pheromones_for_path(self, path: List[str]) -> None:
+        edge_ids = self.path_edge_ids(path)
+        if not edge_ids:
+            return
+        
+        # This ensures that pheromones are deposited even if the edge cost is zero
+        costs = self.costs[edge_ids]
+        zero_cost = costs == 0.0
+        if zero_cost.any():
+            zero_ids = np.asarray(edge_ids)[zero_cost]
+            self.pheromones[zero_ids] = 0.01
+            self.costs[zero_ids] = 0.01
+            if self.heuristic_exponent is not None:
+                self.heuristic[zero_ids] = self._heuristic(0.01)
+            costs = self.costs[edge_ids]
+        
+        np.add.at(self.delta_pheromones, edge_ids, self.pheromone_deposit_weight / costs)
             
     def update_pheromones(self, max_pheromon, min_pheromon, current_acc, current_d_acc) -> None:
-        for u, v in self.graph.get_edges():
-            if (u, v) in self.graph.edges:
-                # Gradient descent update using Adadelta Optimizer
-                pheromones = self.graph.edges[(u, v)].get("pheromones", 0.0)
-                gt = pheromones - (self.graph.edges[(u, v)].get("delta_pheromones", 0.0)) * self.pheromone_deposit_weight
-                acc = self.gamma * current_acc + (1 - self.gamma) * gt * gt
-                update = (gt * math.sqrt(current_d_acc + self.epsilon)) / (math.sqrt(acc + self.epsilon))
-                new_pheromone = pheromones - update
-                d_acc = self.gamma * current_d_acc + (1 - self.gamma) * update * update
-                
-                self.graph.edges[(u, v)]["delta_pheromones"] = 0.0  # Reset delta pheromone after updating
-                
-                # Max min ant system
-                if new_pheromone < min_pheromon:
-                    new_pheromone = min_pheromon
-                elif new_pheromone > max_pheromon:
-                    new_pheromone = max_pheromon
-                self.graph.edges[(u, v)]["pheromones"] = new_pheromone
-        return acc, d_acc
+        # Virtual edges without an id get no deposits, but evaporate and are bounded like
+        # every other edge; update_pheromone_weights refreshes their weight
+        if self.virtual_edges is not None:
+            gt = self.default_pheromone
+            acc = self.gamma * current_acc + (1 - self.gamma) * gt * gt
+            update = (gt * math.sqrt(current_d_acc + self.epsilon)) / math.sqrt(acc + self.epsilon)
+            self.default_pheromone = max(min(self.default_pheromone - update, max_pheromon), min_pheromon)
+        
+        m = self.num_edges
+        if m == 0:
+            return current_acc, current_d_acc
+        pheromones = self.pheromones[:m]
+        delta_pheromones = self.delta_pheromones[:m]
+        
+        # Gradient descent update using Adadelta Optimizer, for every edge at once
+        gt = pheromones - delta_pheromones * self.pheromone_deposit_weight
+        acc = self.gamma * current_acc + (1 - self.gamma) * gt * gt
+        update = (gt * math.sqrt(current_d_acc + self.epsilon)) / np.sqrt(acc + self.epsilon)
+        new_pheromones = pheromones - update
+        d_acc = self.gamma * current_d_acc + (1 - self.gamma) * update * update
+        
+        delta_pheromones[:] = 0.0  # Reset delta pheromone after updating
+        
+        # Max min ant system (the lower bound wins if the bounds cross)
+        np.minimum(new_pheromones, max_pheromon, out=new_pheromones)
+        np.maximum(new_pheromones, min_pheromon, out=pheromones)
+        
+        # The accumulators carried to the next iteration are those of the last edge
+        return acc[-1].item(), d_acc[-1].item()
 
+    def reset_pheromones(self, pheromone_value: float) -> None:
+        """Set every edge, and the default of virtual edges, back to one pheromone value.
+        
+        Args:
+            pheromone_value: New pheromone level of every edge
+        """
+        m = self.num_edges
+        self.pheromones[:m] = pheromone_value
+        self.delta_pheromones[:m] = 0.0
+        self.default_pheromone = pheromone_value
+    
+    def pheromone_entropy(self, alpha: float) -> float:
+        """Return the mean normalized entropy of the pheromone trails.
+        
+        For every node with more than one outgoing edge, the pheromone^alpha values of
+        its edges are normalized into the distribution the ants draw from, and its
+        entropy is divided by log(degree). The mean is 1 while all trails are equally
+        strong and falls towards 0 as the colony converges on a single path. With lazy
+        virtual edges, the edges that have no id yet count at the default pheromone.
+        
+        Args:
+            alpha: Pheromone bias
+        """
+        m = self.num_edges
+        n = self.graph.number_of_nodes()
+        if m == 0 and self.virtual_edges is None:
+            return 0.0
+        
+        # Source node index of every edge, rebuilt when virtual edges were added
+        if self._edge_sources is None or len(self._edge_sources) != m:
+            node_index = {node: i for i, node in enumerate(self.graph.nodes())}
+            self._edge_sources = np.array([node_index[u] for u, _ in self._edge_list], dtype=np.int64)
+        sources = self._edge_sources
+        
+        weights = self.pheromones[:m] ** alpha
+        totals = np.bincount(sources, weights, minlength=n)
+        degree = np.bincount(sources, minlength=n)
+        
+        # Outgoing virtual edges of every node that have no id yet, all at the default pheromone
+        if self.virtual_edges is not None:
+            if self._lazy_degrees is None:
+                self._lazy_degrees = np.array([self.virtual_edges.out_degree(node)
+                                               for node in self.graph.nodes()], dtype=np.int64)
+            unnamed = self._lazy_degrees - degree
+            default_weight = self.default_pheromone ** alpha
+            totals = totals + unnamed * default_weight
+            degree = self._lazy_degrees
+        
+        probabilities = weights / np.where(totals == 0, 1.0, totals)[sources]
+        logs = np.log(probabilities, out=np.zeros(m), where=probabilities > 0)
+        entropy = np.bincount(sources, -probabilities * logs, minlength=n)
+        
+        if self.virtual_edges is not None and default_weight > 0:
+            default_probabilities = default_weight / np.where(totals == 0, 1.0, totals)
+            entropy -= unnamed * default_probabilities * np.log(np.where(unnamed > 0, default_probabilities, 1.0))
+        
+        branching = degree > 1
+        if not branching.any():
+            return 0.0
+        return (entropy[branching] / np.log(degree[branching])).mean().item()
+    
     def get_edge_cost(self, u: str, v: str) -> float:
-        """Get edge cost with caching for better performance"""
-        # Use cached value if available
-        if hasattr(self, '_edge_cost_cache') and (u, v) in self._edge_cost_cache:
-            return self._edge_cost_cache[(u, v)]
+        """Get edge cost from the cost array"""
+        edge_id = self._edge_ids.get((u, v))
+        if edge_id is not None:
+            return self.costs.item(edge_id)
         
-        # Fallback to original implementation
-        return self.graph.edges.get((u, v), {}).get("cost", float('inf'))
+        # Virtual edges without an id are read straight from the distance matrix
+        if self.virtual_edges is not None:
+            return self.virtual_edges.cost(u, v)
+        
+        return float('inf')
 
     def get_edge_distance(self, u: str, v: str) -> float:
         """Get edge distance with caching for better performance"""
@@ -114,8 +325,38 @@ class GraphApi:
     def get_all_nodes(self) -> List[str]:
         return list(self.graph.nodes())
 
+    def number_of_nodes(self) -> int:
+        return self.graph.number_of_nodes()
+
+    def nearest_neighbors(self, k: int) -> Dict[str, List[str]]:
+        """Return the targets of the k cheapest outgoing edges of every node.
+        
+        Ties keep the get_neighbors order.
+        
+        Args:
+            k: Number of neighbors per node
+        """
+        nearest = {}
+        for node in self.graph.nodes():
+            neighbors = self.get_neighbors(node)
+            costs = np.array([self.get_edge_cost(node, neighbor) for neighbor in neighbors])
+            order = np.argsort(costs, kind='stable')[:k]
+            nearest[node] = [neighbors[i] for i in order]
+        return nearest
+
+    def build_candidate_lists(self, k: int) -> None:
+        """Keep the k cheapest outgoing edges of every node as its candidate list.
+        
+        Args:
+            k: Number of candidates per node
+        """
+        self.candidate_lists = self.nearest_neighbors(k)
+
     def get_neighbors(self, node: str) -> List[str]:
         """Get neighbors with caching for better performance"""
+        if self.virtual_edges is not None:
+            return self.virtual_edges.neighbors(node)
+        
         # Use cached value if available
         if hasattr(self, '_neighbor_cache') and node in self._neighbor_cache:
             return self._neighbor_cache[node]
@@ -125,10 +366,7 @@ class GraphApi:
     
     def get_pheromone_levels(self) -> Dict:
         """Get all pheromone levels in the graph for debugging"""
-        result = {}
-        for (u, v) in self.graph.get_edges():
-            result[(u, v)] = self.get_edge_pheromones(u, v)
-        return result
+        return {edge: self.pheromones.item(edge_id) for edge_id, edge in enumerate(self._edge_list)}
 
     def visualize_graph(self, shortest_path: List[str], shortest_path_cost=None) -> None:
         """Visualize the graph with the shortest path highlighted
@@ -153,7 +391,7 @@ class GraphApi:
             # Get max pheromone value for color normalization
             max_pheromone = 0.0
             for u, v in self.graph.get_edges():
-                pheromone = self.graph.edges.get((u, v), {}).get("pheromones", 0)
+                pheromone = self.get_edge_pheromones(u, v)
                 max_pheromone = max(max_pheromone, pheromone)
             
             # Ensure max_pheromone is not zero to avoid division by zero
@@ -180,7 +418,7 @@ class GraphApi:
                 x2, y2 = self.graph.pos[v]
                 
                 # Get pheromone value for this edge
-                pheromone = self.graph.edges.get((u, v), {}).get("pheromones", 0)
+                pheromone = self.get_edge_pheromones(u, v)
                 
                 # Calculate color based on pheromone level - red for high, green for low
                 # Normalize pheromone to [0, 1] range
@@ -234,7 +472,7 @@ class GraphApi:
                         
                     if edge_data:
                         cost = edge_data.get("cost", 0)
-                        pheromone = edge_data.get("pheromones", 0)
+                        pheromone = self.get_edge_pheromones(u, v)
                         label = f"cost: {cost}\nphero: {round(pheromone, 3)}"
                         plt.text(midx, midy, label, fontsize=8, fontweight='bold',
                                 bbox=dict(facecolor='mistyrose', alpha=0.8, edgecolor='gray'),
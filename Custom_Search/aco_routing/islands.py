@@ -0,0 +1,150 @@
+from typing import List, Tuple, Union
+import multiprocessing
+import queue
+import random
+import numpy as np
+
+from aco_routing.aco import ACO
+from aco_routing.network import Network
+
+# Iterations between two migrations
+DEFAULT_MIGRATION_INTERVAL = 10
+
+# Seconds between two checks for islands that died without sending a result
+RESULT_POLL_INTERVAL = 0.5
+
+
+def _run_island(index, seed, graph, aco_options, source, destination, num_ants, migration_interval,
+                inbox, outbox, results) -> None:
+    """Island process: run one colony and trade best paths with its ring neighbors."""
+    # An unread migrant must not keep this process from exiting
+    outbox.cancel_join_thread()
+
+    def migrate(aco: ACO, iteration: int) -> None:
+        if iteration % migration_interval:
+            return
+        if aco.best_path:
+            outbox.put((aco.best_path, aco.best_path_cost))
+        while True:
+            try:
+                path, path_cost = inbox.get_nowait()
+            except queue.Empty:
+                break
+            aco.inject_path(path, path_cost)
+
+    try:
+        aco = ACO(graph, **dict(aco_options, seed=seed))
+        aco.iteration_hook = migrate
+        path, path_cost = aco.find_shortest_path(source, destination, num_ants)
+        results.put((index, path, path_cost, aco.iterations_completed, aco.stop_reason, aco.expand_path(path), None))
+    except Exception as e:
+        results.put((index, [], float("inf"), 0, None, [], repr(e)))
+
+
+class IslandModel:
+    """
+    Independent ACO colonies in separate processes, with best-path migration.
+
+    Every island is a complete ACO with its own seed, pheromone trails and
+    iteration loop, so no iteration of one colony waits for another. Islands form
+    a ring: every migration_interval iterations, an island sends its best path to
+    the next island and takes in whatever its predecessor has sent so far
+    (ACO.inject_path). A migrant that beats the local best replaces it and lays
+    its pheromone deposit on the receiving colony's trails. Migration never
+    blocks, so islands that stop early (time budget, stagnation) do not stall
+    the others.
+    """
+
+    def __init__(self, graph: Network, num_islands: int = None, migration_interval: int = DEFAULT_MIGRATION_INTERVAL,
+                 seed: int = None, **aco_options):
+        """Initialize the island model.
+
+        Args:
+            graph: Network object containing the graph structure
+            num_islands: Number of colonies, one process each (default: CPU count)
+            migration_interval: Iterations between two migrations
+            seed: Seed of the island seeds (ACO's seed option), for reproducible runs
+                (default: random)
+            **aco_options: ACO constructor arguments shared by all islands; each
+                island runs its ants on a single thread unless num_threads is given
+        """
+        self.graph = graph
+        self.num_islands = num_islands if num_islands else multiprocessing.cpu_count()
+        self.migration_interval = migration_interval
+        self.seed = seed
+        self.aco_options = dict(aco_options)
+        self.aco_options.setdefault("num_threads", 1)
+        self.island_results = []
+        self._expanded_paths = {}
+
+    def _island_seeds(self) -> List[int]:
+        """Independent seeds, one per island."""
+        entropy = self.seed if self.seed is not None else random.getrandbits(64)
+        children = np.random.SeedSequence(entropy).spawn(self.num_islands)
+        return [int(child.generate_state(1, dtype=np.uint64)[0]) for child in children]
+
+    def find_shortest_path(self, source: str, destination: Union[str, List[str]],
+                           num_ants: int) -> Tuple[List[str], float]:
+        """Run all islands and return the best path any of them found.
+
+        Args:
+            source: Source node
+            destination: Destination node or list of nodes
+            num_ants: Number of ants per island and iteration
+
+        Returns:
+            Tuple containing the best path and its cost; island_results keeps the
+            (index, path, cost, iterations_completed, stop_reason) of every island
+        """
+        inboxes = [multiprocessing.Queue() for _ in range(self.num_islands)]
+        results = multiprocessing.Queue()
+        processes = []
+        for index, seed in enumerate(self._island_seeds()):
+            process = multiprocessing.Process(
+                target=_run_island,
+                args=(index, seed, self.graph, self.aco_options, source, destination, num_ants,
+                      self.migration_interval, inboxes[index], inboxes[(index + 1) % self.num_islands], results))
+            process.start()
+            processes.append(process)
+
+        # Results are read before joining, so no island blocks on a full pipe
+        island_results = []
+        errors = []
+        self._expanded_paths = {}
+        pending = set(range(len(processes)))
+        try:
+            while pending:
+                # An island that was already gone before this wait has sent all it ever will
+                dead = [index for index in pending if not processes[index].is_alive()]
+                try:
+                    index, path, path_cost, iterations, stop_reason, expanded_path, error = results.get(
+                        timeout=RESULT_POLL_INTERVAL)
+                except queue.Empty:
+                    # Killed before it could report (out of memory, a signal): a failed island
+                    for index in dead:
+                        pending.discard(index)
+                        errors.append(f"island {index}: exited with code {processes[index].exitcode}")
+                        island_results.append((index, [], float("inf"), 0, None))
+                    continue
+                pending.discard(index)
+                if error is not None:
+                    errors.append(f"island {index}: {error}")
+                island_results.append((index, path, path_cost, iterations, stop_reason))
+                self._expanded_paths[tuple(path)] = expanded_path
+        finally:
+            for process in processes:
+                process.join()
+            for inbox in inboxes:
+                inbox.cancel_join_thread()
+                inbox.close()
+
+        if len(errors) == len(processes):
+            raise RuntimeError("All islands failed: " + "; ".join(errors))
+
+        self.island_results = sorted(island_results)
+        _, best_path, best_path_cost, _, _ = min(island_results, key=lambda result: result[2])
+        return best_path, best_path_cost
+
+    def expand_path(self, path: List[str]) -> List[str]:
+        """Replace the virtual edges of a path returned by find_shortest_path (see ACO.expand_path)."""
+        return list(self._expanded_paths.get(tuple(path), path))
@@ -0,0 +1,334 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+from abc import ABC, abstractmethod
+from collections import deque
+import numpy as np
+
+from aco_routing.graph_api import GraphApi
+
+# Neighbor list length of the local searches
+DEFAULT_NEIGHBOR_COUNT = 10
+
+# Smallest cost decrease accepted as an improvement (guards against float noise)
+IMPROVEMENT_EPSILON = 1e-9
+
+# Longest segment Or-opt relocates
+OR_OPT_MAX_SEGMENT = 3
+
+
+class LocalSearch(ABC):
+    """
+    Base class of the path improvement heuristics.
+
+    Every move keeps both end nodes of the path fixed, so the searches work for
+    closed TSP tours (path[0] == path[-1]) and for open paths alike. Moves are
+    delta-evaluated from the few edges they change, only moves that add an edge
+    from a node to one of its nearest neighbors are tried, and a node whose moves
+    all failed is skipped (its don't-look bit is set) until a move changes one of
+    its path edges. Subclasses implement _improve_node.
+    """
+
+    def __init__(self, graph_api: GraphApi, neighbor_count: int = DEFAULT_NEIGHBOR_COUNT):
+        """Initialize the search; the neighbor lists are built on first use.
+
+        Args:
+            graph_api: GraphApi supplying the edge costs
+            neighbor_count: Number of nearest neighbors tried per node
+        """
+        self.graph_api = graph_api
+        self.neighbor_count = neighbor_count
+        self._neighbor_lists = None
+
+    @property
+    def neighbor_lists(self) -> Dict[str, List[str]]:
+        if self._neighbor_lists is None:
+            self._neighbor_lists = self.graph_api.nearest_neighbors(self.neighbor_count)
+        return self._neighbor_lists
+
+    def _prepare(self, path: List[str]) -> None:
+        """Recompute node positions, edge costs and their prefix sums for path."""
+        # The first occurrence wins, so the closing node of a tour keeps position 0
+        self._positions = {}
+        for index, node in enumerate(path):
+            self._positions.setdefault(node, index)
+
+        cost = self.graph_api.get_edge_cost
+        self._forward = np.array([cost(u, v) for u, v in zip(path, path[1:])])
+        backward = np.array([cost(v, u) for u, v in zip(path, path[1:])])
+
+        # Missing reverse edges are counted separately so that inf never meets inf
+        missing = np.isinf(backward)
+        self._forward_sums = np.concatenate(([0.0], np.cumsum(self._forward)))
+        self._backward_sums = np.concatenate(([0.0], np.cumsum(np.where(missing, 0.0, backward))))
+        self._missing_sums = np.concatenate(([0], np.cumsum(missing)))
+
+    def _reversal_change(self, i: int, j: int) -> float:
+        """Cost change of walking path[i..j] backwards instead of forwards (inf if impossible)."""
+        if self._missing_sums[j] - self._missing_sums[i] > 0:
+            return float('inf')
+        return (self._backward_sums[j] - self._backward_sums[i]) - (self._forward_sums[j] - self._forward_sums[i])
+
+    @abstractmethod
+    def _improve_node(self, path: List[str], node: str) -> Optional[List[str]]:
+        """Apply the first improving move around node.
+
+        Returns:
+            The nodes whose path edges changed, or None if no move improved the path
+        """
+        pass
+
+    def improve(self, path: List[str]) -> Tuple[List[str], float]:
+        """Apply improving moves until none is left.
+
+        Args:
+            path: Path to improve (not modified)
+
+        Returns:
+            Tuple of (improved_path, improved_cost)
+        """
+        path = list(path)
+        if len(path) < 4:  # Not enough nodes for meaningful moves
+            return path, self._path_cost(path)
+
+        self._prepare(path)
+        if not np.isfinite(self._forward_sums[-1]):
+            return path, self._path_cost(path)
+
+        # Don't-look bits: only nodes in the queue are looked at
+        queue = deque(path[:-1])
+        queued = set(queue)
+        while queue:
+            node = queue.popleft()
+            queued.discard(node)
+
+            woken = self._improve_node(path, node)
+            if woken is None:
+                continue
+            self._prepare(path)
+            for changed in woken + [node]:
+                if changed not in queued:
+                    queue.append(changed)
+                    queued.add(changed)
+
+        return path, self._path_cost(path)
+
+    def _path_cost(self, path: List[str]) -> float:
+        cost = 0.0
+        for i in range(len(path) - 1):
+            cost += self.graph_api.get_edge_cost(path[i], path[i + 1])
+        return cost
+
+
+class TwoOptSearch(LocalSearch):
+    """
+    2-opt: reverse path[i..j].
+
+    On asymmetric graphs the reversed segment is walked backwards, so the move
+    delta is
+        c(p[i-1], p[j]) + c(p[i], p[j+1]) + (backward cost of p[i..j])
+      - c(p[i-1], p[i]) - c(p[j], p[j+1]) - (forward cost of p[i..j])
+    Prefix sums of the forward and backward edge costs along the path make every
+    delta O(1). Reversals are applied in place.
+    """
+
+    def move_delta(self, path: List[str], i: int, j: int) -> float:
+        """Cost change of reversing path[i..j] (inf if the new path uses a missing edge)."""
+        cost = self.graph_api.get_edge_cost
+        reversal = self._reversal_change(i, j)
+        if reversal == float('inf'):
+            return reversal
+        return (cost(path[i - 1], path[j]) + cost(path[i], path[j + 1])
+                - self._forward[i - 1] - self._forward[j] + reversal)
+
+    def _candidate_moves(self, path: List[str], node: str) -> Iterator[Tuple[int, int]]:
+        """Yield the (i, j) moves that add an edge from node to one of its nearest neighbors."""
+        last = len(path) - 2
+        q = self._positions[node]
+        for neighbor in self.neighbor_lists.get(node, []):
+            p = self._positions.get(neighbor)
+            if p is None:
+                continue
+            # node -> neighbor replaces path[q] -> path[q + 1]: reverse path[q + 1 .. p]
+            if q + 3 <= p <= last:
+                yield q + 1, p
+            # node -> neighbor replaces path[p - 1] -> path[p]: reverse path[q .. p - 1]
+            if q >= 1 and q + 2 <= p - 1 <= last:
+                yield q, p - 1
+
+    def _improve_node(self, path: List[str], node: str) -> Optional[List[str]]:
+        for i, j in self._candidate_moves(path, node):
+            if self.move_delta(path, i, j) < -IMPROVEMENT_EPSILON:
+                path[i:j + 1] = path[j:i - 1:-1]
+                return [path[i - 1], path[i], path[j], path[j + 1]]
+        return None
+
+
+class OrOptSearch(LocalSearch):
+    """
+    Or-opt: move a segment of 1 to OR_OPT_MAX_SEGMENT nodes to another place in
+    the path, in its original or in reversed orientation.
+
+    Moving p[s..e] between p[t] and p[t + 1] removes the edges p[s-1] -> p[s],
+    p[e] -> p[e+1] and p[t] -> p[t+1] and adds p[s-1] -> p[e+1] plus the two
+    edges that splice the segment in. A reversed segment also pays the
+    backward-minus-forward cost of its inner edges, read from the prefix sums.
+    """
+
+    def __init__(self, graph_api: GraphApi, neighbor_count: int = DEFAULT_NEIGHBOR_COUNT,
+                 max_segment: int = OR_OPT_MAX_SEGMENT):
+        """Initialize the search.
+
+        Args:
+            graph_api: GraphApi supplying the edge costs
+            neighbor_count: Number of nearest neighbors tried per node
+            max_segment: Longest segment that is relocated
+        """
+        super().__init__(graph_api, neighbor_count)
+        self.max_segment = max_segment
+
+    def move_delta(self, path: List[str], s: int, e: int, t: int, reverse: bool) -> float:
+        """Cost change of moving path[s..e] between path[t] and path[t + 1]."""
+        cost = self.graph_api.get_edge_cost
+        removed = self._forward[s - 1] + self._forward[e] + self._forward[t]
+        added = cost(path[s - 1], path[e + 1])
+        if reverse:
+            reversal = self._reversal_change(s, e)
+            if reversal == float('inf'):
+                return reversal
+            added += cost(path[t], path[e]) + cost(path[s], path[t + 1]) + reversal
+        else:
+            added += cost(path[t], path[s]) + cost(path[e], path[t + 1])
+        return added - removed
+
+    def _candidate_moves(self, path: List[str], node: str) -> Iterator[Tuple[int, int, int, bool]]:
+        """Yield (s, e, t, reverse) moves of a segment that ends (or, reversed, starts) at node."""
+        last = len(path) - 2
+        q = self._positions[node]
+        for neighbor in self.neighbor_lists.get(node, []):
+            p = self._positions.get(neighbor)
+            if p is None or p == 0:
+                continue
+            t = p - 1
+            for length in range(1, self.max_segment + 1):
+                # Forward: the segment ends at node, which gets the edge node -> neighbor
+                s, e = q - length + 1, q
+                if 1 <= s and e <= last and not s - 1 <= t <= e:
+                    yield s, e, t, False
+                # Reversed: the segment starts at node, which becomes its last node
+                s, e = q, q + length - 1
+                if 1 <= s and e <= last and not s - 1 <= t <= e:
+                    yield s, e, t, True
+
+    def _improve_node(self, path: List[str], node: str) -> Optional[List[str]]:
+        for s, e, t, reverse in self._candidate_moves(path, node):
+            if self.move_delta(path, s, e, t, reverse) < -IMPROVEMENT_EPSILON:
+                segment = path[s:e + 1]
+                woken = [path[s - 1], path[e + 1], path[t], path[t + 1]] + segment
+                if reverse:
+                    segment.reverse()
+                if t < s:
+                    path[t + 1:e + 1] = segment + path[t + 1:s]
+                else:
+                    path[s:t + 1] = path[e + 1:t + 1] + segment
+                return woken
+        return None
+
+
+class ThreeOptSearch(LocalSearch):
+    """
+    Bounded 3-opt with the orientation-preserving (segment exchange) move.
+
+    For cut points i < j <= k the path a..b c..d e..f (a = p[i], b = p[i+1],
+    c = p[j-1], d = p[j], e = p[k], f = p[k+1]) becomes a d..e b..c f. No segment
+    is reversed, so the delta
+        c(a, d) + c(e, b) + c(c, f) - c(a, b) - c(c, d) - c(e, f)
+    is exact on asymmetric graphs too. The search is bounded Lin-Kernighan style:
+    the first new edge a -> d must go to one of a's nearest neighbors and must
+    already be cheaper than a -> b (positive partial gain), and the closing edge
+    c -> f must go to one of c's nearest neighbors.
+    """
+
+    def move_delta(self, path: List[str], i: int, j: int, k: int) -> float:
+        """Cost change of exchanging path[i+1..j-1] and path[j..k]."""
+        cost = self.graph_api.get_edge_cost
+        removed = self._forward[i] + self._forward[j - 1] + self._forward[k]
+        added = cost(path[i], path[j]) + cost(path[k], path[i + 1]) + cost(path[j - 1], path[k + 1])
+        return added - removed
+
+    def _improve_node(self, path: List[str], node: str) -> Optional[List[str]]:
+        cost = self.graph_api.get_edge_cost
+        last = len(path) - 2
+        i = self._positions[node]
+        if i > last:
+            return None
+
+        for d in self.neighbor_lists.get(node, []):
+            j = self._positions.get(d)
+            if j is None or not i + 2 <= j <= last:
+                continue
+            # Partial gain of the first exchange must be positive
+            if cost(node, d) >= self._forward[i]:
+                continue
+            c = path[j - 1]
+            for f in self.neighbor_lists.get(c, []):
+                k = self._positions.get(f)
+                if k is None:
+                    continue
+                k -= 1
+                if not j <= k <= last:
+                    continue
+                if self.move_delta(path, i, j, k) < -IMPROVEMENT_EPSILON:
+                    woken = [path[i], path[i + 1], path[j - 1], path[j], path[k], path[k + 1]]
+                    path[i + 1:k + 1] = path[j:k + 1] + path[i + 1:j]
+                    return woken
+        return None
+
+
+# Local searches that can be selected by name on ACO
+LOCAL_SEARCHES = {
+    "2opt": TwoOptSearch,
+    "oropt": OrOptSearch,
+    "3opt": ThreeOptSearch,
+}
+
+
+def create_local_searches(graph_api: GraphApi, names) -> List[LocalSearch]:
+    """Build the local searches named in names ("2opt", "oropt", "3opt").
+
+    Args:
+        graph_api: GraphApi supplying the edge costs
+        names: One name or LocalSearch instance, or a list of them
+
+    Returns:
+        List of LocalSearch objects, in the given order
+    """
+    if isinstance(names, (str, LocalSearch)):
+        names = [names]
+    searches = []
+    for name in names:
+        if isinstance(name, LocalSearch):
+            searches.append(name)
+        elif name in LOCAL_SEARCHES:
+            searches.append(LOCAL_SEARCHES[name](graph_api))
+        else:
+            raise ValueError(f"Unknown local search: {name}")
+    return searches
+
+
+def improve_path(searches: List[LocalSearch], path: List[str]) -> Tuple[List[str], float]:
+    """Run the local searches in turn until none of them improves the path any further.
+
+    Args:
+        searches: LocalSearch objects
+        path: Path to improve (not modified)
+
+    Returns:
+        Tuple of (improved_path, improved_cost)
+    """
+    path, cost = list(path), None
+    while True:
+        round_start = cost
+        for search in searches:
+            path, cost = search.improve(path)
+        # A single search already stops at a local optimum of its own moves
+        if len(searches) < 2 or (round_start is not None and cost >= round_start - IMPROVEMENT_EPSILON):
+            return path, cost
@@ -0,0 +1,72 @@
+from typing import List, Tuple, Union
+import time
+
+from aco_routing.aco import ACO
+from aco_routing.network import Network
+
+
+class ACOSession:
+    """
+    Answers many (origin, destinations) queries on one graph with a single ACO.
+
+    Everything that only depends on the graph is done once, when the session is
+    created: the all-pairs preprocessing (forced in mode 0), the GraphApi edge
+    arrays, the precomputed heuristic, the local search neighbor lists and the
+    candidate lists. Each query then only runs the colony.
+
+    By default every query starts from the initial pheromone trails, so answers do
+    not depend on the queries before them. With warm_start, a query starts from the
+    trails left by the previous ones, which helps when the stream keeps asking
+    about the same part of the graph.
+    """
+
+    def __init__(self, graph: Network, num_ants: int = None, warm_start: bool = False, **aco_options):
+        """Build the ACO of the session.
+
+        Args:
+            graph: Network object containing the graph structure
+            num_ants: Default number of ants per query (default: number of nodes)
+            warm_start: Start every query from the pheromones of the previous ones
+            **aco_options: ACO constructor arguments (ant_max_steps, num_iterations, mode, ...)
+        """
+        start_time = time.perf_counter()
+        self.aco = ACO(graph, **aco_options)
+        self.setup_time = time.perf_counter() - start_time
+
+        self.graph = graph
+        self.num_ants = num_ants if num_ants else graph.number_of_nodes()
+        self.warm_start = warm_start
+        self.num_queries = 0
+
+    def query(
+        self,
+        origin: str,
+        destinations: Union[str, List[str]],
+        num_ants: int = None,
+        time_limit: float = None,
+        expand: bool = True,
+    ) -> Tuple[List[str], float]:
+        """Find the best path from origin to the destination(s) according to the ACO mode.
+
+        Args:
+            origin: Source node
+            destinations: Destination node or list of nodes
+            num_ants: Number of ants to deploy (default: the session's num_ants)
+            time_limit: Wall-clock limit of this query in seconds
+            expand: Replace virtual edges by the real nodes they stand for
+
+        Returns:
+            Tuple containing the best path and its cost, ([], inf) if no path was found
+        """
+        if self.num_queries > 0 and not self.warm_start:
+            self.aco.reset_pheromones()
+
+        path, cost = self.aco.find_shortest_path(origin, destinations, num_ants or self.num_ants,
+                                                 time_limit=time_limit)
+        self.num_queries += 1
+
+        if not path:
+            return [], float("inf")
+        if expand:
+            path = self.aco.expand_path(path)
+        return path, cost
@@ -1,7 +1,5 @@
 import random
 from typing import Dict
-# Add caching for edge desirability calculations
-_desirability_cache = {}
 
 def compute_edge_desirability(
     pheromone_value: float, 
@@ -11,15 +9,12 @@ def compute_edge_desirability(
     beta: float,
     mode: int = 0
 ) -> float:
-    """Compute the desirability with caching for better performance"""
-    # Cache key for this computation
-    cache_key = (pheromone_value, edge_cost, edge_distance, alpha, beta)
+    """Compute the desirability of a single edge.
     
-    # Return cached result if available
-    if cache_key in _desirability_cache:
-        return _desirability_cache[cache_key]
-        
-    # Standard calculation
+    The ants read pheromone^alpha * (1/cost)^beta from the arrays precomputed by
+    GraphApi (precompute_heuristic / update_pheromone_weights); this is the same
+    formula for one value.
+    """
     if edge_cost == 0:
         edge_cost = 1e-10
     
@@ -27,18 +22,14 @@ def compute_edge_desirability(
     #     result = (pheromone_value ** alpha) * ((1 / edge_cost ) ** beta)
     # else:
     #     result = (pheromone_value ** alpha) * ((edge_distance / edge_cost) ** beta)
-    result = (pheromone_value ** alpha) * ((1 / edge_cost ) ** beta)
-    # Store in cache (but limit cache size)
-    if len(_desirability_cache) < 10000:  # Prevent memory issues
-        _desirability_cache[cache_key] = result
-        
-    return result
+    return (pheromone_value ** alpha) * ((1 / edge_cost ) ** beta)
 
-def roulette_wheel_selection(probabilities: Dict[str, float]) -> str:
+def roulette_wheel_selection(probabilities: Dict[str, float], rng: random.Random = None) -> str:
     """Select a key from a dictionary based on probability values
     
     Args:
         probabilities: Dict mapping items to their probabilities
+        rng: Random number generator to draw from (default: the global random module)
         
     Returns:
         The selected key
@@ -55,8 +46,11 @@ def roulette_wheel_selection(probabilities: Dict[str, float]) -> str:
     total = sum(probabilities.values())
     normalized_probs = {k: v/total for k, v in probabilities.items()}
     
+    if rng is None:
+        rng = random
+    
     # Pick a random point on the probability line
-    r = random.random()
+    r = rng.random()
     
     # Find the item that corresponds to this point
     cumulative = 0
@@ -66,14 +60,16 @@ def roulette_wheel_selection(probabilities: Dict[str, float]) -> str:
             return item
             
     # Fallback: return random item (should rarely happen)
-    return random.choice(list(probabilities.keys()))
+    return rng.choice(list(probabilities.keys()))
 
-def pseudo_random_proportional_selection(value: Dict[str, float], probabilities: Dict[str, float]) -> str:
+def pseudo_random_proportional_selection(value: Dict[str, float], probabilities: Dict[str, float],
+                                         rng: random.Random = None) -> str:
     """Select a key from a dictionary based on probability values
     
     Args:
         value: Dict mapping items to their value (result of compute_edge_desirability)
         probabilities: Dict mapping items to their probabilities
+        rng: Random number generator to draw from (default: the global random module)
         
     Returns:
         The selected key or None if no valid options
@@ -89,8 +85,11 @@ def pseudo_random_proportional_selection(value: Dict[str, float], probabilities:
     if len(value) == 1:
         return list(value.keys())[0]
     
+    if rng is None:
+        rng = random
+    
     # Pick a random point on the probability line
-    r = random.random() 
+    r = rng.random() 
     
     threshold = 0.5
     
@@ -101,6 +100,6 @@ def pseudo_random_proportional_selection(value: Dict[str, float], probabilities:
         return max_key
     else:
         # Perform roulette wheel selection
-        selected_key = roulette_wheel_selection(probabilities)
+        selected_key = roulette_wheel_selection(probabilities, rng)
         return selected_key
 
@@ -0,0 +1,127 @@
+from collections import OrderedDict
+from typing import List
+import threading
+import numpy as np
+
+from aco_routing.floyd_warshall import FloydWarshall
+
+
+class LazyVirtualEdges:
+    """
+    On-demand virtual edges backed by an all-pairs shortest path solver.
+
+    FloydWarshall.update_graph_with_shortest_paths adds a virtual edge with a full
+    path list for every reachable pair, which turns a sparse graph into a complete
+    one. This class leaves Network.edges untouched and answers the same questions
+    lazily instead:
+        - neighbors(u): every node reachable from u, real neighbors first
+        - cost(u, v): the shortest path cost, read straight from the distance matrix
+        - path(u, v): the underlying node sequence, built only when asked for
+    Neighbor lists and paths are kept in LRU caches with a fixed size, behind a
+    lock since the ants of the thread executor share one instance.
+    """
+
+    def __init__(self, solver: FloydWarshall, max_cached_paths: int = 10000, max_cached_neighbors: int = 4096):
+        """Initialize with a solver whose run() has already been called.
+
+        Args:
+            solver: All-pairs solver (FloydWarshall, BlockedFloydWarshall or RepeatedDijkstra)
+            max_cached_paths: Maximum number of (u, v) paths kept in the LRU cache
+            max_cached_neighbors: Maximum number of neighbor lists kept in the LRU cache
+        """
+        self.solver = solver
+        self.graph = solver.graph
+        self.max_cached_paths = max_cached_paths
+        self.max_cached_neighbors = max_cached_neighbors
+        self._paths = OrderedDict()
+        self._neighbors = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _lru_get(self, cache: OrderedDict, key):
+        """Return a cached value and mark it as recently used, or None."""
+        with self._lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            return value
+
+    def _lru_put(self, cache: OrderedDict, key, value, max_size: int) -> None:
+        """Store a value and evict the least recently used entries over max_size."""
+        with self._lock:
+            cache[key] = value
+            if len(cache) > max_size:
+                cache.popitem(last=False)
+
+    def neighbors(self, u: str) -> List[str]:
+        """Return every node reachable from u: the real neighbors, then the virtual ones.
+
+        The order matches the one the eager update would have produced.
+        """
+        neighbors = self._lru_get(self._neighbors, u)
+        if neighbors is not None:
+            return neighbors
+
+        real = list(self.graph.neighbors(u))
+        i = self.solver.node_to_idx.get(u)
+        if i is None:
+            return real
+
+        real_set = set(real)
+        reachable = np.flatnonzero(np.isfinite(self.solver.dist_matrix[i]))
+        neighbors = real + [self.solver.nodes[j] for j in reachable
+                            if j != i and self.solver.nodes[j] not in real_set]
+        self._lru_put(self._neighbors, u, neighbors, self.max_cached_neighbors)
+        return neighbors
+
+    def out_degree(self, u: str) -> int:
+        """Return len(neighbors(u)) without building (or caching) the list."""
+        real = set(self.graph.neighbors(u))
+        i = self.solver.node_to_idx.get(u)
+        if i is None:
+            return len(real)
+
+        # Every finite entry of the row but the diagonal, plus a real self-loop
+        reachable = np.count_nonzero(np.isfinite(self.solver.dist_matrix[i]))
+        reachable -= bool(np.isfinite(self.solver.dist_matrix[i, i]))
+        return int(reachable) + (u in real)
+
+    def has_edge(self, u: str, v: str) -> bool:
+        """Return True if v can be reached from u (through a real or a virtual edge)."""
+        return self.cost(u, v) < float('inf')
+
+    def cost(self, u: str, v: str) -> float:
+        """Return the cost of the (possibly virtual) edge u -> v."""
+        i = self.solver.node_to_idx.get(u)
+        j = self.solver.node_to_idx.get(v)
+        if i is None or j is None:
+            return float('inf')
+        if i == j:
+            # A self-loop is only available as a real edge
+            return self.graph.edges.get((u, v), {}).get("cost", float('inf'))
+        return self.solver.dist_matrix.item(i, j)
+
+    def is_virtual(self, u: str, v: str) -> bool:
+        """Return True if u -> v is served by a shortest path rather than by the real edge."""
+        real_cost = self.graph.edges.get((u, v), {}).get("cost", float('inf'))
+        return self.cost(u, v) < real_cost
+
+    def path(self, u: str, v: str) -> List[str]:
+        """Return the node sequence behind the edge u -> v (just [u, v] for a real edge)."""
+        if not self.is_virtual(u, v):
+            return [u, v]
+
+        path = self._lru_get(self._paths, (u, v))
+        if path is None:
+            path, _ = self.solver.get_shortest_path(u, v)
+            self._lru_put(self._paths, (u, v), path, self.max_cached_paths)
+        return path
+
+    def expand_path(self, path: List[str]) -> List[str]:
+        """Replace every virtual hop of path by the real nodes it stands for."""
+        if len(path) < 2:
+            return list(path)
+
+        expanded = [path[0]]
+        for u, v in zip(path, path[1:]):
+            expanded.extend(self.path(u, v)[1:])
+        return expanded
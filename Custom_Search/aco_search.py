@@ -8,8 +8,9 @@ import multiprocessing
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(parent_dir)
 
-from aco_routing.aco import ACO
+from aco_routing.session import ACOSession
 from aco_routing.network import Network
+from aco_routing.apsp_cache import DEFAULT_CACHE_DIR
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(os.path.join(current_dir, "..", "data_reader"))
@@ -21,6 +22,19 @@ def main():
     parser = argparse.ArgumentParser(description='ACO Search Algorithm')
     parser.add_argument('file_path', nargs='?', default="Data/PathFinder-Test.txt",
                         help='Path to the graph file (default: Data/PathFinder-Test.txt)')
+    parser.add_argument('--cache', action='store_true',
+                        help=f'Keep the all-pairs shortest paths in {DEFAULT_CACHE_DIR} and reuse them '
+                             'for the same graph (default: recompute every run)')
+    parser.add_argument('--cache-dir', default=None,
+                        help='Same as --cache, with the cache in this directory')
+    parser.add_argument('--time-limit', type=float, default=None,
+                        help='Answer within this many seconds with the best path found so far '
+                             '(default: run a fixed number of iterations)')
+    parser.add_argument('--query', nargs='+', action='append', metavar='NODE',
+                        help='Extra query "ORIGIN DEST [DEST ...]" answered on the same preprocessed graph '
+                             '(can be repeated)')
+    parser.add_argument('--warm-start', action='store_true',
+                        help='Start each query from the pheromones left by the previous ones')
     
     # Check if the script was called directly or through search.py
     if len(sys.argv) > 1:
@@ -28,7 +42,9 @@ def main():
         file_path = args.file_path
     else:
         # Default values if no arguments provided
+        args = parser.parse_args([])
         file_path = "Data/PathFinder-test.txt"
+    all_pairs_cache_dir = args.cache_dir or (DEFAULT_CACHE_DIR if args.cache else None)
 
     
     try:
@@ -53,7 +69,8 @@ def main():
     node_count = G.number_of_nodes()
     use_floyd_warshall = False
     visualize = False
-    iterations = 20
+    # With a time limit the deadline ends the search and also times the late MMAS phase
+    iterations = 20 if args.time_limit is None else sys.maxsize
     ant_max_steps = node_count + 1
     num_ants = node_count
     alpha = 1
@@ -68,8 +85,10 @@ def main():
     # Measure execution time
     start_time = time.time()
     
-    # Initialize ACO with optimized parameters including thread-based parallelization and local search
-    aco = ACO(G, 
+    # Preprocess the graph once for every query on it, with thread-based parallelization and local search
+    session = ACOSession(G,
+        num_ants=num_ants,
+        warm_start=args.warm_start,  # Start each query from the pheromones of the previous ones
         ant_max_steps=ant_max_steps,
         num_iterations=iterations, 
         evaporation_rate=evaporation_rate, 
@@ -82,27 +101,45 @@ def main():
         use_floyd_warshall=use_floyd_warshall,  # Use Floyd-Warshall preprocessing
         use_local_search=use_local_search,  # Enable local search optimization
         local_search_frequency=local_search_frequency,  # Apply local search every N iterations
-        num_threads=num_threads  # Use thread-based parallelization
+        num_threads=num_threads,  # Use thread-based parallelization
+        all_pairs_cache_dir=all_pairs_cache_dir  # Reuse all-pairs results across runs
     )
     
-    aco_path, aco_cost = aco.find_shortest_path(
-        source=origin,
-        destination=destinations,
-        num_ants=num_ants,
-    )
+    # The query of the file first, then the ones given with --query
+    queries = [(origin, destinations)]
+    for query in args.query or []:
+        queries.append((query[0], query[1:]))
     
-    # Calculate execution time
-    # execution_time = time.time() - start_time
-    # print(f"\nExecution time: {execution_time:.4f} seconds")
-    
-    # Print path stats
-    # if aco_path:
-    #     print(f"Path length: {len(aco_path)} nodes")
-    #     print(f"Path cost: {aco_cost}")
-    #     print("------------------------------")
+    for query_origin, query_destinations in queries:
+        # The time limit of the first query covers the preprocessing as well
+        time_limit = None
+        if args.time_limit is not None:
+            time_limit = max(0.0, args.time_limit - (time.time() - start_time))
+        
+        try:
+            aco_path, aco_cost = session.query(query_origin, query_destinations, time_limit=time_limit)
+        except ValueError as e:
+            print(f"{file_path} CUS2")
+            print(f"Invalid query: {e}")
+            continue
+        start_time = time.time()
+        
+        # Calculate execution time
+        # execution_time = time.time() - start_time
+        # print(f"\nExecution time: {execution_time:.4f} seconds")
+        
+        # Print path stats
+        # if aco_path:
+        #     print(f"Path length: {len(aco_path)} nodes")
+        #     print(f"Path cost: {aco_cost}")
+        #     print("------------------------------")
+        
+        print_result(file_path, G, query_origin, query_destinations, aco_path, aco_cost)
+
 
-    # Format the output for the assignment requirements
-    if aco_cost == 0:
+def print_result(file_path, G, origin, destinations, aco_path, aco_cost):
+    """Print one query result in the format of the assignment (aco_path already expanded)."""
+    if aco_path and aco_cost == 0:
         print(f"{file_path} CUS2")
         print(f"[{', '.join(destinations)}] {G.number_of_nodes()}")
         print(f"Destination already reached: Origin {origin} to destination {destinations}")
@@ -114,8 +151,7 @@ def main():
         print("No path found")
         print("0.0")
     else:
-        # Normal output
-        aco_path = [node for node in aco_path]
+        # Normal output, with virtual edges expanded into the real route
         goal_str = aco_path[-1]
         number_of_nodes = G.number_of_nodes()
         path_str = ", ".join(aco_path)
@@ -1,3 +1,4 @@
+import argparse
 import heapq
 import matplotlib.pyplot as plt
 import numpy as np
@@ -15,16 +16,8 @@ aco_routing_dir = os.path.join(current_dir, "..", "Custom_Search", "aco_routing"
 sys.path.append(aco_routing_dir)
 
 from network import Network
-
-class Node:
-    def __init__(self, start_node, total_score, g_score, f_score):
-        self.start_node = start_node
-        self.g_score = g_score
-        self.f_score = f_score
-        self.total_score = total_score
-
-    def __lt__(self,  other):
-        return self.total_score < other.total_score
+from heuristic_table import heuristic_table
+from landmarks import DEFAULT_LANDMARK_CACHE_DIR, landmark_heuristic_table, load_or_compute_landmarks
 
 # finding straight line value between current and goal nodes
 def find_f_score(pos, current, goal):
@@ -34,23 +27,28 @@ def find_f_score(pos, current, goal):
     return math.sqrt((goal_x - current_x)**2 + (goal_y - current_y)**2)
     
 def find_next_node(graph, pos, current, goal, heuristic, visited_list):
+    # Format: (g + f, counter, node); the counter keeps insertion order on ties
     heuristic_value = []
 
     if graph[current] == []:
         return None
     else:
-        for i in graph[current]:
+        for counter, i in enumerate(graph[current]):
             if i not in visited_list:
                 g_score = heuristic[(current, i)]
                 f_score = find_f_score(pos, i, goal)
-                heapq.heappush(heuristic_value, Node(i, g_score + f_score, g_score=g_score, f_score=f_score))
+                heapq.heappush(heuristic_value, (g_score + f_score, counter, i))
     
         if not heuristic_value:
             return None
         
-        return heapq.heappop(heuristic_value)
+        return heapq.heappop(heuristic_value)[2]
+
+# h: node -> estimated distance to the goal (default: heuristic_table of the goal)
+def a_star(graph, positions, start, goal, heuristic, h=None):
+    if h is None:
+        h = heuristic_table(positions, [goal])
 
-def a_star(graph, positions, start, goal, heuristic):
     # path dictionary to track the explored paths
     path = {start: None}
 
@@ -58,16 +56,15 @@ def a_star(graph, positions, start, goal, heuristic):
     visited = set()
 
     g_scores = {start: 0}
-    f_scores = {start: find_f_score(positions, start, goal)}
+    f_scores = {start: h[start]}
 
     # Priority queue to hold nodes to explore, sorted by heuristic value
-    priority_queue = []
-    first = Node(start, g_scores[start] + f_scores[start], 0, find_f_score(positions, start, goal=goal))
-    heapq.heappush(priority_queue, first)
+    # Format: (g + f_score, counter, node); the counter keeps insertion order on ties
+    counter = 0
+    priority_queue = [(g_scores[start] + f_scores[start], counter, start)]
 
     while priority_queue:
-        current = heapq.heappop(priority_queue)
-        current_node = current.start_node
+        _, _, current_node = heapq.heappop(priority_queue)
         
         if current_node == goal:
             return reconstruct_path(path, start, goal)
@@ -93,19 +90,65 @@ def a_star(graph, positions, start, goal, heuristic):
                     # Update path
                     path[neighbor] = current_node
                     g_scores[neighbor] = tentative_g_score
-                    f_scores[neighbor] = tentative_g_score + find_f_score(positions, neighbor, goal)
+                    f_scores[neighbor] = tentative_g_score + h[neighbor]
                     
                     # Add to priority queue
-                    heapq.heappush(priority_queue, Node(
-                        neighbor, 
-                        g_scores[neighbor] + f_scores[neighbor],
-                        g_scores[neighbor],
-                        f_scores[neighbor]
-                    ))
+                    counter += 1
+                    heapq.heappush(priority_queue, (g_scores[neighbor] + f_scores[neighbor], counter, neighbor))
     
     # No path found
     return None
 
+def multi_goal_a_star(graph, positions, start, goals, heuristic, h=None):
+    # One A* search towards all goals: h is the distance to the nearest goal and the
+    # search stops when the first goal is popped, so the graph is expanded only once
+    goals = set(goals)
+    if h is None:
+        h = heuristic_table(positions, goals)
+
+    # path dictionary to track the explored paths
+    path = {start: None}
+
+    # to keep track of visited nodes
+    visited = set()
+
+    g_scores = {start: 0}
+
+    # Priority queue to hold nodes to explore, sorted by heuristic value
+    # Format: (g + f_score, counter, node); the counter keeps insertion order on ties
+    counter = 0
+    priority_queue = [(h[start], counter, start)]
+
+    while priority_queue:
+        _, _, current_node = heapq.heappop(priority_queue)
+
+        if current_node in goals:
+            return reconstruct_path(path, start, current_node)
+
+        if current_node in visited:
+            continue
+
+        visited.add(current_node)
+
+        # Explore neighbors (a dead end simply adds nothing)
+        for neighbor in graph[current_node]:
+            if neighbor in visited:
+                continue
+
+            tentative_g_score = g_scores[current_node] + heuristic[(current_node, neighbor)]
+
+            # If this path to neighbor is better than any previous one
+            if neighbor not in g_scores or tentative_g_score < g_scores[neighbor]:
+                path[neighbor] = current_node
+                g_scores[neighbor] = tentative_g_score
+                # Same ordering as a_star: g + f_score, with f_score = g + h
+                f_score = tentative_g_score + h[neighbor]
+                counter += 1
+                heapq.heappush(priority_queue, (tentative_g_score + f_score, counter, neighbor))
+
+    # No goal reachable
+    return None
+
 def reconstruct_path(path, start, goal):
     current = goal
     result_path = []
@@ -184,12 +227,20 @@ def visualise(paths, pos, edges):
 # }
 
 def main():
-    # Check if file path is provided as command line argument
-    if len(sys.argv) >= 2:
-        file_path = sys.argv[1]
-    else:
-        # Default file for testing
-        file_path = os.path.join("Data", "Modified_TSP", "test_13.txt")
+    parser = argparse.ArgumentParser(description='A* Search Algorithm')
+    # Default file for testing
+    parser.add_argument('file_path', nargs='?', default=os.path.join("Data", "Modified_TSP", "test_13.txt"),
+                        help='Path to the graph file (default: Data/Modified_TSP/test_13.txt)')
+    parser.add_argument('--landmarks', type=int, default=0, metavar='K',
+                        help='Use the ALT heuristic of K landmarks instead of the straight line distance, '
+                             'for graphs whose coordinates do not match the edge costs (default: 0, off)')
+    parser.add_argument('--landmark-cache', action='store_true',
+                        help=f'Keep the landmark distances in {DEFAULT_LANDMARK_CACHE_DIR} and reuse them '
+                             'for the same graph (default: recompute every run)')
+    parser.add_argument('--landmark-cache-dir', default=None,
+                        help='Same as --landmark-cache, with the cache in this directory')
+    args = parser.parse_args()
+    file_path = args.file_path
     
     # Parse the file
     nodes, edges, origin, destinations = parse_graph_file(file_path)
@@ -202,35 +253,30 @@ def main():
     for (start, end), weight in edges.items():
         G.add_edge(start, end, cost=float(weight))
     
-    result_paths = []
-    path_weights = []
-
-    for dest in destinations:
-        # print("Starting search from ", origin, " to ", dest)
-        weight = 0
-        result_path = a_star(G.graph, nodes, origin, dest, edges)
-        
-        if result_path[-1] != dest:
-            print("No path found")
-        else:
-            print(result_path)
-
-        for i in range(len(result_path)-1):
-            weight += edges[(result_path[i], result_path[i+1])]
-        
-        # print(f"Path weight: {weight}\n")
-        
-        path_weights.append(weight)
-        result_paths.append(result_path)
+    # Landmark distances only depend on the graph, so they can be cached across runs
+    h = None
+    if args.landmarks > 0:
+        cache_dir = args.landmark_cache_dir or (DEFAULT_LANDMARK_CACHE_DIR if args.landmark_cache else None)
+        h = landmark_heuristic_table(load_or_compute_landmarks(G, args.landmarks, cache_dir), destinations)
+    
+    # One search towards all destinations, ending at the first one reached
+    result_path = multi_goal_a_star(G.graph, nodes, origin, destinations, edges, h)
     
-    # Pick the shortest path
-    min_weight = min(path_weights)
-    min_index = path_weights.index(min_weight)
     # Print the results
     print(f"{file_path} AS")
-    print(f"{destinations} {len(nodes)}")
-    print(f"{result_paths[min_index]}")
-    print(f"{min_weight}")
+    if result_path is None:
+        print(f"{destinations} {len(nodes)}")
+        print("No path found")
+        print("0")
+        return
+    
+    weight = 0
+    for i in range(len(result_path)-1):
+        weight += edges[(result_path[i], result_path[i+1])]
+    
+    print(f"{result_path[-1]} {len(nodes)}")
+    print(f"{result_path}")
+    print(f"{weight}")
     
     # Optionally visualize
     # visualise(result_paths, nodes, edges)
@@ -1,6 +1,7 @@
 import matplotlib.pyplot as plt
 import numpy as np
 import heapq
+import math
 import re
 import sys, os
 
@@ -13,14 +14,7 @@ from parser import parse_graph_file
 aco_routing_dir = os.path.join(current_dir, "..", "Custom_Search", "aco_routing")
 sys.path.append(aco_routing_dir)
 from network import Network
-
-class Node:
-    def __init__(self, start, heuristic):
-        self.start = start
-        self.heuristic = heuristic
-
-    def __lt__(self,  other):
-        return self.heuristic < other.heuristic
+from heuristic_table import heuristic_table
 
 def find_heuristic(pos, current, goal):
     goal_x, goal_y = int(pos[goal][0]), int(pos[goal][1])
@@ -28,36 +22,40 @@ def find_heuristic(pos, current, goal):
 
     return math.sqrt((goal_x - current_x)**2 + (goal_y - current_y)**2)
 
-def find_next_node(graph, current, visited_list, pos, goal):
+def find_next_node(graph, current, visited_list, h):
+    # Format: (heuristic, counter, node); the counter keeps insertion order on ties
     heuristic_value = []
 
     if graph[current] == []:
         return "Dead end"
     else:
         # print("Current node:", current)
-        for i in graph[current]:
+        for counter, i in enumerate(graph[current]):
             if i not in visited_list:
-                heuristic = find_heuristic(pos, i, goal)
-                heapq.heappush(heuristic_value, Node(i, heuristic))
+                heapq.heappush(heuristic_value, (h[i], counter, i))
         
         if not heuristic_value:
             return "Loop"
         # print("Heuristic value:", heuristic_value)
-        return heapq.heappop(heuristic_value)
+        return heapq.heappop(heuristic_value)[2]
+
+# h: node -> estimated distance to the goal (default: heuristic_table of the goal)
+def GBFS_search(graph, positions, start, goal, heuristic, h=None):
+    if h is None:
+        h = heuristic_table(positions, [goal])
 
-def GBFS_search(graph, start, goal, heuristic):
     # path dictionary to track the explored paths
     path = {start:None}
 
     visited = set() # to keep track of visited nodes
 
     # Priority queue to hold nodes to explore, sorted by heuristic value
-    priority_queue = []
-    first = Node(start, 0)
-    heapq.heappush(priority_queue, first)
+    # Format: (heuristic, counter, node); the counter keeps insertion order on ties
+    counter = 0
+    priority_queue = [(0, counter, start)]
 
     while priority_queue:
-        current_node = heapq.heappop(priority_queue).start
+        _, _, current_node = heapq.heappop(priority_queue)
         
         visited.add(current_node)
 
@@ -66,27 +64,33 @@ def GBFS_search(graph, start, goal, heuristic):
             return reconstruct_path(path, start, goal)
 
         # find next node
-        next_node = find_next_node(graph, current_node, visited, pos, goal)
+        next_node = find_next_node(graph, current_node, visited, h)
+        if next_node in ("Dead end", "Loop") and path[current_node] is None:
+            # Back at the start with nothing left to explore: the goal is unreachable
+            return None
         if next_node == "Dead end":
             print("Dead end at node ", current_node)
             # Go back to the previous node
             # and check for other paths
-            heapq.heappush(priority_queue, Node(path[current_node], find_heuristic(pos, path[current_node], goal)))
+            counter += 1
+            heapq.heappush(priority_queue, (h[path[current_node]], counter, path[current_node]))
         elif next_node == "Loop":
             count = 0
             print("Loop at node ", current_node)
             # Go back to the previous node
             # and check for other paths
-            heapq.heappush(priority_queue, Node(path[current_node], find_heuristic(pos, path[current_node], goal)))
+            counter += 1
+            heapq.heappush(priority_queue, (h[path[current_node]], counter, path[current_node]))
             if count == 5:
                 print("Loop detected at node ", current_node)
                 return reconstruct_path(path, start, current_node)
             count += 1
         else:
-            heapq.heappush(priority_queue, next_node)
+            counter += 1
+            heapq.heappush(priority_queue, (h[next_node], counter, next_node))
 
-            if next_node.start not in path:
-                path[next_node.start] = current_node
+            if next_node not in path:
+                path[next_node] = current_node
         
     return None
 
@@ -184,11 +188,11 @@ def main():
     for dest in destinations:
         # print("Starting search from ", origin, " to ", dest)
         weight = 0
-        result_path = GBFS_search(G.graph, origin, dest, edges)
-        if result_path[-1] != dest:
+        result_path = GBFS_search(G.graph, nodes, origin, dest, edges)
+        if result_path is None or result_path[-1] != dest:
             print("Path not found")
-        else:
-            print(result_path)
+            continue
+        print(result_path)
 
         for i in range(len(result_path)-1):
             weight += edges[(result_path[i], result_path[i+1])]
@@ -0,0 +1,23 @@
+import numpy as np
+
+# Number of (node, goal) distances computed per numpy step, to bound memory with many goals
+CHUNK_SIZE = 1 << 20
+
+# straight line distance from every node to its nearest goal, computed once with numpy
+# pos: node -> (x, y) as returned by parse_graph_file; coordinates are truncated to int
+# like find_f_score / find_heuristic do
+# returns a dict node -> distance, so the search loops do a single lookup per neighbor
+def heuristic_table(pos, goals):
+    nodes = list(pos.keys())
+    coords = np.array([[int(pos[node][0]), int(pos[node][1])] for node in nodes], dtype=float).reshape(-1, 2)
+    goal_coords = np.array([[int(pos[goal][0]), int(pos[goal][1])] for goal in goals if goal in pos],
+                           dtype=float).reshape(-1, 2)
+
+    distances = np.zeros(len(nodes))
+    if len(goal_coords) > 0:
+        rows = max(1, CHUNK_SIZE // len(goal_coords))
+        for start in range(0, len(nodes), rows):
+            diff = coords[start:start + rows, None, :] - goal_coords[None, :, :]
+            distances[start:start + rows] = np.sqrt((diff ** 2).sum(axis=2)).min(axis=1)
+
+    return dict(zip(nodes, distances.tolist()))
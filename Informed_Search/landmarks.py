@@ -0,0 +1,161 @@
+import heapq
+import math
+import tempfile
+import numpy as np
+import sys, os
+
+# Import the graph hash of the all-pairs cache from custom search directory
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(current_dir, "..", "Custom_Search"))
+from aco_routing.apsp_cache import graph_fingerprint
+
+# Location of the on-disk landmark distances when the cache is turned on, next to the all-pairs cache
+DEFAULT_LANDMARK_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "cos30019", "landmarks")
+
+# Number of landmarks used when none is given
+DEFAULT_LANDMARK_COUNT = 8
+
+# ALT heuristic: precompute the distances from and to a few landmark nodes, then bound
+# d(v, goal) from below with the triangle inequality. Unlike the straight line distance
+# this only depends on the edge costs, so it stays admissible when the coordinates are
+# random or all the same.
+
+# distances from source to every node (dict node -> cost), following edges forwards
+# graph: node -> list of neighbors, costs: (u, v) -> cost
+def dijkstra_distances(graph, costs, source):
+    dist = {source: 0.0}
+    settled = set()
+    heap = [(0.0, source)]
+
+    while heap:
+        d, u = heapq.heappop(heap)
+        if u in settled:
+            continue
+        settled.add(u)
+
+        for v in graph[u]:
+            new_dist = d + costs[(u, v)]
+            if new_dist < dist.get(v, math.inf):
+                dist[v] = new_dist
+                heapq.heappush(heap, (new_dist, v))
+
+    return dist
+
+# the same graph with every edge turned around, for the distances to a node
+def reverse_graph(graph, costs):
+    reverse = {node: [] for node in graph}
+    reverse_costs = {}
+    for u in graph:
+        for v in graph[u]:
+            reverse[v].append(u)
+            reverse_costs[(v, u)] = costs[(u, v)]
+    return reverse, reverse_costs
+
+# distance rows of the given sources as an array, in the order of nodes (inf if unreachable)
+def distance_rows(graph, costs, sources, nodes):
+    rows = np.full((len(sources), len(nodes)), np.inf)
+    index = {node: i for i, node in enumerate(nodes)}
+    for row, source in enumerate(sources):
+        for node, d in dijkstra_distances(graph, costs, source).items():
+            rows[row, index[node]] = d
+    return rows
+
+# farthest landmark selection: each new landmark is the node farthest (in either direction)
+# from the landmarks chosen so far; nodes they cannot reach at all are only taken once no
+# reachable one is left, since an isolated node bounds nothing
+# returns the landmarks and their rows of distances from / to every node
+def select_landmarks(graph, costs, k):
+    nodes = list(graph.keys())
+    reverse, reverse_costs = reverse_graph(graph, costs)
+    k = min(k, len(nodes))
+
+    landmarks = []
+    from_landmarks = np.empty((0, len(nodes)))
+    to_landmarks = np.empty((0, len(nodes)))
+
+    # start from the node farthest from the first one
+    nearest = np.minimum(distance_rows(graph, costs, nodes[:1], nodes),
+                         distance_rows(reverse, reverse_costs, nodes[:1], nodes))[0]
+    for _ in range(k):
+        candidates = np.where(np.isinf(nearest), -0.5, nearest)
+        candidates[[nodes.index(landmark) for landmark in landmarks]] = -1
+        landmark = nodes[int(np.argmax(candidates))]
+        landmarks.append(landmark)
+
+        from_row = distance_rows(graph, costs, [landmark], nodes)
+        to_row = distance_rows(reverse, reverse_costs, [landmark], nodes)
+        from_landmarks = np.vstack([from_landmarks, from_row])
+        to_landmarks = np.vstack([to_landmarks, to_row])
+
+        if len(landmarks) == 1:
+            nearest = np.minimum(from_row, to_row)[0]
+        else:
+            nearest = np.minimum(nearest, np.minimum(from_row, to_row)[0])
+
+    return landmarks, from_landmarks, to_landmarks
+
+def _cache_path(cache_dir, G, k):
+    return os.path.join(cache_dir, f"{graph_fingerprint(G)}_k{k}.npz")
+
+# landmarks of a Network (edge attribute "cost"), read from the cache when the same graph
+# was seen before, else computed and stored; without a cache_dir nothing is read or written
+# returns (nodes, landmarks, from_landmarks, to_landmarks), rows in the order of nodes
+def load_or_compute_landmarks(G, k=DEFAULT_LANDMARK_COUNT, cache_dir=None):
+    nodes = list(G.nodes())
+
+    if cache_dir is not None:
+        path = _cache_path(cache_dir, G, k)
+        if os.path.exists(path):
+            try:
+                with np.load(path) as data:
+                    landmarks = [nodes[i] for i in data["landmarks"]]
+                    from_landmarks, to_landmarks = data["from_landmarks"], data["to_landmarks"]
+                if from_landmarks.shape == to_landmarks.shape == (len(landmarks), len(nodes)):
+                    return nodes, landmarks, from_landmarks, to_landmarks
+            except (OSError, ValueError, KeyError, IndexError):
+                # Truncated or foreign file: computed again and rewritten below
+                pass
+
+    costs = {edge: data.get("cost", math.inf) for edge, data in G.edges.items()}
+    landmarks, from_landmarks, to_landmarks = select_landmarks(G.graph, costs, k)
+
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".npz.tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                np.savez(tmp_file, landmarks=np.array([nodes.index(l) for l in landmarks], dtype=np.int32),
+                         from_landmarks=from_landmarks, to_landmarks=to_landmarks)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    return nodes, landmarks, from_landmarks, to_landmarks
+
+# lower bound on the distance from every node to its nearest goal, by the triangle inequality
+# with each landmark L: d(v, g) >= d(v, L) - d(g, L) and d(v, g) >= d(L, g) - d(L, v)
+# inf means the goals cannot be reached from that node; without any known goal the bound is 0
+# returns a dict node -> bound, like heuristic_table, to be passed as h to the searches
+# reverse: bound the distance from the nearest of goals to every node instead (the backward
+# heuristic of a bidirectional search, with goals = [start]); same bounds with the roles
+# of the distances from and to the landmarks swapped
+def landmark_heuristic_table(landmark_data, goals, reverse=False):
+    nodes, _, from_landmarks, to_landmarks = landmark_data
+    if reverse:
+        from_landmarks, to_landmarks = to_landmarks, from_landmarks
+    index = {node: i for i, node in enumerate(nodes)}
+
+    goal_indices = [index[goal] for goal in goals if goal in index]
+    bound = np.full(len(nodes), np.inf if goal_indices else 0.0)
+    with np.errstate(invalid="ignore"):
+        for g in goal_indices:
+            # fmax keeps one direction when the other is inf - inf (nan)
+            to_goal = np.fmax(to_landmarks - to_landmarks[:, g:g + 1],
+                              from_landmarks[:, g:g + 1] - from_landmarks)
+            # inf - inf both ways: that landmark says nothing about the node
+            to_goal = np.where(np.isnan(to_goal), 0.0, to_goal)
+            bound = np.minimum(bound, np.maximum(to_goal.max(axis=0, initial=0.0), 0.0))
+
+    return dict(zip(nodes, bound.tolist()))
@@ -0,0 +1,541 @@
+import os
+import sys
+import time
+import random
+import argparse
+import contextlib
+import tracemalloc
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+# Import the parse_graph_file function from data_reader module
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(current_dir, "..", "data_reader"))
+from parser import parse_graph_file
+
+# Import the search networks
+sys.path.append(os.path.join(current_dir, "..", "Uninformed_Search", "entity"))
+sys.path.append(os.path.join(current_dir, "..", "Custom_Search", "Dijkstras_Algorithm", "entity"))
+from BfsNetwork import BfsNetwork
+from DfsNetwork import DfsNetwork
+from DijkstraNetwork import DijkstraNetwork
+
+# Import the CSR graph backend
+sys.path.append(os.path.join(current_dir, "..", "Custom_Search", "aco_routing"))
+from csr_graph import CSRGraph
+
+# Import the ACO components
+sys.path.append(os.path.join(current_dir, "..", "Custom_Search"))
+from aco_routing.aco import ACO
+from aco_routing.islands import IslandModel
+from aco_routing.bidirectional import BidirectionalSearch
+from aco_routing.network import Network
+from aco_routing.floyd_warshall import FloydWarshall, BlockedFloydWarshall
+
+# Import the informed searches
+sys.path.append(os.path.join(current_dir, "..", "Informed_Search"))
+from A_Star import multi_goal_a_star, find_f_score
+from GBFS import GBFS_search
+from heuristic_table import heuristic_table
+from landmarks import landmark_heuristic_table, load_or_compute_landmarks
+
+
+def measure(func, *args, **kwargs):
+    """
+    Run func once and measure its wall-clock time and peak traced memory.
+
+    Returns:
+        tuple: (result, execution_time_seconds, peak_memory_bytes)
+    """
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    result = func(*args, **kwargs)
+    execution_time = time.perf_counter() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, execution_time, peak
+
+
+def benchmark_frontier(args):
+    """
+    Measure time and peak frontier memory of BFS, DFS and Dijkstra on one graph file.
+    """
+    nodes, edges, origin, destinations = parse_graph_file(args.file_path)
+    goal = args.goal if args.goal else sorted(destinations)[0]
+
+    print(f"{args.file_path}: {len(nodes)} nodes, {len(edges)} edges, {origin} -> {goal}")
+    print(f"{'Algorithm':<10} {'Time (s)':>10} {'Peak (MB)':>10} {'Cost':>8} {'Path length':>12}")
+
+    for name, network_class in [("BFS", BfsNetwork), ("DFS", DfsNetwork), ("CUS1", DijkstraNetwork)]:
+        network = network_class().build_from_data(nodes, edges)
+        (path, cost), execution_time, peak = measure(network.find_path, origin, goal)
+        print(f"{name:<10} {execution_time:>10.4f} {peak / 1e6:>10.2f} {cost:>8} {len(path):>12}")
+
+
+def benchmark_csr(args):
+    """
+    Compare the dict-of-lists Network searches with the same searches on a CSRGraph.
+    """
+    nodes, edges, origin, destinations = parse_graph_file(args.file_path)
+    goal = args.goal if args.goal else sorted(destinations)[0]
+
+    start_time = time.perf_counter()
+    csr = CSRGraph.from_data(nodes, edges)
+    build_time = time.perf_counter() - start_time
+    print(f"{args.file_path}: {len(nodes)} nodes, {len(edges)} edges, {origin} -> {goal}")
+    print(f"CSR build time: {build_time:.4f}s")
+    print(f"{'Algorithm':<10} {'Network (s)':>12} {'CSR (s)':>10} {'Cost':>8} {'CSR cost':>9}")
+
+    searches = [
+        ("BFS", BfsNetwork, csr.bfs_path),
+        ("DFS", DfsNetwork, csr.dfs_path),
+        ("CUS1", DijkstraNetwork, csr.dijkstra),
+    ]
+    for name, network_class, csr_search in searches:
+        network = network_class().build_from_data(nodes, edges)
+        start_time = time.perf_counter()
+        _, cost = network.find_path(origin, goal)
+        network_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        _, csr_cost = csr_search(origin, goal)
+        csr_time = time.perf_counter() - start_time
+        print(f"{name:<10} {network_time:>12.4f} {csr_time:>10.4f} {cost:>8} {csr_cost:>9}")
+
+    start_time = time.perf_counter()
+    _, csr_cost = csr.a_star(origin, goal)
+    csr_time = time.perf_counter() - start_time
+    print(f"{'AS':<10} {'-':>12} {csr_time:>10.4f} {'-':>8} {csr_cost:>9}")
+
+
+def random_network(node_count, out_degree, seed=0):
+    """
+    Build a random directed Network with integer costs, for size sweeps.
+    """
+    rng = random.Random(seed)
+    G = Network()
+    G.graph = {str(i): [] for i in range(1, node_count + 1)}
+    for i in range(1, node_count + 1):
+        for j in rng.sample(range(1, node_count + 1), min(out_degree, node_count)):
+            if i != j:
+                G.add_edge(str(i), str(j), cost=float(rng.randint(1, 100)))
+    return G
+
+
+def benchmark_floyd(args):
+    """
+    Compare the plain and the blocked Floyd-Warshall on random graphs of increasing size.
+    """
+    print(f"{'Nodes':>6} {'Dense (s)':>10} {'Blocked (s)':>12} {'Speed-up':>9} {'Equal':>6}")
+
+    for node_count in args.sizes:
+        G = random_network(node_count, args.degree)
+
+        dense = FloydWarshall(G)
+        start_time = time.perf_counter()
+        dense.run()
+        dense_time = time.perf_counter() - start_time
+
+        blocked = BlockedFloydWarshall(G, block_size=args.block_size, num_threads=args.threads)
+        start_time = time.perf_counter()
+        blocked.run()
+        blocked_time = time.perf_counter() - start_time
+
+        equal = bool((dense.dist_matrix == blocked.dist_matrix).all())
+        print(f"{node_count:>6} {dense_time:>10.3f} {blocked_time:>12.3f} {dense_time / blocked_time:>9.2f} {str(equal):>6}")
+
+
+def load_aco_network(file_path):
+    """
+    Build the ACO Network ("cost" edges) of a graph file.
+    """
+    nodes, edges, origin, destinations = parse_graph_file(file_path)
+    G = Network()
+    G.graph = {node: [] for node in nodes}
+    G.pos = nodes
+    for (start, end), weight in edges.items():
+        G.add_edge(start, end, cost=float(weight))
+    return G, origin, destinations
+
+
+def benchmark_ants(args):
+    """
+    Ant throughput (ants/sec) of one TSP iteration with the thread pool, the process pool
+    and the vectorized colony.
+    """
+    G, origin, _ = load_aco_network(args.file_path)
+    print(f"{args.file_path}: {G.number_of_nodes()} nodes, {G.number_of_edges()} edges, {args.ants} ants")
+    print(f"{'Executor':<10} {'Workers':>8} {'Time (s)':>10} {'Ants/sec':>10} {'Best cost':>10}")
+
+    runs = [("thread", workers) for workers in args.workers] + [("process", workers) for workers in args.workers]
+    runs.append(("vectorized", 1))
+    for executor, workers in runs:
+        random.seed(0)
+        aco = ACO(G, ant_max_steps=G.number_of_nodes() + 1, num_iterations=1, alpha=1, beta=2, mode=2,
+                  use_local_search=False, num_threads=workers, ant_executor=executor, num_processes=workers)
+        start_time = time.perf_counter()
+        _, cost = aco.find_shortest_path(origin, list(G.nodes()), num_ants=args.ants)
+        execution_time = time.perf_counter() - start_time
+        print(f"{executor:<10} {workers:>8} {execution_time:>10.3f} {args.ants / execution_time:>10.2f} {cost:>10}")
+
+
+def benchmark_candidates(args):
+    """
+    TSP run time and tour cost with and without nearest-neighbor candidate lists.
+    """
+    G, origin, _ = load_aco_network(args.file_path)
+    print(f"{args.file_path}: {G.number_of_nodes()} nodes, {G.number_of_edges()} edges, "
+          f"{args.ants} ants x {args.iterations} iterations")
+    print(f"{'Executor':<10} {'k':>5} {'Time (s)':>10} {'Best cost':>10}")
+
+    for executor in args.executors:
+        for k in args.sizes:
+            random.seed(0)
+            aco = ACO(G, ant_max_steps=G.number_of_nodes() + 1, num_iterations=args.iterations, alpha=1, beta=2,
+                      mode=2, use_local_search=False, num_threads=1, ant_executor=executor,
+                      candidate_list_size=k)
+            start_time = time.perf_counter()
+            _, cost = aco.find_shortest_path(origin, list(G.nodes()), num_ants=args.ants)
+            execution_time = time.perf_counter() - start_time
+            print(f"{executor:<10} {k if k else 'all':>5} {execution_time:>10.3f} {cost:>10}")
+
+
+# (label, local searches, target) of the localsearch benchmark; None runs without local search
+LOCAL_SEARCH_CONFIGS = [
+    ("none", None, "best"),
+    ("2opt/best", ["2opt"], "best"),
+    ("2opt/iteration", ["2opt"], "iteration"),
+    ("2opt+oropt/both", ["2opt", "oropt"], "both"),
+    ("2opt+oropt+3opt/both", ["2opt", "oropt", "3opt"], "both"),
+]
+
+
+def benchmark_local_search(args):
+    """
+    TSP tour cost and run time of ACO with different local searches, applied to the global
+    best path, the iteration-best ant or both, every iteration.
+    """
+    G, origin, _ = load_aco_network(args.file_path)
+    print(f"{args.file_path}: {G.number_of_nodes()} nodes, {G.number_of_edges()} edges, "
+          f"{args.ants} ants x {args.iterations} iterations")
+    print(f"{'Local search':<22} {'Time (s)':>10} {'Best cost':>10}")
+
+    for label, searches, target in LOCAL_SEARCH_CONFIGS:
+        random.seed(0)
+        aco = ACO(G, ant_max_steps=G.number_of_nodes() + 1, num_iterations=args.iterations, alpha=1, beta=2,
+                  mode=2, use_local_search=searches is not None, local_search_frequency=1,
+                  local_search=searches or [], local_search_target=target, num_threads=1,
+                  candidate_list_size=10)
+        start_time = time.perf_counter()
+        _, cost = aco.find_shortest_path(origin, list(G.nodes()), num_ants=args.ants)
+        execution_time = time.perf_counter() - start_time
+        print(f"{label:<22} {execution_time:>10.3f} {cost:>10.1f}")
+
+
+def benchmark_islands(args):
+    """
+    TSP tour cost and wall-clock time of the island model with an increasing number of colonies.
+    """
+    G, origin, _ = load_aco_network(args.file_path)
+    print(f"{args.file_path}: {G.number_of_nodes()} nodes, {G.number_of_edges()} edges, "
+          f"{args.ants} ants x {args.iterations} iterations per island, migration every {args.interval}")
+    print(f"{'Islands':>8} {'Time (s)':>10} {'Best cost':>10}")
+
+    for num_islands in args.islands:
+        model = IslandModel(G, num_islands=num_islands, migration_interval=args.interval, seed=0,
+                            ant_max_steps=G.number_of_nodes() + 1, num_iterations=args.iterations, alpha=1, beta=2,
+                            mode=2, ant_executor="vectorized", candidate_list_size=10)
+        start_time = time.perf_counter()
+        _, cost = model.find_shortest_path(origin, list(G.nodes()), num_ants=args.ants)
+        execution_time = time.perf_counter() - start_time
+        print(f"{num_islands:>8} {execution_time:>10.3f} {cost:>10.1f}")
+
+
+class OnTheFlyHeuristic:
+    """
+    Heuristic mapping that computes the straight line distance to the nearest goal on every
+    lookup, the way the informed searches did before the heuristic table.
+    """
+
+    def __init__(self, pos, goals):
+        self.pos = pos
+        self.goals = list(goals)
+
+    def __getitem__(self, node):
+        return min(find_f_score(self.pos, node, goal) for goal in self.goals)
+
+
+class ExpansionCounter(dict):
+    """
+    Adjacency dict that records which nodes had their neighbors read, i.e. were expanded.
+    """
+
+    def __init__(self, graph):
+        super().__init__(graph)
+        self.expanded = set()
+
+    def __getitem__(self, node):
+        self.expanded.add(node)
+        return super().__getitem__(node)
+
+
+def expansion_rate(search, adjacency, origins):
+    """
+    Run search(graph, origin) from every origin on an ExpansionCounter of adjacency.
+
+    Returns:
+        tuple: (total expansions, expansions per second)
+    """
+    expansions = 0
+    start_time = time.perf_counter()
+    # GBFS prints every dead end it backs out of
+    with contextlib.redirect_stdout(None):
+        for origin in origins:
+            graph = ExpansionCounter(adjacency)
+            search(graph, origin)
+            expansions += len(graph.expanded)
+    execution_time = time.perf_counter() - start_time
+    return expansions, expansions / execution_time
+
+
+def benchmark_heuristic(args):
+    """
+    Expansions per second of A* and GBFS with the heuristic computed on every neighbor lookup
+    against the heuristic table computed once per goal set, over searches from many origins.
+    """
+    nodes, edges, _, destinations = parse_graph_file(args.file_path)
+    G = Network()
+    G.graph = {node: [] for node in nodes}
+    for (start, end), weight in edges.items():
+        G.add_edge(start, end, cost=float(weight))
+
+    rng = random.Random(0)
+    goal_pool = [node for node in sorted(destinations) if node in nodes]
+    goal_pool += rng.sample([node for node in nodes if node not in goal_pool], min(max(args.goals), len(nodes)))
+    origins = rng.sample(list(nodes), min(args.origins, len(nodes)))
+
+    print(f"{args.file_path}: {len(nodes)} nodes, {len(edges)} edges, {len(origins)} origins")
+    print(f"{'Algorithm':<10} {'Goals':>6} {'Table (ms)':>11} {'Expanded':>9} "
+          f"{'Before (exp/s)':>15} {'After (exp/s)':>14} {'Speedup':>8}")
+
+    for goal_count in args.goals:
+        goals = goal_pool[:goal_count]
+        start_time = time.perf_counter()
+        table = heuristic_table(nodes, goals)
+        table_time = time.perf_counter() - start_time
+
+        searches = [("AS", lambda graph, origin, h: multi_goal_a_star(graph, nodes, origin, goals, edges, h))]
+        if goal_count == 1:
+            searches.append(("GBFS", lambda graph, origin, h: GBFS_search(graph, nodes, origin, goals[0], edges, h)))
+
+        for name, search in searches:
+            expanded, before = expansion_rate(
+                lambda graph, origin: search(graph, origin, OnTheFlyHeuristic(nodes, goals)), G.graph, origins)
+            _, after = expansion_rate(lambda graph, origin: search(graph, origin, table), G.graph, origins)
+            print(f"{name:<10} {goal_count:>6} {table_time * 1000:>11.2f} {expanded:>9} "
+                  f"{before:>15.0f} {after:>14.0f} {after / before:>7.1f}x")
+
+
+def path_cost(edges, path):
+    """
+    Sum of the edge costs along path, inf for no path.
+    """
+    if path is None:
+        return float('inf')
+    return sum(edges[(path[i], path[i + 1])] for i in range(len(path) - 1))
+
+
+def benchmark_landmarks(args):
+    """
+    A* with no heuristic, the straight line distance and the ALT (landmark) heuristic:
+    expansions and total path cost over random origin/goal pairs.
+    """
+    nodes, edges, _, _ = parse_graph_file(args.file_path)
+    G = Network()
+    G.graph = {node: [] for node in nodes}
+    for (start, end), weight in edges.items():
+        G.add_edge(start, end, cost=float(weight))
+
+    rng = random.Random(0)
+    node_list = list(G.nodes())
+    pairs = [tuple(rng.sample(node_list, 2)) for _ in range(args.pairs)]
+
+    heuristics = [("none", 0.0, lambda goal: dict.fromkeys(node_list, 0.0))]
+    if len(nodes) == len(node_list):
+        heuristics.append(("straight line", 0.0, lambda goal: heuristic_table(nodes, [goal])))
+    for k in args.landmarks:
+        start_time = time.perf_counter()
+        landmark_data = load_or_compute_landmarks(G, k, cache_dir=None)
+        setup_time = time.perf_counter() - start_time
+        heuristics.append((f"ALT k={k}", setup_time,
+                           lambda goal, landmark_data=landmark_data: landmark_heuristic_table(landmark_data, [goal])))
+
+    print(f"{args.file_path}: {len(node_list)} nodes, {len(edges)} edges, {len(pairs)} origin/goal pairs")
+    print(f"{'Heuristic':<14} {'Setup (s)':>10} {'Search (s)':>11} {'Expanded':>9} {'Found':>6} {'Total cost':>11}")
+
+    for name, setup_time, table in heuristics:
+        tables = {goal: table(goal) for _, goal in pairs}
+        expanded = 0
+        found = 0
+        total_cost = 0.0
+        start_time = time.perf_counter()
+        for origin, goal in pairs:
+            graph = ExpansionCounter(G.graph)
+            path = multi_goal_a_star(graph, nodes, origin, [goal], edges, tables[goal])
+            expanded += len(graph.expanded)
+            cost = path_cost(edges, path)
+            if path is not None and path[-1] == goal:
+                found += 1
+                total_cost += cost
+        search_time = time.perf_counter() - start_time
+        print(f"{name:<14} {setup_time:>10.3f} {search_time:>11.3f} {expanded:>9} {found:>6} {total_cost:>11.0f}")
+
+
+def benchmark_bidirectional(args):
+    """
+    Settled nodes and time of unidirectional against bidirectional Dijkstra and A* (ALT
+    potentials) over random origin/goal pairs, checking that both find the same costs.
+    """
+    print(f"{'Graph':<10} {'Algorithm':<10} {'Uni settled':>12} {'Bi settled':>11} {'Reduction':>10} "
+          f"{'Uni (s)':>8} {'Bi (s)':>8} {'Mismatches':>11}")
+
+    for file_path in args.file_paths:
+        nodes, edges, _, _ = parse_graph_file(file_path)
+        G = Network()
+        G.graph = {node: [] for node in nodes}
+        for (start, end), weight in edges.items():
+            G.add_edge(start, end, cost=float(weight))
+
+        # The reverse adjacency is built once, outside the timed queries
+        engine = BidirectionalSearch(G, weight_key="cost")
+        landmark_data = load_or_compute_landmarks(G, args.landmarks, cache_dir=None)
+        rng = random.Random(0)
+        node_list = list(G.nodes())
+        pairs = [tuple(rng.sample(node_list, 2)) for _ in range(args.pairs)]
+        potentials = {(origin, goal): (landmark_heuristic_table(landmark_data, [goal]),
+                                       landmark_heuristic_table(landmark_data, [origin], reverse=True))
+                      for origin, goal in pairs}
+
+        searches = [
+            ("Dijkstra", lambda origin, goal, bidirectional: engine.dijkstra(origin, goal, bidirectional)),
+            (f"A* ALT{args.landmarks}", lambda origin, goal, bidirectional: engine.a_star(
+                origin, goal, *potentials[(origin, goal)], bidirectional=bidirectional)),
+        ]
+        for name, search in searches:
+            settled = {}
+            costs = {}
+            times = {}
+            for bidirectional in (False, True):
+                settled[bidirectional] = 0
+                costs[bidirectional] = []
+                start_time = time.perf_counter()
+                for origin, goal in pairs:
+                    _, cost = search(origin, goal, bidirectional)
+                    settled[bidirectional] += engine.num_settled
+                    costs[bidirectional].append(cost)
+                times[bidirectional] = time.perf_counter() - start_time
+
+            mismatches = sum(1 for uni, bi in zip(costs[False], costs[True]) if abs(uni - bi) > 1e-9)
+            reduction = 1 - settled[True] / settled[False] if settled[False] else 0.0
+            print(f"{Path(file_path).stem:<10} {name:<10} {settled[False]:>12} {settled[True]:>11} {reduction:>9.0%} "
+                  f"{times[False]:>8.3f} {times[True]:>8.3f} {mismatches:>11}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Performance benchmarks for the search algorithms')
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    frontier_parser = subparsers.add_parser('frontier', help='Time and peak memory of BFS, DFS and Dijkstra')
+    frontier_parser.add_argument('file_path', nargs='?', default=str(project_root / "Data" / "TSP" / "benchmark_2.txt"),
+                                 help='Path to the graph file (default: Data/TSP/benchmark_2.txt)')
+    frontier_parser.add_argument('--goal', default=None, help='Goal node (default: first destination in the file)')
+    frontier_parser.set_defaults(func=benchmark_frontier)
+
+    csr_parser = subparsers.add_parser('csr', help='Network searches against the same searches on a CSRGraph')
+    csr_parser.add_argument('file_path', nargs='?', default=str(project_root / "Data" / "TSP" / "benchmark_2.txt"),
+                            help='Path to the graph file (default: Data/TSP/benchmark_2.txt)')
+    csr_parser.add_argument('--goal', default=None, help='Goal node (default: first destination in the file)')
+    csr_parser.set_defaults(func=benchmark_csr)
+
+    floyd_parser = subparsers.add_parser('floyd', help='Plain against blocked Floyd-Warshall on increasing n')
+    floyd_parser.add_argument('--sizes', type=int, nargs='+', default=[250, 500, 1000, 2000],
+                              help='Node counts to test (default: 250 500 1000 2000)')
+    floyd_parser.add_argument('--degree', type=int, default=3, help='Out-degree of the random graphs (default: 3)')
+    floyd_parser.add_argument('--block-size', type=int, default=128, help='Tile size of the blocked version (default: 128)')
+    floyd_parser.add_argument('--threads', type=int, default=None, help='Threads for the blocked version (default: CPU count)')
+    floyd_parser.set_defaults(func=benchmark_floyd)
+
+    ants_parser = subparsers.add_parser('ants', help='ACO ant throughput with thread/process pools and the vectorized colony')
+    ants_parser.add_argument('file_path', nargs='?', default=str(project_root / "Data" / "TSP" / "benchmark_2.txt"),
+                             help='Path to the graph file (default: Data/TSP/benchmark_2.txt)')
+    ants_parser.add_argument('--ants', type=int, default=32, help='Number of ants (default: 32)')
+    ants_parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4],
+                             help='Worker counts to test (default: 1 2 4)')
+    ants_parser.set_defaults(func=benchmark_ants)
+
+    candidates_parser = subparsers.add_parser('candidates', help='ACO TSP with and without candidate lists')
+    candidates_parser.add_argument('file_path', nargs='?', default=str(project_root / "Data" / "TSP" / "benchmark_2.txt"),
+                                   help='Path to the graph file (default: Data/TSP/benchmark_2.txt)')
+    candidates_parser.add_argument('--sizes', type=int, nargs='+', default=[0, 10, 20],
+                                   help='Candidate list sizes to test, 0 for the full neighborhood (default: 0 10 20)')
+    candidates_parser.add_argument('--ants', type=int, default=20, help='Number of ants (default: 20)')
+    candidates_parser.add_argument('--iterations', type=int, default=5, help='Number of iterations (default: 5)')
+    candidates_parser.add_argument('--executors', nargs='+', default=["thread", "vectorized"],
+                                   help='Ant executors to test (default: thread vectorized)')
+    candidates_parser.set_defaults(func=benchmark_candidates)
+
+    local_search_parser = subparsers.add_parser('localsearch', help='ACO TSP with 2-opt, Or-opt and 3-opt local search')
+    local_search_parser.add_argument('file_path', nargs='?', default=str(project_root / "Data" / "TSP" / "benchmark_3.txt"),
+                                     help='Path to the graph file (default: Data/TSP/benchmark_3.txt)')
+    local_search_parser.add_argument('--ants', type=int, default=10, help='Number of ants (default: 10)')
+    local_search_parser.add_argument('--iterations', type=int, default=10, help='Number of iterations (default: 10)')
+    local_search_parser.set_defaults(func=benchmark_local_search)
+
+    islands_parser = subparsers.add_parser('islands', help='ACO TSP with independent colonies exchanging best tours')
+    islands_parser.add_argument('file_path', nargs='?', default=str(project_root / "Data" / "TSP" / "benchmark_3.txt"),
+                                help='Path to the graph file (default: Data/TSP/benchmark_3.txt)')
+    islands_parser.add_argument('--islands', type=int, nargs='+', default=[1, 2, 4],
+                                help='Island counts to test (default: 1 2 4)')
+    islands_parser.add_argument('--ants', type=int, default=10, help='Number of ants per island (default: 10)')
+    islands_parser.add_argument('--iterations', type=int, default=40, help='Number of iterations (default: 40)')
+    islands_parser.add_argument('--interval', type=int, default=5, help='Iterations between migrations (default: 5)')
+    islands_parser.set_defaults(func=benchmark_islands)
+
+    heuristic_parser = subparsers.add_parser('heuristic', help='A* and GBFS expansions/s with and without the heuristic table')
+    heuristic_parser.add_argument('file_path', nargs='?', default=str(project_root / "Data" / "Modified_TSP" / "test_29.txt"),
+                                  help='Path to the graph file (default: Data/Modified_TSP/test_29.txt)')
+    heuristic_parser.add_argument('--goals', type=int, nargs='+', default=[1, 10, 100],
+                                  help='Goal set sizes: the destinations of the file, then random nodes (default: 1 10 100)')
+    heuristic_parser.add_argument('--origins', type=int, default=100,
+                                  help='Number of random origins searched from (default: 100)')
+    heuristic_parser.set_defaults(func=benchmark_heuristic)
+
+    landmarks_parser = subparsers.add_parser('landmarks', help='A* with no, straight line and ALT landmark heuristics')
+    landmarks_parser.add_argument('file_path', nargs='?', default=str(project_root / "Data" / "Modified_TSP" / "test_29.txt"),
+                                  help='Path to the graph file (default: Data/Modified_TSP/test_29.txt)')
+    landmarks_parser.add_argument('--landmarks', type=int, nargs='+', default=[4, 8, 16],
+                                  help='Landmark counts to test (default: 4 8 16)')
+    landmarks_parser.add_argument('--pairs', type=int, default=200,
+                                  help='Number of random origin/goal pairs (default: 200)')
+    landmarks_parser.set_defaults(func=benchmark_landmarks)
+
+    bidirectional_parser = subparsers.add_parser('bidirectional',
+                                                 help='Settled nodes of unidirectional against bidirectional Dijkstra and A*')
+    bidirectional_parser.add_argument('file_paths', nargs='*', default=[str(project_root / "Data" / "Modified_TSP" / f"test_{i}.txt")
+                                                                        for i in (27, 28, 29)],
+                                      help='Graph files (default: the large converted graphs Data/Modified_TSP/test_27..29.txt)')
+    bidirectional_parser.add_argument('--pairs', type=int, default=200,
+                                      help='Number of random origin/goal pairs (default: 200)')
+    bidirectional_parser.add_argument('--landmarks', type=int, default=8,
+                                      help='Landmarks of the A* potentials (default: 8)')
+    bidirectional_parser.set_defaults(func=benchmark_bidirectional)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -60,20 +60,26 @@ class BfsNetwork(SearchNetwork):
             return [start], 0
             
         visited = set()
-        # Format: (node, path, cost, step_added)
-        queue = deque([(start, [start], 0, 0)])
+        # Predecessor of each node, recorded when the node is first popped
+        parents = {}
+        # Format: (node, parent, cost, step_added)
+        queue = deque([(start, None, 0, 0)])
         step_counter = 1
         
+        def entry_path(node, parent):
+            # Only used for debug output; the search itself never copies paths
+            return (self.reconstruct_path(parents, parent) if parent is not None else []) + [node]
+        
         if debug:
-            print(f"Initial queue: {[(n, p) for n, p, _, _ in queue]}")
+            print(f"Initial queue: {[(n, entry_path(n, p)) for n, p, _, _ in queue]}")
         
         while queue:
-            current, path, cost, added_at = queue.popleft()
+            current, parent, cost, added_at = queue.popleft()
             
             if debug:
                 print(f"\nStep {step_counter}:")
                 step_counter += 1
-                print(f"Popped: ({current}, {path}) [added at step {added_at}]")
+                print(f"Popped: ({current}, {entry_path(current, parent)}) [added at step {added_at}]")
             
             if current in visited:
                 if debug:
@@ -81,11 +87,12 @@ class BfsNetwork(SearchNetwork):
                 continue
             
             visited.add(current)
+            parents[current] = parent
             
             if current == goal:
                 if debug:
                     print(f"GOAL reached: {current}")
-                return path, cost
+                return self.reconstruct_path(parents, current), cost
             
             # Get neighbors with their edge weights
             neighbors = []
@@ -102,16 +109,15 @@ class BfsNetwork(SearchNetwork):
             
             for neighbor, edge_weight in neighbors:
                 if neighbor not in visited:
-                    new_path = path + [neighbor]
                     new_cost = cost + edge_weight
                     
                     if debug:
-                        print(f"    → Adding to queue: ({neighbor}, {new_path}) [added at step {step_counter}]")
+                        print(f"    → Adding to queue: ({neighbor}, {entry_path(neighbor, current)}) [added at step {step_counter}]")
                     
-                    queue.append((neighbor, new_path, new_cost, step_counter))
+                    queue.append((neighbor, current, new_cost, step_counter))
             
             if debug:
-                print(f"Queue after expansion: {[(n, p) for n, p, _, _ in queue]}")
+                print(f"Queue after expansion: {[(n, entry_path(n, p)) for n, p, _, _ in queue]}")
         
         # No path found
         return [], float('inf')
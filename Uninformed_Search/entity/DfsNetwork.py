@@ -61,20 +61,26 @@ class DfsNetwork(SearchNetwork):
             return [start], 0
         
         visited = set()
-        # Format: (node, path, cost, step_added)
-        stack = [(start, [start], 0, 0)]
+        # Predecessor of each node, recorded when the node is first popped
+        parents = {}
+        # Format: (node, parent, cost, step_added)
+        stack = [(start, None, 0, 0)]
         step_counter = 1
         
+        def entry_path(node, parent):
+            # Only used for debug output; the search itself never copies paths
+            return (self.reconstruct_path(parents, parent) if parent is not None else []) + [node]
+        
         if debug:
-            print(f"Initial stack: {[(n, p) for n, p, _, _ in stack]}")
+            print(f"Initial stack: {[(n, entry_path(n, p)) for n, p, _, _ in stack]}")
         
         while stack:
-            current, path, cost, added_at = stack.pop()
+            current, parent, cost, added_at = stack.pop()
             
             if debug:
                 print(f"\nStep {step_counter}:")
                 step_counter += 1
-                print(f"Popped: ({current}, {path}) [added at step {added_at}]")
+                print(f"Popped: ({current}, {entry_path(current, parent)}) [added at step {added_at}]")
             
             if current in visited:
                 if debug:
@@ -82,11 +88,12 @@ class DfsNetwork(SearchNetwork):
                 continue
             
             visited.add(current)
+            parents[current] = parent
             
             if current == goal:
                 if debug:
                     print(f"GOAL reached: {current}")
-                return path, cost
+                return self.reconstruct_path(parents, current), cost
             
             # Get neighbors with their edge weights
             neighbors = []
@@ -105,16 +112,15 @@ class DfsNetwork(SearchNetwork):
             
             for neighbor, edge_weight in neighbors:
                 if neighbor not in visited:
-                    new_path = path + [neighbor]
                     new_cost = cost + edge_weight
                     
                     if debug:
-                        print(f"    → Adding to stack: ({neighbor}, {new_path}) [added at step {step_counter}]")
+                        print(f"    → Adding to stack: ({neighbor}, {entry_path(neighbor, current)}) [added at step {step_counter}]")
                     
-                    stack.append((neighbor, new_path, new_cost, step_counter))
+                    stack.append((neighbor, current, new_cost, step_counter))
             
             if debug:
-                print(f"Stack after expansion: {[(n, p) for n, p, _, _ in stack]}")
+                print(f"Stack after expansion: {[(n, entry_path(n, p)) for n, p, _, _ in stack]}")
         
         # No path found
         return [], float('inf')
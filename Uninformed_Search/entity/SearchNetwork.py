@@ -37,6 +37,25 @@ class SearchNetwork(Network):
             
         return self  # Return self for method chaining
     
+    def reconstruct_path(self, parents, goal):
+        """
+        Rebuild the path to goal by following predecessor links back to the start.
+        
+        Parameters:
+            parents - a dictionary mapping each reached node to its predecessor (None for the start)
+            goal - the node to rebuild the path for
+            
+        Returns:
+            list: nodes from the start to goal
+        """
+        path = []
+        current = goal
+        while current is not None:
+            path.append(current)
+            current = parents[current]
+        path.reverse()
+        return path
+    
     @abstractmethod
     def find_path(self, start, goal):
         """